@@ -0,0 +1,147 @@
+"""
+Headless runner for the DB IOH automation pipelines.
+
+Usage:
+    python -m app.cli update   --database DB.xlsx --input WORK_ORDER(S) --output-dir OUT
+    python -m app.cli dropsite --database DB.xlsx --input DROP_SITE(S)  --output-dir OUT
+    python -m app.cli dummy    --database DB.xlsx --input RING_LIST(S)  --output-dir OUT
+
+`--input` is a workbook or a directory of workbooks. The masterlist is parsed once and
+each input is processed against a fresh copy of it, outputs are named like the app
+exports with the input file name appended in directory mode. The dummy pipeline also
+writes its run report next to each export as '<export> - Run Report.csv'.
+"""
+import argparse
+import glob
+import os
+import sys
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules.db_update import automate_db_update, load_dataframes
+from modules.dropsite import dropsite_processing, load_dropsite_data
+from modules.dummy_database import load_dummy_data, process_dummy_database
+from modules.run_log import configure_logging
+from modules.snapshot_cache import SnapshotCache
+from modules.utils import ColumnResolver, detect_version, detect_week
+from modules.workbook import EXCEL_ENGINES, MASTERLIST_SHEETS, read_workbook
+
+EXPORT_PREFIX = {
+    'update': 'DB Update',
+    'dropsite': 'DB Dropped Site',
+    'dummy': 'Dummy Database',
+}
+
+
+def collect_inputs(path: str) -> list[str]:
+    if os.path.isdir(path):
+        files = sorted(
+            file for file in glob.glob(os.path.join(path, '*.xls*'))
+            if not os.path.basename(file).startswith('~$')
+        )
+        if not files:
+            raise FileNotFoundError(f"No workbook found in {path}")
+        return files
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Input not found: {path}")
+    return [path]
+
+
+def export_filename(command: str, database: str, input_path: str = None) -> str:
+    date_today = date.today().strftime("%Y%m%d")
+    week = detect_week(date_today)
+    version = detect_version(database)
+    suffix = f"-{os.path.splitext(os.path.basename(input_path))[0]}" if input_path else ''
+    return f"{EXPORT_PREFIX[command]}-{date_today}-Week {week}-TBG-{version}{suffix}.xlsx"
+
+
+def run_pipeline(command: str, masterlist: dict, input_path: str, filename: str, args, resolver: ColumnResolver) -> str:
+    masterlist = {sheet_name: df.copy() for sheet_name, df in masterlist.items()}
+    match command:
+        case 'update':
+            initial_data = load_dataframes(masterlist, read_workbook(input_path, engine=args.engine))
+            return automate_db_update(
+                initial_data,
+                new_database=filename,
+                version=detect_version(args.database),
+                export_dir=args.output_dir,
+                resolver=resolver,
+            )
+        case 'dropsite':
+            initial_data = load_dropsite_data(masterlist, read_workbook(input_path, engine=args.engine))
+            return dropsite_processing(initial_data, dropsite_filename=filename, export_dir=args.output_dir, resolver=resolver)
+        case 'dummy':
+            initial_data = load_dummy_data(masterlist, read_workbook(input_path, engine=args.engine))
+            result = process_dummy_database(
+                initial_data,
+                dummy_filename=filename,
+                export_dir=args.output_dir,
+                resolver=resolver,
+                max_workers=args.max_workers,
+            )
+            report_path = f"{os.path.splitext(result['file_location'])[0]} - Run Report.csv"
+            with open(report_path, 'w', encoding='utf-8', newline='') as file:
+                file.write(result['run_report'].to_csv())
+            return result['file_location']
+        case _:
+            raise ValueError(f"Unknown command: {command}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m app.cli', description="Run the DB IOH automation pipelines without the web app.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    inputs = {
+        'update': "Work order workbook or directory of work orders.",
+        'dropsite': "Drop site workbook or directory of drop site files.",
+        'dummy': "Ring list workbook or directory of ring lists.",
+    }
+    for command, input_help in inputs.items():
+        subparser = subparsers.add_parser(command, help=f"{EXPORT_PREFIX[command]} pipeline.")
+        subparser.add_argument('--database', required=True, help="Masterlist database workbook.")
+        subparser.add_argument('--input', required=True, help=input_help)
+        subparser.add_argument('--output-dir', required=True, help="Directory of the exported workbooks.")
+        subparser.add_argument('--engine', choices=EXCEL_ENGINES, default=None, help="Excel reader engine, default 'auto'.")
+        subparser.add_argument('--cache-dir', default=None, help="Parquet snapshot cache of the masterlist.")
+        subparser.add_argument('--log-level', default=None, choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                               help="Pipeline log level, default LOG_LEVEL or INFO.")
+        if command == 'dummy':
+            subparser.add_argument('--max-workers', type=int, default=None, help="Worker processes for ring insertion.")
+    return parser
+
+
+def main(argv: list[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    configure_logging(args.log_level)
+    input_files = collect_inputs(args.input)
+    batch = os.path.isdir(args.input)
+
+    cache = SnapshotCache(args.cache_dir) if args.cache_dir else None
+    print(f"📂 Loading masterlist: {args.database}")
+    masterlist = read_workbook(args.database, engine=args.engine, cache=cache, parse=MASTERLIST_SHEETS)
+    resolver = ColumnResolver()
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    results, failures = [], []
+    for input_path in input_files:
+        print(f"\n🚀 {args.command} | {input_path}")
+        filename = export_filename(args.command, args.database, input_path if batch else None)
+        try:
+            results.append(run_pipeline(args.command, masterlist, input_path, filename, args, resolver))
+        except Exception as e:
+            print(f"❌ {input_path} failed: {e}")
+            failures.append(input_path)
+
+    print("\n" + "-" * 25)
+    print(f"✅ {len(results)} export(s) written to {args.output_dir}")
+    for path in results:
+        print(f"  - {path}")
+    if failures:
+        print(f"❌ {len(failures)} input(s) failed:")
+        for path in failures:
+            print(f"  - {path}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
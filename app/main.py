@@ -1,5 +1,9 @@
 import streamlit as st
 import time
+from modules.run_log import configure_logging
+
+# Pipeline modules log to stderr, per-row detail only with log_level = "DEBUG"
+configure_logging(st.secrets.get("log_level", "INFO"))
 
 # FUNCTIONALITY
 def reset_app():
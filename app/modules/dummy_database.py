@@ -1,93 +1,100 @@
+import logging
 import pandas as pd
+import numpy as np
 import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from datetime import date
-from modules.utils import find_best_match, sanitize_header, detect_week, stylize_ring, stylize_length, stylize_sitelist
 from tqdm import tqdm
+from modules.utils import find_best_match, ColumnResolver
+from modules.excel_export import DatabaseWriter
+from modules.geodesy import check_segment_distances
+from modules.ring_store import RingStore
+from modules.site_index import SiteIndex
+from modules.workbook import MASTERLIST_SHEETS, read_workbook, sheet_frame
+from modules.snapshot_cache import SnapshotCache
+from modules.progress import ProgressCallback, progress_reporter
+from modules.run_log import RunReport
+from modules.run_metrics import RunMetrics
 
-def load_dummy_data(database:pd.ExcelFile, ringlist:pd.ExcelFile) -> dict:
+logger = logging.getLogger(__name__)
+
+
+def load_dummy_data(database, ringlist, cache: SnapshotCache = None) -> dict:
     initial_data = {}
     try:
-        with pd.ExcelFile(database) as db:
-            try:
-                sheet_names = db.sheet_names
-                print(f"Available sheets in database: {sheet_names}")
-                sheet_used = ['Site List', 'Length', 'New Ring']
+        db = read_workbook(database, cache=cache, parse=MASTERLIST_SHEETS)
+        try:
+            sheet_names = list(db)
+            logger.debug("Available sheets in database: %s", sheet_names)
+            sheet_used = ['Site List', 'Length', 'New Ring']
+            
+            for sheet in sheet_used:
+                best_match, score = find_best_match(sheet, sheet_names)
+                if best_match and score > 0:
+                    logger.debug("Best match for '%s': %s | Score: %.2f", sheet, best_match, score)
+                    match sheet:
+                        case 'Site List':
+                            db_sitelist = sheet_frame(db[best_match])
+                            initial_data['db_sitelist'] = db_sitelist
+                            logger.info("✅ Site List loaded: %s rows", len(db_sitelist))
+                        case 'Length':
+                            db_length = sheet_frame(db[best_match])
+                            initial_data['db_length'] = db_length
+                            logger.info("✅ Length loaded: %s rows", len(db_length))
+                        case 'New Ring':
+                            db_newring = sheet_frame(db[best_match])
+                            initial_data['db_newring'] = db_newring
+                            logger.info("✅ New Ring loaded: %s rows", len(db_newring))
+                else:
+                    logger.debug("No suitable match found for '%s' in sheets: %s", sheet, sheet_names)
+                    raise ValueError(f"Sheet '{sheet}' not found in the database.")
+            logger.info("✅ All required sheets loaded successfully.")
+
+            # Validate all required sheets were loaded
+            required_keys = ['db_sitelist', 'db_length', 'db_newring']
+            missing_keys = [key for key in required_keys if key not in initial_data]
+            if missing_keys:
+                raise ValueError(f"Failed to load required sheets: {missing_keys}")
                 
-                for sheet in sheet_used:
-                    best_match, score = find_best_match(sheet, sheet_names)
-                    if best_match and score > 0:
-                        print(f"Best match for '{sheet}': {best_match} | Score: {score:.2f}")
-                        try:
-                            match sheet:
-                                case 'Site List':
-                                    db_sitelist = pd.read_excel(db, sheet_name=best_match, na_filter=True)
-                                    db_sitelist = sanitize_header(db_sitelist)
-                                    initial_data['db_sitelist'] = db_sitelist
-                                    print(f"✅ Site List loaded: {len(db_sitelist)} rows")
-                                case 'Length':
-                                    db_length = pd.read_excel(db, sheet_name=best_match)
-                                    db_length = sanitize_header(db_length)
-                                    initial_data['db_length'] = db_length
-                                    print(f"✅ Length loaded: {len(db_length)} rows")
-                                case 'New Ring':
-                                    db_newring = pd.read_excel(db, sheet_name=best_match)
-                                    db_newring = sanitize_header(db_newring)
-                                    initial_data['db_newring'] = db_newring
-                                    print(f"✅ New Ring loaded: {len(db_newring)} rows")
-                        except Exception as sheet_error:
-                            print(f"❌ Error loading sheet '{best_match}': {sheet_error}")
-                            raise
-                    else:
-                        print(f"No suitable match found for '{sheet}' in sheets: {sheet_names}")
-                        raise ValueError(f"Sheet '{sheet}' not found in the database.")
-                print("✅ All required sheets loaded successfully.")
-
-                # Validate all required sheets were loaded
-                required_keys = ['db_sitelist', 'db_length', 'db_newring']
-                missing_keys = [key for key in required_keys if key not in initial_data]
-                if missing_keys:
-                    raise ValueError(f"Failed to load required sheets: {missing_keys}")
-                    
-                print("🔥📦 Database sheets loaded successfully. \n")
-            except Exception as e:
-                print(f"❌ Error loading sheets: {e}")
-                raise
-
-        with pd.ExcelFile(ringlist) as rl:
-            try:
-                sheet_names = rl.sheet_names
-                sheet_used = ['Site List', 'Insert Ring']
-
-                for sheet in sheet_used:
-                    best_match, score = find_best_match(sheet, sheet_names)
-                    if best_match:
-                        print(f"Best match for '{sheet}': {best_match} | Score: {score:.2f}")
-                        match sheet:
-                            case 'Site List':
-                                ring_sitelist = pd.read_excel(rl, sheet_name=best_match, na_filter=True)
-                                ring_sitelist = sanitize_header(ring_sitelist)
-                                initial_data['ring_sitelist'] = ring_sitelist
-                            case 'Insert Ring':
-                                ring_insertring = pd.read_excel(rl, sheet_name=best_match)
-                                ring_insertring = sanitize_header(ring_insertring)
-                                initial_data['ring_insertring'] = ring_insertring
-                        print(f"✅ {sheet} loaded successfully from '{best_match}'")
-                    else:
-                        print(f"No suitable match found for '{sheet}'")
-                        raise ValueError(f"Sheet '{sheet}' not found in the ring list.")
-            except Exception as e:
-                print(f"❌ Error loading ring list data: {e}")
-                raise
-
-        print("\nProcessing Dummy Database ...")
-        print(f"Total sites in ringlist     : {len(ring_sitelist):,}")
-        print(f"Total rings in ringlist     : {len(ring_insertring):,}")
-        print(f"Total sites in database     : {len(db_sitelist):,}")
-        print(f"Total rings in database     : {len(db_newring):,}")
-        print(f"Total lengths in database   : {len(db_length):,}\n")
+            logger.info("🔥📦 Database sheets loaded successfully.")
+        except Exception as e:
+            logger.error("❌ Error loading sheets: %s", e)
+            raise
+
+        rl = read_workbook(ringlist)
+        try:
+            sheet_names = list(rl)
+            sheet_used = ['Site List', 'Insert Ring']
+
+            for sheet in sheet_used:
+                best_match, score = find_best_match(sheet, sheet_names)
+                if best_match:
+                    logger.debug("Best match for '%s': %s | Score: %.2f", sheet, best_match, score)
+                    match sheet:
+                        case 'Site List':
+                            ring_sitelist = rl[best_match]
+                            initial_data['ring_sitelist'] = ring_sitelist
+                        case 'Insert Ring':
+                            ring_insertring = rl[best_match]
+                            initial_data['ring_insertring'] = ring_insertring
+                    logger.info("✅ %s loaded successfully from '%s'", sheet, best_match)
+                else:
+                    logger.debug("No suitable match found for '%s'", sheet)
+                    raise ValueError(f"Sheet '{sheet}' not found in the ring list.")
+        except Exception as e:
+            logger.error("❌ Error loading ring list data: %s", e)
+            raise
+
+        logger.info("Processing Dummy Database ...")
+        logger.info("Total sites in ringlist     : %d", len(ring_sitelist))
+        logger.info("Total rings in ringlist     : %d", len(ring_insertring))
+        logger.info("Total sites in database     : %d", len(db_sitelist))
+        logger.info("Total rings in database     : %d", len(db_newring))
+        logger.info("Total lengths in database   : %d", len(db_length))
 
     except Exception as e:
-        print(f"❌ Error loading data: {e}")
+        logger.error("❌ Error loading data: %s", e)
         raise
     return initial_data
 
@@ -96,14 +103,590 @@ def insert_to_access(ring_data: pd.DataFrame) -> pd.DataFrame:
         ring_data = ring_data.copy()
         ring_data['Priority_1'] = ring_data['Priority_1'].apply(lambda x: 'Access' if str(x).lower() == 'insert site' else x)
         ring_data['Priority_2'] = ring_data['Priority_2'].apply(lambda x: 'Access' if str(x).lower() == 'insert site' else x)
-        print("✅ Insert Ring converted to Access format.\n")
+        logger.info("✅ Insert Ring converted to Access format.")
         return ring_data
     except Exception as e:
-        print(f"❌ Error normalizing Insert Ring: {e}\n")
+        logger.error("❌ Error normalizing Insert Ring: %s", e)
         raise
 
-def process_dummy_database(initial_data: dict, dummy_filename:str, export_dir:str = r"D:\Data Analytical\PROJECT\REQUEST\20250626_Automate DB Update IOH\Export\Streamlit_Result\Dummy_Database"):
+def summarize_ring_length(ring_data: pd.DataFrame, length_columns, ring_column: str, resolver: ColumnResolver = None) -> pd.DataFrame:
+    """
+    Build the Length sheet of the rings in one groupby over Ring ID.
+
+    Parameters:
+        ring_data (pd.DataFrame): New Ring segments.
+        length_columns: Columns of the target Length sheet.
+        ring_column (str): Ring ID column of `ring_data`.
+        resolver (ColumnResolver, optional): Shared resolver for the fuzzy column fallback.
+
+    Returns:
+        pd.DataFrame: One row per ring in order of appearance, '#of Site' is the segment count
+                      minus one (at least 1), 'FO Distance (Meter)' the sum of 'Total Distance (m)',
+                      'AVG Length' their ratio, other columns come from the first segment.
+    """
+    rings = ring_data.dropna(subset=[ring_column])
+    if rings.empty:
+        return pd.DataFrame(columns=length_columns)
+
+    resolver = resolver or ColumnResolver()
+    grouped = rings.groupby(ring_column, sort=False)
+    segments = grouped.size()
+    total_segments = segments.where(segments > 1, 2) - 1
+    if 'Total Distance (m)' in rings.columns:
+        total_distance = grouped['Total Distance (m)'].sum()
+    else:
+        total_distance = pd.Series(0, index=segments.index)
+    first_rows = rings.drop_duplicates(subset=ring_column, keep='first').set_index(ring_column, drop=False)
+
+    length_column_map = resolver.resolve(length_columns, rings.columns.tolist())
+    columns = {}
+    for col in length_columns:
+        match col:
+            case 'Ring ID':
+                columns[col] = segments.index
+            case '#of Site':
+                columns[col] = total_segments
+            case 'FO Distance (Meter)':
+                columns[col] = total_distance
+            case 'AVG Length':
+                columns[col] = total_distance / total_segments
+            case 'Vendor':
+                columns[col] = first_rows['Vendor'] if 'Vendor' in first_rows.columns else None
+            case _:
+                best_match = length_column_map[col]
+                columns[col] = first_rows[best_match] if best_match else None
+
+    length_data = pd.DataFrame(columns, index=segments.index).reset_index(drop=True)
+    length_data['date_updated'] = str(date.today().strftime('%Y-%m-%d'))
+    return length_data
+
+def build_dummy_sitelist(ring_rows: pd.DataFrame, site_index: SiteIndex, sitelist_columns, ring_column: str,
+                         origin_column: str, destination_column: str, run_report: RunReport) -> pd.DataFrame:
+    """
+    Build Site List rows for every ring segment in one pass.
+
+    The site of a segment is its origin (destination when the origin is empty), its
+    attributes are joined from `site_index`. Segments whose site is unknown are skipped
+    and logged in `run_report`.
+
+    Parameters:
+        ring_rows (pd.DataFrame): Dummy ring segments, grouped per ring.
+        site_index (SiteIndex): Site List rows by Site ID, in precedence order.
+        sitelist_columns: Columns of the target Site List.
+        ring_column, origin_column, destination_column (str): Columns of `ring_rows`.
+        run_report (RunReport): Report of the run.
+
+    Returns:
+        pd.DataFrame: Site List rows in segment order, with 'date_updated'.
+    """
+    def column_or_none(column):
+        if column and column in ring_rows.columns:
+            return ring_rows[column].astype(object)
+        return pd.Series(None, index=ring_rows.index, dtype=object)
+
+    origin = column_or_none(origin_column)
+    site_ids = origin.where(origin.map(bool).astype(bool), column_or_none(destination_column))
+
+    sources, _ = site_index.locate(site_ids)
+    missing = sources < 0
+    for idx, site_id, ring_id in zip(ring_rows.index[missing], site_ids[missing], ring_rows[ring_column][missing]):
+        run_report.error('SITE LIST', f"Site ID {site_id} not found in sitelist or existing site list. Skipping row.",
+                         ring_id=ring_id, site_id=site_id, row=idx)
+
+    rows = ring_rows[~missing]
+    site_ids = site_ids[~missing]
+    found_rings = set(rows[ring_column])
+    for ring_id in pd.unique(ring_rows[ring_column][missing]):
+        if ring_id not in found_rings:
+            run_report.warning('SITE LIST', f"No new site data found for Ring ID: {ring_id}. Skipping site list update.",
+                               ring_id=ring_id)
+    if rows.empty:
+        return pd.DataFrame(columns=sitelist_columns)
+
+    info = site_index.attributes(site_ids, sitelist_columns)
+
+    def row_or_none(column):
+        return rows[column] if column in rows.columns else None
+
+    columns = {}
+    for col in sitelist_columns:
+        match col:
+            case 'Site ID' | 'Site ID IOH':
+                columns[col] = site_ids
+            case 'Site Name':
+                columns[col] = row_or_none('Origin_Name')
+            case 'Program Name':
+                columns[col] = row_or_none('Program')
+            case 'Program Ring':
+                columns[col] = row_or_none('Program Ring')
+            case 'Program Status':
+                columns[col] = rows['Existing/New Site_1'] if 'Existing/New Site_1' in rows.columns else 'New Site'
+            case 'insert/new ring':
+                columns[col] = rows['Ring Status'] if 'Ring Status' in rows.columns else "new ring"
+            case 'SoW' | 'Site Owner' | 'Initial Site ID' | 'Initial Site Name':
+                columns[col] = info[col]
+            case _:
+                columns[col] = rows[col] if col in rows.columns else info[col]
+
+    sitelist_data = pd.DataFrame(columns, index=rows.index).reset_index(drop=True)
+    sitelist_data['date_updated'] = str(date.today().strftime('%Y-%m-%d'))
+    return sitelist_data
+
+def insert_ring(ring_id, source_data: pd.DataFrame, target_data: pd.DataFrame, context: dict, run_report: RunReport) -> pd.DataFrame | None:
+    """
+    Insert the sites of one ring from the Insert Ring sheet into its database segments.
+
+    Parameters:
+        ring_id: Ring ID being processed.
+        source_data (pd.DataFrame): Insert Ring rows of the ring.
+        target_data (pd.DataFrame): Database New Ring segments of the ring.
+        context (dict): Read-only data shared by every ring, see `process_dummy_database`.
+        run_report (RunReport): Report of the run.
+
+    Returns:
+        pd.DataFrame | None: New segments of the ring, None when the ring is skipped.
+    """
+    db_ring_columns = context['db_ring_columns']
+    ringsite = context['ringsite']
+    db_sitelist = context['db_sitelist']
+    insert_site_ids = context['insert_site_ids']
+    insert_column_map = context['insert_column_map']
+    column_site, column_ne, column_fe = context['column_site'], context['column_ne'], context['column_fe']
+    column_db_origin, column_db_destination = context['column_db_origin'], context['column_db_destination']
+    column_sitelist_site_id = context['column_sitelist_site_id']
+    column_sitelist_site_name = context['column_sitelist_site_name']
+    column_longitude, column_latitude = context['column_longitude'], context['column_latitude']
+
+    logger.debug("Ring ID | %s", ring_id)
+
+    # DETECT ENTRIES
+    if len(source_data) > 1:
+        logger.debug("ℹ️ Multiple entries found for Ring ID: %s.", ring_id)
+    else:
+        logger.debug("ℹ️ Single entry found for Ring ID: %s.", ring_id)
+
+    origin_set = set(target_data[column_db_origin])
+    destination_set = set(target_data[column_db_destination])
+    ne_site_ids = source_data[column_ne].dropna().unique().tolist()
+    fe_site_ids = source_data[column_fe].dropna().unique().tolist()
+
+    logger.debug("Origin      : %s | %s", len(origin_set), origin_set)
+    logger.debug("Destination : %s | %s", len(destination_set), destination_set)
+
+    if source_data.empty:
+        run_report.warning('RING', f"No data found for Ring ID: {ring_id} in the ring list. Skipping.", ring_id=ring_id)
+        return None
+
+    if target_data.empty:
+        run_report.warning('RING', f"Ring ID: {ring_id} not found in the database. Skipping.", ring_id=ring_id)
+        return None
+
+    # PARTITION DATA
+    top_part = pd.DataFrame()
+    bottom_part = pd.DataFrame()
+    new_ring = pd.DataFrame(columns=db_ring_columns)
+
+    # Find insertion points
+    start_location = target_data[target_data[column_db_origin].isin(ne_site_ids)]
+    end_location = target_data[target_data[column_db_destination].isin(fe_site_ids)]
+
+    start_index = None
+    end_index = None
+    start_position = None
+    end_position = None
+
+    if not start_location.empty:
+        start_index = start_location.index[0]
+        # Convert DataFrame index to positional index
+        start_position = target_data.index.get_loc(start_index)
+        top_part = target_data.iloc[:start_position]
+        logger.debug("✅ Top part found for Ring ID: %s | NE: %s | Index: %s | Position: %s", ring_id, ne_site_ids, start_index, start_position)
+    else:
+        logger.debug("❌ No top part found for Ring ID: %s | NE: %s", ring_id, ne_site_ids)
+
+    if not end_location.empty:
+        end_index = end_location.index[-1]
+        # Convert DataFrame index to positional index
+        end_position = target_data.index.get_loc(end_index)
+        bottom_part = target_data.iloc[end_position + 1:] if end_position + 1 < len(target_data) else pd.DataFrame()
+        logger.debug("✅ Bottom part found for Ring ID: %s | FE: %s | Index: %s | Position: %s", ring_id, fe_site_ids, end_index, end_position)
+    else:
+        logger.debug("❌ No bottom part found for Ring ID: %s | FE: %s", ring_id, fe_site_ids)
+
+    # Handle edge cases for partitioning
+    if start_position is None and end_position is not None:
+        logger.debug("⚠️ No NE connection found. Inserting before FE at position %s", end_position)
+        top_part = target_data.iloc[:end_position]
+        bottom_part = target_data.iloc[end_position:]
+    elif end_position is None and start_position is not None:
+        logger.debug("⚠️ No FE connection found. Inserting after NE at position %s", start_position)
+        top_part = target_data.iloc[:start_position + 1]
+        bottom_part = target_data.iloc[start_position + 1:]
+    elif start_position is None and end_position is None:
+        logger.debug("⚠️ No insertion points found. Appending to end of ring.")
+        top_part = target_data.copy()
+        bottom_part = pd.DataFrame()
+    elif start_position is not None and end_position is not None:
+        if start_position > end_position:
+            logger.debug("⚠️ Start position (%s) > End position (%s). Swapping positions.", start_position, end_position)
+            start_position, end_position = end_position, start_position
+        logger.debug("✅ Inserting between positions %s and %s", start_position, end_position + 1)
+        top_part = target_data.iloc[:start_position + 1]  # Include the NE connection
+        bottom_part = target_data.iloc[end_position:]      # Include the FE connection
+
+    insert_data = pd.DataFrame(columns=db_ring_columns)
+
+    # Process all insert sites for this ring at once to create proper chaining
+    insert_sites = source_data[column_site].dropna().tolist()
+
+    if len(insert_sites) > 1:
+        logger.debug("🔗 Multiple insert sites found: %s. Creating chain connections.", insert_sites)
+    else:
+        logger.debug("🔗 Single insert site found: %s.", insert_sites)
+
+    # Get the first row to extract common data (NE, FE, etc.)
+    first_row = source_data.iloc[0]
+    near_end = first_row[column_ne] if column_ne in first_row else None
+    far_end = first_row[column_fe] if column_fe in first_row else None
+
+    if near_end is None or far_end is None:
+        run_report.error('RING', f"NE or FE is missing for Ring ID: {ring_id}. Skipping.", ring_id=ring_id)
+        return None
+
+    # Get site data for NE and FE
+    near_in_source = near_end in insert_site_ids
+    far_in_source = far_end in insert_site_ids
+
+    near_end_data = pd.DataFrame()
+    far_end_data = pd.DataFrame()
+
+    if near_in_source:
+        near_end_data = ringsite[ringsite[column_sitelist_site_id] == near_end]
+        if near_end_data.empty:
+            near_end_data = db_sitelist[db_sitelist[column_sitelist_site_id] == near_end]
+    else:
+        near_end_data = db_sitelist[db_sitelist[column_sitelist_site_id] == near_end]
+
+    if far_in_source:
+        far_end_data = ringsite[ringsite[column_sitelist_site_id] == far_end]
+        if far_end_data.empty:
+            far_end_data = db_sitelist[db_sitelist[column_sitelist_site_id] == far_end]
+    else:
+        far_end_data = db_sitelist[db_sitelist[column_sitelist_site_id] == far_end]
+
+    if near_end_data.empty or far_end_data.empty:
+        logger.warning("❌ NE: %s or FE: %s not found in site lists. Skipping.", near_end, far_end)
+        return None
+
+    # Create the connection chain: NE → Site1 → Site2 → ... → SiteN → FE
+    connection_chain = [near_end] + insert_sites + [far_end]
+    logger.debug("🔗 Connection chain: %s", ' → '.join(connection_chain))
+
+    # Create a lookup for site data from source
+    site_data_lookup = {}
+    for _, row in source_data.iterrows():
+        site_id = row[column_site]
+        if pd.notna(site_id):
+            site_data_lookup[site_id] = row
+
+    logger.debug("🔍 Site data lookup created: %s", list(site_data_lookup.keys()))
+
+    # If we have multiple insert sites but only one row in source_data,
+    # use that row's data for all insert sites
+    if len(insert_sites) > 1 and len(site_data_lookup) == 1:
+        common_row = source_data.iloc[0]
+        for site_id in insert_sites:
+            if site_id not in site_data_lookup:
+                site_data_lookup[site_id] = common_row
+        logger.debug("🔄 Using common row data for all %s insert sites", len(insert_sites))
+    elif len(insert_sites) > 1 and len(site_data_lookup) < len(insert_sites):
+        # Handle case where we have some but not all site data
+        common_row = source_data.iloc[0]
+        for site_id in insert_sites:
+            if site_id not in site_data_lookup:
+                site_data_lookup[site_id] = common_row
+        logger.debug("🔄 Filling missing site data for %s sites", len(insert_sites) - len(site_data_lookup))
+
+    # Create connections for each link in the chain
+    for i in range(len(connection_chain) - 1):
+        origin_site = connection_chain[i]
+        destination_site = connection_chain[i + 1]
+
+        # Get site data for origin and destination
+        if origin_site == near_end:
+            origin_data = near_end_data
+            origin_in_source = near_in_source
+        elif origin_site == far_end:
+            origin_data = far_end_data
+            origin_in_source = far_in_source
+        else:
+            # Get site data from lookup or ringsite/db_sitelist
+            if origin_site in site_data_lookup:
+                origin_row = site_data_lookup[origin_site]
+                origin_data = pd.DataFrame([origin_row])
+                origin_in_source = True
+            else:
+                # Try to find in ringsite or db_sitelist
+                origin_data = ringsite[ringsite[column_sitelist_site_id] == origin_site]
+                if origin_data.empty:
+                    origin_data = db_sitelist[db_sitelist[column_sitelist_site_id] == origin_site]
+                origin_in_source = False
+                if origin_data.empty:
+                    logger.warning("⚠️ Warning: Origin site %s not found in any data source", origin_site)
+
+        if destination_site == near_end:
+            dest_data = near_end_data
+            dest_in_source = near_in_source
+        elif destination_site == far_end:
+            dest_data = far_end_data
+            dest_in_source = far_in_source
+        else:
+            # Get site data from lookup or ringsite/db_sitelist
+            if destination_site in site_data_lookup:
+                dest_row = site_data_lookup[destination_site]
+                dest_data = pd.DataFrame([dest_row])
+                dest_in_source = True
+            else:
+                # Try to find in ringsite or db_sitelist
+                dest_data = ringsite[ringsite[column_sitelist_site_id] == destination_site]
+                if dest_data.empty:
+                    dest_data = db_sitelist[db_sitelist[column_sitelist_site_id] == destination_site]
+                dest_in_source = False
+                if dest_data.empty:
+                    logger.warning("⚠️ Warning: Destination site %s not found in any data source", destination_site)
+
+        # Determine priorities
+        if origin_site == near_end:
+            priority_1 = 'Access' if not origin_in_source else 'Insert Site'
+        elif origin_site in insert_sites:
+            priority_1 = 'Insert Site'
+        else:
+            priority_1 = 'Access'
+
+        if destination_site == far_end:
+            priority_2 = 'Access' if not dest_in_source else 'Insert Site'
+        elif destination_site in insert_sites:
+            priority_2 = 'Insert Site'
+        else:
+            priority_2 = 'Access'
+
+        # Get connection data - use the first available source row or lookup
+        if origin_site in site_data_lookup:
+            conn_row = site_data_lookup[origin_site]
+        elif destination_site in site_data_lookup:
+            conn_row = site_data_lookup[destination_site]
+        else:
+            conn_row = source_data.iloc[0]  # Fallback to first row
+
+        # Extract coordinates and site names
+        if origin_site == near_end:
+            long_1 = near_end_data[column_longitude].values[0] if column_longitude in near_end_data.columns else None
+            lat_1 = near_end_data[column_latitude].values[0] if column_latitude in near_end_data.columns else None
+            sitename_1 = near_end_data[column_sitelist_site_name].values[0] if column_sitelist_site_name in near_end_data.columns else None
+        elif origin_site == far_end:
+            long_1 = far_end_data[column_longitude].values[0] if column_longitude in far_end_data.columns else None
+            lat_1 = far_end_data[column_latitude].values[0] if column_latitude in far_end_data.columns else None
+            sitename_1 = far_end_data[column_sitelist_site_name].values[0] if column_sitelist_site_name in far_end_data.columns else None
+        else:
+            # For insert sites, try to get coordinates from multiple sources
+            if origin_site in site_data_lookup:
+                origin_row = site_data_lookup[origin_site]
+                long_1 = origin_row.get('Long', origin_row.get('Long_1', origin_row.get(column_longitude, None)))
+                lat_1 = origin_row.get('Lat', origin_row.get('Lat_1', origin_row.get(column_latitude, None)))
+                sitename_1 = origin_row.get(column_sitelist_site_name, origin_row.get('Site Name', None))
+            else:
+                # Try to get from origin_data if available
+                if not origin_data.empty:
+                    long_1 = origin_data[column_longitude].values[0] if column_longitude in origin_data.columns else None
+                    lat_1 = origin_data[column_latitude].values[0] if column_latitude in origin_data.columns else None
+                    sitename_1 = origin_data[column_sitelist_site_name].values[0] if column_sitelist_site_name in origin_data.columns else None
+                else:
+                    long_1 = lat_1 = sitename_1 = None
+
+        if destination_site == near_end:
+            long_2 = near_end_data[column_longitude].values[0] if column_longitude in near_end_data.columns else None
+            lat_2 = near_end_data[column_latitude].values[0] if column_latitude in near_end_data.columns else None
+            sitename_2 = near_end_data[column_sitelist_site_name].values[0] if column_sitelist_site_name in near_end_data.columns else None
+        elif destination_site == far_end:
+            long_2 = far_end_data[column_longitude].values[0] if column_longitude in far_end_data.columns else None
+            lat_2 = far_end_data[column_latitude].values[0] if column_latitude in far_end_data.columns else None
+            sitename_2 = far_end_data[column_sitelist_site_name].values[0] if column_sitelist_site_name in far_end_data.columns else None
+        else:
+            # For insert sites, try to get coordinates from multiple sources
+            if destination_site in site_data_lookup:
+                dest_row = site_data_lookup[destination_site]
+                long_2 = dest_row.get('Long', dest_row.get('Long_2', dest_row.get(column_longitude, None)))
+                lat_2 = dest_row.get('Lat', dest_row.get('Lat_2', dest_row.get(column_latitude, None)))
+                sitename_2 = dest_row.get(column_sitelist_site_name, dest_row.get('Site Name', None))
+            else:
+                # Try to get from dest_data if available
+                if not dest_data.empty:
+                    long_2 = dest_data[column_longitude].values[0] if column_longitude in dest_data.columns else None
+                    lat_2 = dest_data[column_latitude].values[0] if column_latitude in dest_data.columns else None
+                    sitename_2 = dest_data[column_sitelist_site_name].values[0] if column_sitelist_site_name in dest_data.columns else None
+                else:
+                    long_2 = lat_2 = sitename_2 = None
+
+        # Cable distances (simplified - use from first connection)
+        existing_cable = conn_row.get('Existing Cable (m)', conn_row.get('Existing Cable (m)_1', 0))
+        new_cable = conn_row.get('New Cable (m)', conn_row.get('New Cable (m)_1', 0))
+        total_distance = existing_cable + new_cable if pd.notna(existing_cable) and pd.notna(new_cable) else 0
+
+        logger.debug("✅ Creating connection: %s → %s | Priority: %s → %s", origin_site, destination_site, priority_1, priority_2)
+
+        # Create new connection row
+        new_connection = pd.DataFrame(columns=db_ring_columns)
+        connection_idx = len(insert_data)
+
+        for col in db_ring_columns:
+            match col:
+                case 'Ring ID':
+                    new_connection.loc[connection_idx, col] = ring_id
+                case 'Origin Site ID':
+                    new_connection.loc[connection_idx, col] = origin_site
+                case 'Destination':
+                    new_connection.loc[connection_idx, col] = destination_site
+                case 'Origin_Name':
+                    new_connection.loc[connection_idx, col] = sitename_1
+                case 'Destination_Name':
+                    new_connection.loc[connection_idx, col] = sitename_2
+                case 'Existing Cable (m)':
+                    new_connection.loc[connection_idx, col] = existing_cable if pd.notna(existing_cable) else 0
+                case 'New Cable (m)':
+                    new_connection.loc[connection_idx, col] = new_cable if pd.notna(new_cable) else 0
+                case 'Total Distance (m)':
+                    new_connection.loc[connection_idx, col] = total_distance if pd.notna(total_distance) else 0
+                case 'Vendor':
+                    new_connection.loc[connection_idx, col] = conn_row.get('Vendor', None)
+                case 'Link Name':
+                    new_connection.loc[connection_idx, col] = f"{origin_site}-{destination_site}"
+                case 'Priority_1':
+                    new_connection.loc[connection_idx, col] = priority_1
+                case 'Priority_2':
+                    new_connection.loc[connection_idx, col] = priority_2
+                case 'Long_1':
+                    new_connection.loc[connection_idx, col] = long_1
+                case 'Lat_1':
+                    new_connection.loc[connection_idx, col] = lat_1
+                case 'Long_2':
+                    new_connection.loc[connection_idx, col] = long_2
+                case 'Lat_2':
+                    new_connection.loc[connection_idx, col] = lat_2
+                case 'Existing/New Site_1':
+                    new_connection.loc[connection_idx, col] = conn_row.get('Existing/New Site_1', 'New Site')
+                case 'Existing/New Site_2':
+                    new_connection.loc[connection_idx, col] = conn_row.get('Existing/New Site_2', 'New Site')
+                case 'Ring Status':
+                    new_connection.loc[connection_idx, col] = conn_row.get('Ring Status', 'new ring')
+                case _:
+                    if col in conn_row:
+                        new_connection.loc[connection_idx, col] = conn_row[col]
+                    else:
+                        best_match = insert_column_map[col]
+                        if best_match and best_match in conn_row:
+                            new_connection.loc[connection_idx, col] = conn_row[best_match]
+                        else:
+                            new_connection.loc[connection_idx, col] = None
+
+        new_connection.loc[connection_idx, 'date_updated'] = str(date.today().strftime('%Y-%m-%d'))
+
+        # Add this connection to insert_data
+        insert_data = pd.concat([insert_data, new_connection], ignore_index=True)
+
+    # Check if we have data to insert
+    if insert_data.empty:
+        run_report.warning('RING', f"No valid data to insert for Ring ID: {ring_id}. Skipping.", ring_id=ring_id)
+        return None
+
+    # Reconstruct the ring with inserted data
+    if not top_part.empty and not bottom_part.empty:
+        logger.debug("🔄 Inserting data between NE and FE connections for Ring ID: %s.", ring_id)
+        logger.debug("   Top part: %s connections", len(top_part))
+        logger.debug("   Insert data: %s connections", len(insert_data)) 
+        logger.debug("   Bottom part: %s connections", len(bottom_part))
+        new_ring = pd.concat([top_part, insert_data, bottom_part], ignore_index=True)
+    elif not top_part.empty and bottom_part.empty:
+        logger.debug("🔄 Appending data after NE connection for Ring ID: %s.", ring_id)
+        new_ring = pd.concat([top_part, insert_data], ignore_index=True)
+    elif top_part.empty and not bottom_part.empty:
+        logger.debug("🔄 Prepending data before FE connection for Ring ID: %s.", ring_id)
+        new_ring = pd.concat([insert_data, bottom_part], ignore_index=True)
+    else:
+        logger.debug("🔄 Creating new ring with insert data for Ring ID: %s.", ring_id)
+        new_ring = insert_data.copy()
+
+    logger.debug("👍🔥 New data for Ring ID: %s processed successfully.", ring_id)
+    return new_ring
+
+
+_RING_CONTEXT = {}
+
+
+def _init_ring_worker(context: dict):
+    _RING_CONTEXT.update(context)
+
+
+def _insert_ring_chunk(chunk: list) -> list:
+    results = []
+    for ring_id, source_data, target_data in chunk:
+        ring_report = RunReport(ring_id, logger=logger)
+        results.append((insert_ring(ring_id, source_data, target_data, _RING_CONTEXT, ring_report), ring_report))
+    return results
+
+
+def insert_rings(ringlist: list, insert_store: RingStore, ring_store: RingStore, context: dict,
+                 run_report: RunReport, max_workers: int = None, progress: ProgressCallback = None) -> list[pd.DataFrame]:
+    """
+    Run `insert_ring` for every ring, serially or on a process pool.
+
+    With `max_workers` > 1 the rings are split into chunks handled by worker processes, the
+    shared `context` is sent once per worker. Results and report entries are merged back in
+    `ringlist` order, so the output does not depend on the number of workers. `progress`
+    receives the rings done, per ring when serial and per finished chunk on the pool.
+
+    Returns:
+        list[pd.DataFrame]: New segments of the processed rings, in `ringlist` order.
+    """
+    report = progress_reporter(progress)
+    tasks = [(ring_id, insert_store.get(ring_id).copy(), ring_store.get(ring_id).copy()) for ring_id in ringlist]
+
+    if not max_workers or max_workers <= 1 or len(tasks) <= 1:
+        new_rings = []
+        for done, (ring_id, source_data, target_data) in enumerate(tqdm(tasks, desc="🛟 Processing Rings", unit="ring"), start=1):
+            new_ring = insert_ring(ring_id, source_data, target_data, context, run_report)
+            report("Inserting rings", done, len(tasks))
+            if new_ring is not None:
+                new_rings.append(new_ring)
+        return new_rings
+
+    max_workers = min(max_workers, len(tasks))
+    chunk_size = max(1, -(-len(tasks) // (max_workers * 4)))
+    chunks = [tasks[start:start + chunk_size] for start in range(0, len(tasks), chunk_size)]
+    logger.info("🧵 Processing %d rings on %s workers (%s chunks)", len(tasks), max_workers, len(chunks))
+
+    new_rings = []
+    done = 0
+    # Spawned workers, forking the multithreaded Streamlit server can copy a held lock into the child
+    mp_context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context,
+                             initializer=_init_ring_worker, initargs=(context,)) as executor:
+        for results in tqdm(executor.map(_insert_ring_chunk, chunks), total=len(chunks), desc="🛟 Processing Rings", unit="chunk"):
+            for new_ring, ring_report in results:
+                run_report.extend(ring_report)
+                if new_ring is not None:
+                    new_rings.append(new_ring)
+            done += len(results)
+            report("Inserting rings", done, len(tasks))
+    return new_rings
+
+def process_dummy_database(initial_data: dict, dummy_filename:str, export_dir:str = r"D:\Data Analytical\PROJECT\REQUEST\20250626_Automate DB Update IOH\Export\Streamlit_Result\Dummy_Database", resolver: ColumnResolver = None, max_workers: int = None,
+                           progress: ProgressCallback = None, metrics: RunMetrics = None):
     try:
+        resolver = resolver or ColumnResolver()
+        report = progress_reporter(progress)
+        report("Preparing data")
+        metrics = metrics or RunMetrics("Dummy Database")
+        metrics.mark("Prepare")
         db_sitelist = initial_data['db_sitelist']
         db_length = initial_data['db_length']
         db_rings = initial_data['db_newring']
@@ -117,7 +700,7 @@ def process_dummy_database(initial_data: dict, dummy_filename:str, export_dir:st
 
         if not os.path.exists(export_dir):
             os.makedirs(export_dir)
-            print(f"Export directory created: {export_dir}")
+            logger.debug("Export directory created: %s", export_dir)
         dummy_filename = os.path.join(export_dir, dummy_filename)
 
         # CONVERT INSERT RING TO ACCESS
@@ -129,26 +712,25 @@ def process_dummy_database(initial_data: dict, dummy_filename:str, export_dir:st
         dummy_sitelist = pd.DataFrame(columns=db_sitelist.columns)
 
         # COLUMN INSERT SEGMENT
-        column_ring = find_best_match('Ring ID', ringinsert.columns.tolist())[0]
-        column_site = find_best_match('Site ID', ringinsert.columns.tolist())[0]
-        column_ne = find_best_match('Near End', ringinsert.columns.tolist())[0]
-        column_fe = find_best_match('Far End', ringinsert.columns.tolist())[0]
+        column_ring = resolver.match('Ring ID', ringinsert.columns.tolist())[0]
+        column_site = resolver.match('Site ID', ringinsert.columns.tolist())[0]
+        column_ne = resolver.match('Near End', ringinsert.columns.tolist())[0]
+        column_fe = resolver.match('Far End', ringinsert.columns.tolist())[0]
 
         # COLUMN SITE LIST
-        column_sitelist_site_id = find_best_match('Site ID IOH', ringsite.columns.tolist())[0]
-        column_sitelist_site_name = find_best_match('Site Name', ringsite.columns.tolist())[0]
-        column_longitude = find_best_match('Long', ringsite.columns.tolist())[0]
-        column_latitude = find_best_match('Lat', ringsite.columns.tolist())[0]
+        column_sitelist_site_id = resolver.match('Site ID IOH', ringsite.columns.tolist())[0]
+        column_sitelist_site_name = resolver.match('Site Name', ringsite.columns.tolist())[0]
+        column_longitude = resolver.match('Long', ringsite.columns.tolist())[0]
+        column_latitude = resolver.match('Lat', ringsite.columns.tolist())[0]
 
         # COLUMN_DB RING
-        column_db_ring = find_best_match('Ring ID', db_rings.columns.tolist())[0]
-        column_db_origin = find_best_match('Origin Site ID', db_rings.columns.tolist())[0]
-        column_db_destination = find_best_match('Destination', db_rings.columns.tolist())[0]
+        column_db_ring = resolver.match('Ring ID', db_rings.columns.tolist())[0]
+        column_db_origin = resolver.match('Origin Site ID', db_rings.columns.tolist())[0]
+        column_db_destination = resolver.match('Destination', db_rings.columns.tolist())[0]
 
-        # COLUMN_LENGTH
-        column_length_ring = find_best_match('Ring ID', db_length.columns.tolist())[0]
-        column_length_distance = find_best_match('FO Distance (Meter)', db_length.columns.tolist())[0]
-        column_length_avg = find_best_match('AVG Length', db_length.columns.tolist())[0]
+        insert_column_map = resolver.resolve(db_rings.columns, ringinsert.columns.tolist())
+        ring_store = RingStore(db_rings, column_db_ring)
+        insert_store = RingStore(ringinsert, column_ring)
 
         ringlist = ringinsert[column_ring].unique().tolist()
         insert_site_ids = ringinsert[column_site].dropna().unique().tolist()
@@ -156,539 +738,88 @@ def process_dummy_database(initial_data: dict, dummy_filename:str, export_dir:st
         # ==========================
         # PROCESS RING INSERTION
         # ==========================
-        error_log = {
-            'errors': [],
-            'warnings': [],
-            'info': []
+        run_report = RunReport(os.path.basename(dummy_filename), logger=logger)
+        metrics.mark("Insert rings")
+        ring_context = {
+            'db_ring_columns': db_rings.columns,
+            'ringsite': ringsite,
+            'db_sitelist': db_sitelist,
+            'insert_site_ids': insert_site_ids,
+            'insert_column_map': insert_column_map,
+            'column_site': column_site,
+            'column_ne': column_ne,
+            'column_fe': column_fe,
+            'column_db_origin': column_db_origin,
+            'column_db_destination': column_db_destination,
+            'column_sitelist_site_id': column_sitelist_site_id,
+            'column_sitelist_site_name': column_sitelist_site_name,
+            'column_longitude': column_longitude,
+            'column_latitude': column_latitude,
         }
-        for ring_id in tqdm(ringlist, desc="🛟 Processing Rings", unit="ring"):
-            print(f"Ring ID | {ring_id}")
-            source_data = ringinsert[ringinsert[column_ring] == ring_id].copy()
-            target_data = db_rings[db_rings[column_db_ring] == ring_id].copy()
-
-            # DETECT ENTRIES
-            if len(source_data) > 1:
-                print(f"ℹ️ Multiple entries found for Ring ID: {ring_id}.")
-            else:
-                print(f"ℹ️ Single entry found for Ring ID: {ring_id}.")
-
-            origin_set = set(target_data[column_db_origin])
-            destination_set = set(target_data[column_db_destination])
-            ne_site_ids = source_data[column_ne].dropna().unique().tolist()
-            fe_site_ids = source_data[column_fe].dropna().unique().tolist()
-
-            print(f"Origin      : {len(origin_set)} | {origin_set}")
-            print(f"Destination : {len(destination_set)} | {destination_set}")
-
-            if source_data.empty:
-                print(f"❌ No data found for Ring ID: {ring_id} in the ring list. Skipping.\n")
-                error_log['warnings'].append(f"RING | No data found for Ring ID: {ring_id} in the ring list.")
-                continue
-
-            if target_data.empty:
-                print(f"❌ Ring ID: {ring_id} not found in the database. Skipping.\n")
-                error_log['warnings'].append(f"RING | Ring ID: {ring_id} not found in the database.")
-                continue
-            
-            # PARTITION DATA
-            top_part = pd.DataFrame()
-            bottom_part = pd.DataFrame()
-            new_ring = pd.DataFrame(columns=db_rings.columns)
-            
-            # Find insertion points
-            start_location = target_data[target_data[column_db_origin].isin(ne_site_ids)]
-            end_location = target_data[target_data[column_db_destination].isin(fe_site_ids)]
-
-            start_index = None
-            end_index = None
-            start_position = None
-            end_position = None
-
-            if not start_location.empty:
-                start_index = start_location.index[0]
-                # Convert DataFrame index to positional index
-                start_position = target_data.index.get_loc(start_index)
-                top_part = target_data.iloc[:start_position]
-                print(f"✅ Top part found for Ring ID: {ring_id} | NE: {ne_site_ids} | Index: {start_index} | Position: {start_position}")
-            else:
-                print(f"❌ No top part found for Ring ID: {ring_id} | NE: {ne_site_ids}")
-
-            if not end_location.empty:
-                end_index = end_location.index[-1]
-                # Convert DataFrame index to positional index
-                end_position = target_data.index.get_loc(end_index)
-                bottom_part = target_data.iloc[end_position + 1:] if end_position + 1 < len(target_data) else pd.DataFrame()
-                print(f"✅ Bottom part found for Ring ID: {ring_id} | FE: {fe_site_ids} | Index: {end_index} | Position: {end_position}")
-            else:
-                print(f"❌ No bottom part found for Ring ID: {ring_id} | FE: {fe_site_ids}")
-
-            # Handle edge cases for partitioning
-            if start_position is None and end_position is not None:
-                print(f"⚠️ No NE connection found. Inserting before FE at position {end_position}")
-                top_part = target_data.iloc[:end_position]
-                bottom_part = target_data.iloc[end_position:]
-            elif end_position is None and start_position is not None:
-                print(f"⚠️ No FE connection found. Inserting after NE at position {start_position}")
-                top_part = target_data.iloc[:start_position + 1]
-                bottom_part = target_data.iloc[start_position + 1:]
-            elif start_position is None and end_position is None:
-                print(f"⚠️ No insertion points found. Appending to end of ring.")
-                top_part = target_data.copy()
-                bottom_part = pd.DataFrame()
-            elif start_position is not None and end_position is not None:
-                if start_position > end_position:
-                    print(f"⚠️ Start position ({start_position}) > End position ({end_position}). Swapping positions.")
-                    start_position, end_position = end_position, start_position
-                print(f"✅ Inserting between positions {start_position} and {end_position + 1}")
-                top_part = target_data.iloc[:start_position + 1]  # Include the NE connection
-                bottom_part = target_data.iloc[end_position:]      # Include the FE connection
-            
-            insert_data = pd.DataFrame(columns=db_rings.columns)
-            
-            # Process all insert sites for this ring at once to create proper chaining
-            insert_sites = source_data[column_site].dropna().tolist()
-            
-            if len(insert_sites) > 1:
-                print(f"🔗 Multiple insert sites found: {insert_sites}. Creating chain connections.")
-            else:
-                print(f"🔗 Single insert site found: {insert_sites}.")
-            
-            # Get the first row to extract common data (NE, FE, etc.)
-            first_row = source_data.iloc[0]
-            near_end = first_row[column_ne] if column_ne in first_row else None
-            far_end = first_row[column_fe] if column_fe in first_row else None
-            
-            if near_end is None or far_end is None:
-                print(f"❌ NE or FE is missing for Ring ID: {ring_id}. Skipping.")
-                error_log['errors'].append(f"RING | NE or FE is missing for Ring ID: {ring_id}.")
-                continue
-            
-            # Get site data for NE and FE
-            near_in_source = near_end in insert_site_ids
-            far_in_source = far_end in insert_site_ids
-            
-            near_end_data = pd.DataFrame()
-            far_end_data = pd.DataFrame()
-            
-            if near_in_source:
-                near_end_data = ringsite[ringsite[column_sitelist_site_id] == near_end]
-                if near_end_data.empty:
-                    near_end_data = db_sitelist[db_sitelist[column_sitelist_site_id] == near_end]
-            else:
-                near_end_data = db_sitelist[db_sitelist[column_sitelist_site_id] == near_end]
-                
-            if far_in_source:
-                far_end_data = ringsite[ringsite[column_sitelist_site_id] == far_end]
-                if far_end_data.empty:
-                    far_end_data = db_sitelist[db_sitelist[column_sitelist_site_id] == far_end]
-            else:
-                far_end_data = db_sitelist[db_sitelist[column_sitelist_site_id] == far_end]
-            
-            if near_end_data.empty or far_end_data.empty:
-                print(f"❌ NE: {near_end} or FE: {far_end} not found in site lists. Skipping.")
-                continue
-            
-            # Create the connection chain: NE → Site1 → Site2 → ... → SiteN → FE
-            connection_chain = [near_end] + insert_sites + [far_end]
-            print(f"🔗 Connection chain: {' → '.join(connection_chain)}")
-            
-            # Create a lookup for site data from source
-            site_data_lookup = {}
-            for _, row in source_data.iterrows():
-                site_id = row[column_site]
-                if pd.notna(site_id):
-                    site_data_lookup[site_id] = row
-            
-            print(f"🔍 Site data lookup created: {list(site_data_lookup.keys())}")
-            
-            # If we have multiple insert sites but only one row in source_data,
-            # use that row's data for all insert sites
-            if len(insert_sites) > 1 and len(site_data_lookup) == 1:
-                common_row = source_data.iloc[0]
-                for site_id in insert_sites:
-                    if site_id not in site_data_lookup:
-                        site_data_lookup[site_id] = common_row
-                print(f"🔄 Using common row data for all {len(insert_sites)} insert sites")
-            elif len(insert_sites) > 1 and len(site_data_lookup) < len(insert_sites):
-                # Handle case where we have some but not all site data
-                common_row = source_data.iloc[0]
-                for site_id in insert_sites:
-                    if site_id not in site_data_lookup:
-                        site_data_lookup[site_id] = common_row
-                print(f"🔄 Filling missing site data for {len(insert_sites) - len(site_data_lookup)} sites")
-            
-            # Create connections for each link in the chain
-            for i in range(len(connection_chain) - 1):
-                origin_site = connection_chain[i]
-                destination_site = connection_chain[i + 1]
-                
-                # Get site data for origin and destination
-                if origin_site == near_end:
-                    origin_data = near_end_data
-                    origin_in_source = near_in_source
-                elif origin_site == far_end:
-                    origin_data = far_end_data
-                    origin_in_source = far_in_source
-                else:
-                    # Get site data from lookup or ringsite/db_sitelist
-                    if origin_site in site_data_lookup:
-                        origin_row = site_data_lookup[origin_site]
-                        origin_data = pd.DataFrame([origin_row])
-                        origin_in_source = True
-                    else:
-                        # Try to find in ringsite or db_sitelist
-                        origin_data = ringsite[ringsite[column_sitelist_site_id] == origin_site]
-                        if origin_data.empty:
-                            origin_data = db_sitelist[db_sitelist[column_sitelist_site_id] == origin_site]
-                        origin_in_source = False
-                        if origin_data.empty:
-                            print(f"⚠️ Warning: Origin site {origin_site} not found in any data source")
-                
-                if destination_site == near_end:
-                    dest_data = near_end_data
-                    dest_in_source = near_in_source
-                elif destination_site == far_end:
-                    dest_data = far_end_data
-                    dest_in_source = far_in_source
-                else:
-                    # Get site data from lookup or ringsite/db_sitelist
-                    if destination_site in site_data_lookup:
-                        dest_row = site_data_lookup[destination_site]
-                        dest_data = pd.DataFrame([dest_row])
-                        dest_in_source = True
-                    else:
-                        # Try to find in ringsite or db_sitelist
-                        dest_data = ringsite[ringsite[column_sitelist_site_id] == destination_site]
-                        if dest_data.empty:
-                            dest_data = db_sitelist[db_sitelist[column_sitelist_site_id] == destination_site]
-                        dest_in_source = False
-                        if dest_data.empty:
-                            print(f"⚠️ Warning: Destination site {destination_site} not found in any data source")
-                
-                # Determine priorities
-                if origin_site == near_end:
-                    priority_1 = 'Access' if not origin_in_source else 'Insert Site'
-                elif origin_site in insert_sites:
-                    priority_1 = 'Insert Site'
-                else:
-                    priority_1 = 'Access'
-                    
-                if destination_site == far_end:
-                    priority_2 = 'Access' if not dest_in_source else 'Insert Site'
-                elif destination_site in insert_sites:
-                    priority_2 = 'Insert Site'
-                else:
-                    priority_2 = 'Access'
-                
-                # Get connection data - use the first available source row or lookup
-                if origin_site in site_data_lookup:
-                    conn_row = site_data_lookup[origin_site]
-                elif destination_site in site_data_lookup:
-                    conn_row = site_data_lookup[destination_site]
-                else:
-                    conn_row = source_data.iloc[0]  # Fallback to first row
-                
-                # Extract coordinates and site names
-                if origin_site == near_end:
-                    long_1 = near_end_data[column_longitude].values[0] if column_longitude in near_end_data.columns else None
-                    lat_1 = near_end_data[column_latitude].values[0] if column_latitude in near_end_data.columns else None
-                    sitename_1 = near_end_data[column_sitelist_site_name].values[0] if column_sitelist_site_name in near_end_data.columns else None
-                elif origin_site == far_end:
-                    long_1 = far_end_data[column_longitude].values[0] if column_longitude in far_end_data.columns else None
-                    lat_1 = far_end_data[column_latitude].values[0] if column_latitude in far_end_data.columns else None
-                    sitename_1 = far_end_data[column_sitelist_site_name].values[0] if column_sitelist_site_name in far_end_data.columns else None
-                else:
-                    # For insert sites, try to get coordinates from multiple sources
-                    if origin_site in site_data_lookup:
-                        origin_row = site_data_lookup[origin_site]
-                        long_1 = origin_row.get('Long', origin_row.get('Long_1', origin_row.get(column_longitude, None)))
-                        lat_1 = origin_row.get('Lat', origin_row.get('Lat_1', origin_row.get(column_latitude, None)))
-                        sitename_1 = origin_row.get(column_sitelist_site_name, origin_row.get('Site Name', None))
-                    else:
-                        # Try to get from origin_data if available
-                        if not origin_data.empty:
-                            long_1 = origin_data[column_longitude].values[0] if column_longitude in origin_data.columns else None
-                            lat_1 = origin_data[column_latitude].values[0] if column_latitude in origin_data.columns else None
-                            sitename_1 = origin_data[column_sitelist_site_name].values[0] if column_sitelist_site_name in origin_data.columns else None
-                        else:
-                            long_1 = lat_1 = sitename_1 = None
-                
-                if destination_site == near_end:
-                    long_2 = near_end_data[column_longitude].values[0] if column_longitude in near_end_data.columns else None
-                    lat_2 = near_end_data[column_latitude].values[0] if column_latitude in near_end_data.columns else None
-                    sitename_2 = near_end_data[column_sitelist_site_name].values[0] if column_sitelist_site_name in near_end_data.columns else None
-                elif destination_site == far_end:
-                    long_2 = far_end_data[column_longitude].values[0] if column_longitude in far_end_data.columns else None
-                    lat_2 = far_end_data[column_latitude].values[0] if column_latitude in far_end_data.columns else None
-                    sitename_2 = far_end_data[column_sitelist_site_name].values[0] if column_sitelist_site_name in far_end_data.columns else None
-                else:
-                    # For insert sites, try to get coordinates from multiple sources
-                    if destination_site in site_data_lookup:
-                        dest_row = site_data_lookup[destination_site]
-                        long_2 = dest_row.get('Long', dest_row.get('Long_2', dest_row.get(column_longitude, None)))
-                        lat_2 = dest_row.get('Lat', dest_row.get('Lat_2', dest_row.get(column_latitude, None)))
-                        sitename_2 = dest_row.get(column_sitelist_site_name, dest_row.get('Site Name', None))
-                    else:
-                        # Try to get from dest_data if available
-                        if not dest_data.empty:
-                            long_2 = dest_data[column_longitude].values[0] if column_longitude in dest_data.columns else None
-                            lat_2 = dest_data[column_latitude].values[0] if column_latitude in dest_data.columns else None
-                            sitename_2 = dest_data[column_sitelist_site_name].values[0] if column_sitelist_site_name in dest_data.columns else None
-                        else:
-                            long_2 = lat_2 = sitename_2 = None
-                
-                # Cable distances (simplified - use from first connection)
-                existing_cable = conn_row.get('Existing Cable (m)', conn_row.get('Existing Cable (m)_1', 0))
-                new_cable = conn_row.get('New Cable (m)', conn_row.get('New Cable (m)_1', 0))
-                total_distance = existing_cable + new_cable if pd.notna(existing_cable) and pd.notna(new_cable) else 0
-                
-                print(f"✅ Creating connection: {origin_site} → {destination_site} | Priority: {priority_1} → {priority_2}")
-                
-                # Create new connection row
-                new_connection = pd.DataFrame(columns=db_rings.columns)
-                connection_idx = len(insert_data)
-                
-                for col in db_rings.columns:
-                    match col:
-                        case 'Ring ID':
-                            new_connection.loc[connection_idx, col] = ring_id
-                        case 'Origin Site ID':
-                            new_connection.loc[connection_idx, col] = origin_site
-                        case 'Destination':
-                            new_connection.loc[connection_idx, col] = destination_site
-                        case 'Origin_Name':
-                            new_connection.loc[connection_idx, col] = sitename_1
-                        case 'Destination_Name':
-                            new_connection.loc[connection_idx, col] = sitename_2
-                        case 'Existing Cable (m)':
-                            new_connection.loc[connection_idx, col] = existing_cable if pd.notna(existing_cable) else 0
-                        case 'New Cable (m)':
-                            new_connection.loc[connection_idx, col] = new_cable if pd.notna(new_cable) else 0
-                        case 'Total Distance (m)':
-                            new_connection.loc[connection_idx, col] = total_distance if pd.notna(total_distance) else 0
-                        case 'Vendor':
-                            new_connection.loc[connection_idx, col] = conn_row.get('Vendor', None)
-                        case 'Link Name':
-                            new_connection.loc[connection_idx, col] = f"{origin_site}-{destination_site}"
-                        case 'Priority_1':
-                            new_connection.loc[connection_idx, col] = priority_1
-                        case 'Priority_2':
-                            new_connection.loc[connection_idx, col] = priority_2
-                        case 'Long_1':
-                            new_connection.loc[connection_idx, col] = long_1
-                        case 'Lat_1':
-                            new_connection.loc[connection_idx, col] = lat_1
-                        case 'Long_2':
-                            new_connection.loc[connection_idx, col] = long_2
-                        case 'Lat_2':
-                            new_connection.loc[connection_idx, col] = lat_2
-                        case 'Existing/New Site_1':
-                            new_connection.loc[connection_idx, col] = conn_row.get('Existing/New Site_1', 'New Site')
-                        case 'Existing/New Site_2':
-                            new_connection.loc[connection_idx, col] = conn_row.get('Existing/New Site_2', 'New Site')
-                        case 'Ring Status':
-                            new_connection.loc[connection_idx, col] = conn_row.get('Ring Status', 'new ring')
-                        case _:
-                            if col in conn_row:
-                                new_connection.loc[connection_idx, col] = conn_row[col]
-                            else:
-                                best_match, score = find_best_match(col, source_data.columns.tolist())
-                                if best_match and best_match in conn_row:
-                                    new_connection.loc[connection_idx, col] = conn_row[best_match]
-                                else:
-                                    new_connection.loc[connection_idx, col] = None
-                
-                new_connection.loc[connection_idx, 'date_updated'] = str(date.today().strftime('%Y-%m-%d'))
-                
-                # Add this connection to insert_data
-                insert_data = pd.concat([insert_data, new_connection], ignore_index=True)
-
-            # Check if we have data to insert
-            if insert_data.empty:
-                print(f"❌ No valid data to insert for Ring ID: {ring_id}. Skipping.\n")
-                error_log['warnings'].append(f"RING | No valid data to insert for Ring ID: {ring_id}.")
-                continue
-
-            # Reconstruct the ring with inserted data
-            if not top_part.empty and not bottom_part.empty:
-                print(f"🔄 Inserting data between NE and FE connections for Ring ID: {ring_id}.")
-                print(f"   Top part: {len(top_part)} connections")
-                print(f"   Insert data: {len(insert_data)} connections") 
-                print(f"   Bottom part: {len(bottom_part)} connections")
-                new_ring = pd.concat([top_part, insert_data, bottom_part], ignore_index=True)
-            elif not top_part.empty and bottom_part.empty:
-                print(f"🔄 Appending data after NE connection for Ring ID: {ring_id}.")
-                new_ring = pd.concat([top_part, insert_data], ignore_index=True)
-            elif top_part.empty and not bottom_part.empty:
-                print(f"🔄 Prepending data before FE connection for Ring ID: {ring_id}.")
-                new_ring = pd.concat([insert_data, bottom_part], ignore_index=True)
-            else:
-                print(f"🔄 Creating new ring with insert data for Ring ID: {ring_id}.")
-                new_ring = insert_data.copy()
-            
-            # Add the new ring to dummy_rings
-            dummy_rings = pd.concat([dummy_rings, new_ring], ignore_index=True)
-            print(f"👍🔥 New data for Ring ID: {ring_id} processed successfully.\n")
+        new_rings = insert_rings(ringlist, insert_store, ring_store, ring_context, run_report,
+                                 max_workers=max_workers, progress=progress)
+        dummy_rings = pd.concat([dummy_rings, *new_rings], ignore_index=True)
+
+        # Stored distances of the rebuilt rings against the great circle of their endpoints
+        distances = check_segment_distances(dummy_rings)
+        flag = distances['Flag'].to_numpy()
+        if flag.any():
+            flagged = dummy_rings.loc[flag, [column_db_ring, column_db_origin, column_db_destination, 'Total Distance (m)']]
+            flagged['Geodesic (m)'] = distances.loc[flag, 'Geodesic (m)']
+            for ring_id, origin, destination, stored, geodesic in (flagged.itertuples(index=False, name=None)
+                                                                    if logger.isEnabledFor(logging.DEBUG) else ()):
+                logger.debug("📏 Ring ID %s | %s-%s | Total Distance %s m | Great circle %.0f m",
+                             ring_id, origin, destination, stored, geodesic)
+            run_report.warning('DISTANCE', f"{len(flagged)} of {len(dummy_rings)} segments in "
+                               f"{flagged[column_db_ring].nunique()} ring(s) deviate from their great circle distance.")
 
         # ==========================
         # UPDATE LENGTH
         # ==========================
-        print("\n♾️ Updating Length Data ...")
-        ringlist = dummy_rings[column_db_ring].unique().tolist()
-        for ring_id in ringlist:
-            source_data = dummy_rings[dummy_rings[column_db_ring] == ring_id]
-            if source_data.empty:
-                print(f"❌ LENGTH | No data found for Ring ID: {ring_id}. Skipping update.\n")
-                error_log['warnings'].append(f"No data found for Ring ID: {ring_id} in dummy rings.")
-                continue
-
-            total_distance = source_data['Total Distance (m)'].sum() if 'Total Distance (m)' in source_data.columns else 0
-            total_segments = len(source_data) - 1 if len(source_data) > 1 else 1
-            average_length = total_distance / total_segments if total_segments > 0 else 0
-
-            new_length = pd.DataFrame(columns=db_length.columns)
-            idx = 0  # Initialize index for new row
-            
-            # Get representative row for vendor and other data
-            rep_row = source_data.iloc[0] if not source_data.empty else {}
-            
-            for col in db_length.columns:
-                match col:
-                    case 'Ring ID':
-                        new_length.loc[idx, col] = ring_id
-                    case '#of Site':
-                        new_length.loc[idx, col] = total_segments
-                    case 'FO Distance (Meter)':
-                        new_length.loc[idx, col] = total_distance
-                    case 'AVG Length':
-                        new_length.loc[idx, col] = average_length
-                    case 'Vendor':
-                        new_length.loc[idx, col] = rep_row.get('Vendor', None)
-                    case _:
-                        best_match, score = find_best_match(col, source_data.columns.tolist())
-                        if best_match and best_match in rep_row:
-                            new_length.loc[idx, col] = rep_row[best_match]
-                        else:
-                            new_length.loc[idx, col] = None
-            new_length['date_updated'] = str(date.today().strftime('%Y-%m-%d'))
-
-            if new_length.empty:
-                print(f"❌ LENGTH | No new length data found for Ring ID: {ring_id}. Skipping update.")
-                error_log['warnings'].append(f"No new length data found for Ring ID: {ring_id}.")
-                continue
-            dummy_length = pd.concat([dummy_length, new_length], ignore_index=True)
-            print(f"✅ Length data for Ring ID: {ring_id} updated successfully.")
+        logger.info("♾️ Updating Length Data ...")
+        report("Updating length")
+        metrics.mark("Length")
+        dummy_length = summarize_ring_length(dummy_rings, db_length.columns, column_db_ring, resolver=resolver)
+        logger.info("✅ Length data updated for %d rings.", len(dummy_length))
 
         # ==========================
         # SITE LIST UPDATE
         # ==========================
-        print("\n📍 Updating Site List ...")
-        for ring_id in ringlist:
-            source_data = dummy_rings[dummy_rings[column_db_ring] == ring_id]
-            if source_data.empty:
-                print(f"❌ No data found for Ring ID: {ring_id}. Skipping site list update. \n")
-                error_log['warnings'].append(f"SITE LIST | No data found for Ring ID: {ring_id}.")
-                continue
-
-            new_sites = pd.DataFrame(columns=db_sitelist.columns)
-            new_sites['date_updated'] = None
-            for idx, row in source_data.iterrows():
-                site_id = row.get(column_db_origin) or row.get(column_db_destination)
-                if site_id in ringsite[column_sitelist_site_id].values:
-                    sitelist_info = ringsite[ringsite[column_sitelist_site_id] == site_id]
-                elif site_id in db_sitelist['Site ID IOH'].values:
-                    sitelist_info = db_sitelist[db_sitelist['Site ID IOH'] == site_id]
-                else:
-                    print(f"❌ Site ID {site_id} not found in sitelist or existing site list. Skipping row.")
-                    error_log['errors'].append(f"SITE LIST | Site ID {site_id} not found in sitelist or existing site list for Ring ID: {ring_id} | Row: {idx}.")
-                    continue
-                
-                if sitelist_info.empty:
-                    print(f"❌ No sitelist info found for Site ID: {site_id}. Skipping row.")
-                    error_log['errors'].append(f"SITE LIST | No sitelist info found for Site ID: {site_id} for Ring ID: {ring_id} | Row: {idx}.")
-                    continue
-
-                for col in dummy_sitelist.columns:
-                    match col:
-                        case 'Site ID' | 'Site ID IOH':
-                            new_sites.loc[idx, col] = site_id
-                        case 'Site Name':
-                            new_sites.loc[idx, col] = row.get('Origin_Name', None)
-                        case 'Program Name':
-                            new_sites.loc[idx, col] = row.get('Program', None)
-                        case 'Program Ring':
-                            new_sites.loc[idx, col] = row.get('Program Ring', None)
-                        case 'Program Status':
-                            new_sites.loc[idx, col] = row.get('Existing/New Site_1', 'New Site')
-                        case 'insert/new ring':
-                            new_sites.loc[idx, col] = row.get('Ring Status', "new ring")
-                        case 'SoW' | 'Site Owner' | 'Initial Site ID' | 'Initial Site Name':
-                            if not sitelist_info.empty:
-                                new_sites.loc[idx, col] = sitelist_info.iloc[0].get(col, None)
-                            else:
-                                print(f"❌ No sitelist info found for Site ID: {site_id} | Column: {col}")
-                                error_log['errors'].append(f"SITE LIST | No sitelist info found for Site ID: {site_id} | Column: {col} for Ring ID: {ring_id} | Row: {idx}.")
-                                new_sites.loc[idx, col] = None
-                        case _:
-                            if col in row:
-                                new_sites.loc[idx, col] = row[col]
-                            elif col in sitelist_info.columns:
-                                new_sites.loc[idx, col] = sitelist_info.iloc[0].get(col, None)
-                            else:
-                                best_match, score = find_best_match(col, dummy_sitelist.columns.tolist())
-                                if best_match and best_match in row:
-                                    print(f"Using best match '{best_match}' for column '{col}'")
-                                    new_sites.loc[idx, col] = row[best_match]
-                                else:
-                                    print(f"⚠️ No match found for column '{col}' in new site data.")
-                                    new_sites.loc[idx, col] = None
-                new_sites.loc[idx, 'date_updated'] = str(date.today().strftime('%Y-%m-%d'))
-
-            if new_sites.empty:
-                print(f"❌ No new site data found for Ring ID: {ring_id}. Skipping site list update.")
-                error_log['warnings'].append(f"No new site data found for Ring ID: {ring_id}.")
-                continue
-
-            dummy_sitelist = pd.concat([dummy_sitelist, new_sites], ignore_index=True)
-            print(f"✅ Site list for Ring ID: {ring_id} updated successfully.\n")
-
-        print("-" * 25)
-        print("Summary of Dummy Database Update")
-        print("-" * 25)
-        print(f"Total Rings Processed: {len(dummy_rings):,}")
-        print(f"Total Lengths Processed: {len(dummy_length):,}")
-        print(f"Total Sites Processed: {len(dummy_sitelist):,}\n")
-
-        # STYLIZE RING
-        dummy_sitelist = stylize_sitelist(dummy_sitelist)
-        dummy_length = stylize_length(dummy_length)
-        dummy_rings = stylize_ring(dummy_rings)
+        logger.info("📍 Updating Site List ...")
+        report("Updating site list")
+        metrics.mark("Site list")
+        # Ring Site List takes precedence over the database Site List
+        site_index = SiteIndex((ringsite, column_sitelist_site_id), (db_sitelist, 'Site ID IOH'))
+        ring_rows = dummy_rings[dummy_rings[column_db_ring].notna()]
+        ring_rows = ring_rows.iloc[np.argsort(pd.factorize(ring_rows[column_db_ring])[0], kind='stable')]
+        dummy_sitelist = build_dummy_sitelist(
+            ring_rows, site_index, db_sitelist.columns, column_db_ring, column_db_origin, column_db_destination, run_report
+        )
+        logger.info("✅ Site list updated with %d sites.", len(dummy_sitelist))
+
+        logger.info("Summary of Dummy Database Update")
+        logger.info("Total Rings Processed: %d", len(dummy_rings))
+        logger.info("Total Lengths Processed: %d", len(dummy_length))
+        logger.info("Total Sites Processed: %d", len(dummy_sitelist))
+        logger.info("Run report: %s", run_report.counts())
 
         # EXPORT TO EXCEL
-        with pd.ExcelWriter(dummy_filename, engine='openpyxl') as writer:
-            dummy_sitelist.to_excel(writer, sheet_name='Site List', index=False)
-            dummy_length.to_excel(writer, sheet_name='Length', index=False)
-            dummy_rings.to_excel(writer, sheet_name='New Ring', index=False)
-            print(f"🔥👍 Dummy database exported to {dummy_filename}")
+        report("Writing workbook")
+        metrics.mark("Export")
+        with DatabaseWriter(dummy_filename) as writer:
+            writer.write_sitelist(dummy_sitelist)
+            writer.write_length(dummy_length)
+            writer.write_ring(dummy_rings)
+            logger.info("🔥👍 Dummy database exported to %s", dummy_filename)
+        metrics.finish()
         return {
             'file_location': dummy_filename,
             'dummy_rings': dummy_rings,
             'dummy_length': dummy_length,
             'dummy_sitelist': dummy_sitelist,
+            'run_report': run_report,
+            'metrics': metrics,
         }
     except Exception as e:
-        print(f"❌ Error processing dummy database: {e}")
+        logger.error("❌ Error processing dummy database: %s", e)
         raise
-
-if __name__ == "__main__":
-    database = r"D:\Data Analytical\PROJECT\REQUEST\20250626_Automate DB Update IOH\20250702-Drop Site.xlsx"
-    ringlist = r"D:\Data Analytical\PROJECT\REQUEST\20250626_Automate DB Update IOH\Data\Ring List Dummy.xlsx"
-    date_today = str(date.today().strftime('%Y%m%d'))
-    week = detect_week(date_today)
-    dummy_filename = f"{date_today}-Week {week}-Dummy Database.xlsx"
-    try:
-        initial_data = load_dummy_data(database, ringlist)
-        dummy_filename = process_dummy_database(initial_data, dummy_filename)
-        print(f"Dummy database created successfully: {dummy_filename}")
-    except Exception as e:
-        print(f"❌ Error in main execution: {e}")
\ No newline at end of file
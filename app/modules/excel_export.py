@@ -0,0 +1,154 @@
+import logging
+import datetime as dt
+import pandas as pd
+import xlsxwriter
+from xlsxwriter.utility import xl_col_to_name, xl_rowcol_to_cell
+from modules.workbook import LazySheet
+
+logger = logging.getLogger(__name__)
+
+# Header colours of the database sheets, same as the former Styler exports
+HEADER_STYLES = {
+    'sitelist': {'bg_color': 'red', 'font_color': 'white'},
+    'length': {'bg_color': '#FFC000', 'font_color': 'black'},
+    'ring': {'bg_color': 'red', 'font_color': 'white'},
+}
+P0_COLOR = '#ADD8E6'
+INSERT_SITE_COLOR = 'yellow'
+
+
+class DatabaseWriter:
+    """
+    Streaming xlsx writer for database exports.
+
+    Rows are written in order with xlsxwriter `constant_memory` mode, so only the current
+    row is kept in memory. Sheet styling is done with a handful of shared formats and
+    conditional formats instead of one CSS string per cell:
+        - Site List / New Ring: red header with white bold font.
+        - Length: #FFC000 header with black bold font.
+        - Every data cell has a thin black border.
+        - New Ring: origin/destination columns in light blue when Priority_1/Priority_2 is P0,
+          and "insert site" cells in yellow.
+    Sheets written with `write_sheet` keep the plain pandas look (bold bordered header),
+    unparsed source sheets (`LazySheet`) are copied cell by cell as they are.
+
+    Usage:
+        with DatabaseWriter(path) as writer:
+            writer.write_sitelist(sitelist)
+            writer.write_length(length)
+            writer.write_ring(rings)
+            writer.write_sheet(summary, 'Summary', index=True, header=False)
+    """
+    def __init__(self, path, constant_memory: bool = True):
+        self.path = path
+        self.workbook = xlsxwriter.Workbook(path, {
+            'constant_memory': constant_memory,
+            'strings_to_formulas': False,
+            'strings_to_urls': False,
+            'strings_to_numbers': False,
+        })
+        self.sheets: dict[str, xlsxwriter.worksheet.Worksheet] = {}
+        self._cell = self.workbook.add_format({'border': 1})
+        self._datetime = self.workbook.add_format({'border': 1, 'num_format': 'yyyy-mm-dd hh:mm:ss'})
+        self._date = self.workbook.add_format({'border': 1, 'num_format': 'yyyy-mm-dd'})
+        self._plain_header = self.workbook.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'})
+        self._headers = {
+            kind: self.workbook.add_format({'bold': True, 'border': 1, **style})
+            for kind, style in HEADER_STYLES.items()
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        self.workbook.close()
+
+    def _value_format(self, value):
+        if isinstance(value, dt.datetime):
+            return self._datetime
+        if isinstance(value, dt.date):
+            return self._date
+        return self._cell
+
+    def _write_frame(self, df: pd.DataFrame, sheet_name: str, header_format, index: bool = False, header: bool = True):
+        if sheet_name in self.sheets:
+            raise ValueError(f"Sheet '{sheet_name}' already exists in {self.path}")
+        worksheet = self.workbook.add_worksheet(sheet_name)
+        self.sheets[sheet_name] = worksheet
+
+        data = df.reset_index() if index else df
+        row_offset = 0
+        if header:
+            header_values = list(data.columns)
+            if index:
+                header_values[0] = df.index.name or ''
+            worksheet.write_row(0, 0, header_values, header_format)
+            row_offset = 1
+
+        values = data.astype(object).where(data.notna(), None).itertuples(index=False, name=None)
+        for row_number, row in enumerate(values, start=row_offset):
+            for col_number, value in enumerate(row):
+                if index and col_number == 0:
+                    worksheet.write(row_number, col_number, value, self._plain_header)
+                else:
+                    worksheet.write(row_number, col_number, value, self._value_format(value))
+        return worksheet
+
+    def write_sheet(self, df: pd.DataFrame | LazySheet, sheet_name: str, index: bool = False, header: bool = True):
+        """Sheet without database styling, e.g. Summary or sheets copied from the source file."""
+        if isinstance(df, LazySheet):
+            return self.copy_sheet(df, sheet_name)
+        return self._write_frame(df, sheet_name, self._plain_header, index=index, header=header)
+
+    def copy_sheet(self, sheet: LazySheet, sheet_name: str = None):
+        """Copy the raw cells of an unparsed sheet row by row, no DataFrame is built."""
+        sheet_name = sheet_name or sheet.sheet_name
+        if sheet_name in self.sheets:
+            raise ValueError(f"Sheet '{sheet_name}' already exists in {self.path}")
+        worksheet = self.workbook.add_worksheet(sheet_name)
+        self.sheets[sheet_name] = worksheet
+        for row_number, row in enumerate(sheet.rows()):
+            for col_number, value in enumerate(row):
+                if value is not None:
+                    worksheet.write(row_number, col_number, value, self._value_format(value))
+        return worksheet
+
+    def write_sitelist(self, sitelist_data: pd.DataFrame, sheet_name: str = 'Site List'):
+        return self._write_frame(sitelist_data, sheet_name, self._headers['sitelist'])
+
+    def write_length(self, length_data: pd.DataFrame, sheet_name: str = 'Length'):
+        return self._write_frame(length_data, sheet_name, self._headers['length'])
+
+    def write_ring(self, ring_data: pd.DataFrame, sheet_name: str = 'New Ring'):
+        worksheet = self._write_frame(ring_data, sheet_name, self._headers['ring'])
+        if ring_data.empty:
+            return worksheet
+
+        last_row = len(ring_data)
+        last_col = len(ring_data.columns) - 1
+        try:
+            columns = ring_data.columns
+            origin_range = (columns.get_loc('Origin Site ID'), columns.get_loc('Destination') - 2)
+            destination_range = (columns.get_loc('Destination'), columns.get_loc('Priority_2'))
+            for (first_col, end_col), priority in ((origin_range, 'Priority_1'), (destination_range, 'Priority_2')):
+                if end_col < first_col:
+                    continue
+                priority_cell = f"${xl_col_to_name(columns.get_loc(priority))}2"
+                worksheet.conditional_format(1, first_col, last_row, end_col, {
+                    'type': 'formula',
+                    'criteria': f'=EXACT({priority_cell},"P0")',
+                    'format': self.workbook.add_format({'bg_color': P0_COLOR}),
+                })
+        except Exception as e:
+            logger.error("❌ Error in P0 highlight of ring data: %s", e)
+
+        first_cell = xl_rowcol_to_cell(1, 0)
+        worksheet.conditional_format(1, 0, last_row, last_col, {
+            'type': 'formula',
+            'criteria': f'=LOWER({first_cell})="insert site"',
+            'format': self.workbook.add_format({'bg_color': INSERT_SITE_COLOR}),
+        })
+        return worksheet
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+EARTH_RADIUS_M = 6_371_000
+SEGMENT_COORDINATES = ('Long_1', 'Lat_1', 'Long_2', 'Lat_2')
+# Fibre follows roads, routes usually run 1.2 to 2 times the great circle distance
+DEVIATION_THRESHOLD = 2.0
+
+
+def to_degrees(values) -> np.ndarray:
+    """
+    Coordinates as floats, NaN where a cell is blank or not a number.
+
+    Sheets mix numeric cells with text typed with a decimal comma ('104, 24458'),
+    the text is parsed once per column with vectorized string operations.
+    """
+    if isinstance(values, np.ndarray) and values.dtype.kind in 'iuf':
+        return values.astype(float)
+    series = pd.Series(values).reset_index(drop=True)
+    numbers = pd.to_numeric(series, errors='coerce')
+    text = (series.notna() & numbers.isna()).to_numpy()
+    if text.any():
+        parsed = series[text].astype(str).str.strip().str.replace(r'\s*,\s*', '.', regex=True)
+        numbers[text] = pd.to_numeric(parsed, errors='coerce')
+    return numbers.to_numpy(dtype=float)
+
+
+def great_circle_m(long_1, lat_1, long_2, lat_2) -> np.ndarray:
+    """Haversine distance in meters between two arrays of points, NaN for missing or out of range coordinates."""
+    long_1, lat_1, long_2, lat_2 = (to_degrees(value) for value in (long_1, lat_1, long_2, lat_2))
+    valid = (np.abs(lat_1) <= 90) & (np.abs(lat_2) <= 90) & (np.abs(long_1) <= 180) & (np.abs(long_2) <= 180)
+    long_1, lat_1, long_2, lat_2 = (np.radians(np.where(valid, value, np.nan)) for value in (long_1, lat_1, long_2, lat_2))
+    a = np.sin((lat_2 - lat_1) / 2) ** 2 + np.cos(lat_1) * np.cos(lat_2) * np.sin((long_2 - long_1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(a))
+
+
+def segment_distances(segments: pd.DataFrame, columns=SEGMENT_COORDINATES) -> pd.Series:
+    """Great circle length of every segment from its Long/Lat columns, NaN when a column is missing."""
+    if not all(col in segments.columns for col in columns):
+        return pd.Series(np.nan, index=segments.index, name='Geodesic (m)')
+    return pd.Series(great_circle_m(*(segments[col] for col in columns)), index=segments.index, name='Geodesic (m)')
+
+
+def check_segment_distances(segments: pd.DataFrame, threshold: float = DEVIATION_THRESHOLD,
+                            distance_column: str = 'Total Distance (m)', columns=SEGMENT_COORDINATES) -> pd.DataFrame:
+    """
+    Stored segment distances against the great circle distance of their endpoints.
+
+    Parameters:
+        segments (pd.DataFrame): Ring segments with Long/Lat of both ends.
+        threshold (float): Allowed relative deviation. A segment is flagged when its stored
+                distance is more than `1 + threshold` times longer or shorter than the geodesic.
+        distance_column (str): Stored distance column.
+        columns: Long_1, Lat_1, Long_2, Lat_2 column names.
+
+    Returns:
+        pd.DataFrame: 'Geodesic (m)', 'Deviation' (stored / geodesic - 1) and 'Flag' per segment,
+            aligned with `segments`. Segments without coordinates or distance are not flagged.
+    """
+    geodesic = segment_distances(segments, columns)
+    if distance_column in segments.columns:
+        stored = pd.to_numeric(segments[distance_column], errors='coerce').to_numpy(dtype=float)
+    else:
+        stored = np.full(len(segments), np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        deviation = stored / geodesic.to_numpy() - 1
+        flag = np.abs(np.log1p(deviation)) > np.log1p(threshold)
+    return pd.DataFrame({'Geodesic (m)': geodesic, 'Deviation': deviation, 'Flag': flag}, index=segments.index)
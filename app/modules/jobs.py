@@ -0,0 +1,144 @@
+import logging
+import threading
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+JOB_STATUSES = ('queued', 'running', 'done', 'failed')
+
+
+class Job:
+    """
+    One submitted run: its status, progress and result.
+
+    The job function receives the Job as first argument and reports its progress with
+    `job.report(stage, done, total)`, so the page can poll it from any rerun or session.
+    """
+    def __init__(self, name: str, owner: str = None):
+        self.id = uuid.uuid4().hex[:8]
+        self.name = name
+        self.owner = owner
+        self.status = 'queued'
+        self.stage = 'Queued'
+        self.done = 0
+        self.total = None
+        self.result = None
+        self.error = None
+        self.traceback = None
+        self.submitted = datetime.now()
+        self.started = None
+        self.finished = None
+        self._event = threading.Event()
+
+    def __repr__(self) -> str:
+        return f"Job({self.id}, {self.name!r}, {self.status})"
+
+    def report(self, stage: str, done: int = 0, total: int = None):
+        """Progress callback of the job, see `modules.progress`."""
+        self.stage = stage
+        self.done = done
+        self.total = total
+
+    @property
+    def progress(self) -> float | None:
+        """Completed fraction of the current stage, None when its size is unknown."""
+        if self.status == 'done':
+            return 1.0
+        if not self.total:
+            return None
+        return min(self.done / self.total, 1.0)
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in ('done', 'failed')
+
+    @property
+    def elapsed(self) -> float | None:
+        if self.started is None:
+            return None
+        return ((self.finished or datetime.now()) - self.started).total_seconds()
+
+    def wait(self, timeout: float = None) -> bool:
+        return self._event.wait(timeout)
+
+    def summary(self) -> dict:
+        return {
+            'Job': self.id,
+            'Name': self.name,
+            'Status': self.status,
+            'Stage': self.stage,
+            'Progress': self.progress,
+            'Submitted': self.submitted.strftime('%Y-%m-%d %H:%M:%S'),
+            'Elapsed (s)': None if self.elapsed is None else round(self.elapsed, 1),
+            'Error': self.error,
+        }
+
+
+class JobQueue:
+    """
+    Local worker pool with a registry of submitted jobs.
+
+    Jobs run on threads, so DataFrames are handed over without pickling and the pipelines
+    keep their own process pools (e.g. dummy ring insertion). The registry keeps the last
+    `max_jobs` finished jobs, older ones are dropped on the next submission.
+
+    Usage:
+        queue = JobQueue(max_workers=2)
+        job = queue.submit("DB Update", run_db_update, db_df, work_order_df)
+        queue.get(job.id).status
+    """
+    def __init__(self, max_workers: int = 2, max_jobs: int = 50):
+        self.max_workers = max(1, int(max_workers))
+        self.max_jobs = max_jobs
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='job')
+        self._jobs: dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, name: str, fn, *args, owner: str = None, **kwargs) -> Job:
+        job = Job(name, owner=owner)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        self._executor.submit(self._run, job, fn, args, kwargs)
+        logger.info("📥 Job %s queued: %s", job.id, name)
+        return job
+
+    def _run(self, job: Job, fn, args, kwargs):
+        job.status = 'running'
+        job.started = datetime.now()
+        job.report('Running')
+        try:
+            job.result = fn(job, *args, **kwargs)
+            job.report('Done')
+            job.status = 'done'
+            logger.info("✅ Job %s done: %s", job.id, job.name)
+        except Exception as e:
+            job.error = str(e) or type(e).__name__
+            job.traceback = traceback.format_exc()
+            job.status = 'failed'
+            logger.warning("❌ Job %s failed: %s", job.id, job.error)
+        finally:
+            job.finished = datetime.now()
+            job._event.set()
+
+    def _prune(self):
+        finished = [job for job in self._jobs.values() if job.is_finished]
+        for job in finished[:max(0, len(finished) - self.max_jobs)]:
+            del self._jobs[job.id]
+
+    def get(self, job_id: str) -> Job | None:
+        if job_id is None:
+            return None
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> list[Job]:
+        """Registered jobs, newest first."""
+        with self._lock:
+            return list(reversed(self._jobs.values()))
+
+    def shutdown(self, wait: bool = False):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
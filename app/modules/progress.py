@@ -0,0 +1,34 @@
+from typing import Callable
+
+# callback(stage, done, total), `total` is None for stages without a known size
+ProgressCallback = Callable[[str, int, int | None], None]
+
+
+def _silent(stage: str, done: int = 0, total: int = None):
+    return None
+
+
+def progress_reporter(callback: ProgressCallback = None, steps: int = 100) -> ProgressCallback:
+    """
+    Wrap a progress callback for use inside the pipeline loops.
+
+    Without a callback the returned function is a no-op, so reporting costs one call per
+    ring. With a callback, counted updates are thinned to about `steps` per stage, the
+    first and last item of a stage and every stage change always go through.
+
+    Parameters:
+        callback (ProgressCallback, optional): Receives (stage, done, total).
+        steps (int, optional): Max number of counted updates forwarded per stage.
+
+    Returns:
+        ProgressCallback: report(stage, done=0, total=None).
+    """
+    if callback is None:
+        return _silent
+
+    def report(stage: str, done: int = 0, total: int = None):
+        if total and 0 < done < total and done % max(total // steps, 1):
+            return
+        callback(stage, done, total)
+
+    return report
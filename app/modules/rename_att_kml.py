@@ -1,83 +1,305 @@
+import logging
+import re
+from io import BytesIO
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape, quoteattr
 import pandas as pd
 from tqdm import tqdm
+from modules.workbook import read_excel
+from modules.progress import ProgressCallback, progress_reporter
+from modules.run_metrics import RunMetrics
 
-# def rename_kml_field(kml_content: str, attribute_df: pd.DataFrame, checked_field: str, export_path: str = None) -> str:
-#     """Renames fields in a KML file based on a mapping DataFrame.
-#     Args:
-#         kml_content (str): The content of the KML file as a string.
-#         attribute_df (pd.DataFrame): DataFrame containing 'before' and 'after' columns for renaming.
-#         checked_field (str): The field to check for renaming.
-#         export_path (str, optional): Path to save the revised KML file. If None, returns the revised content.
-#     Returns:
-#         str: The revised KML content or the path to the saved file.
-#     """
-#     kml_content = kml_content.strip()
-#     if not kml_content:
-#         raise ValueError("KML content is empty or not provided.")
-
-#     normalized_field = str(checked_field).lower().replace('_', ' ').replace('  ', ' ').strip()
-
-#     revised_lines = []
-#     for line in kml_content.splitlines():
-#         line_to_check = line.lower().replace('_', ' ')
-
-#         if not normalized_field or normalized_field in line_to_check:
-#             for _, row in attribute_df.iterrows():
-#                 line = line.replace(str(row['before']), str(row['after']))
-
-#         revised_lines.append(line)
-
-#     revised_kml = '\n'.join(revised_lines)
-
-#     if export_path:
-#         with open(export_path, 'w', encoding='utf-8') as file:
-#             file.write(revised_kml)
-#         print(f"Revised KML saved to {export_path}")
-#         return export_path
-#     else:
-#         print("No export path provided, returning revised KML content.")
-#     return revised_kml
-    
-# if __name__ == "__main__":
-#     # Example usage
-#     kml_path = r"example.kml"  # Replace with your KML file path
-#     attribute_path = r"mapping.csv"  # Replace with your mapping CSV file path
-#     checked_field = 'site id'  # The field to check for renaming
-
-#     # Load the mapping DataFrame
-#     attribute_df = pd.read_csv(attribute_path)
-
-#     # Read the KML content
-#     with open(kml_path, 'r', encoding='utf-8') as file:
-#         kml_content = file.read()
-
-def rename_kml_field(kml_path: str, attribute_path: str, checked_field: str) -> None:
+logger = logging.getLogger(__name__)
+
+# Elements written open/close while streaming, their children are written one by one
+KML_CONTAINERS = ('kml', 'Document', 'Folder')
+# Streaming has no known total, progress is reported every N Placemarks
+STREAM_REPORT_EVERY = 1000
+
+
+def load_rename_map(attribute_df: pd.DataFrame | str) -> dict[str, str]:
+    """
+    Build the `before -> after` mapping from the attribute file.
+
+    Parameters:
+        attribute_df (pd.DataFrame | str): Mapping table with 'before' and 'after' columns,
+                            or the path of the Excel file holding it (1 sheet).
+
+    Returns:
+        dict[str, str]: Mapping in file order, the first row wins for duplicated 'before'.
+    """
+    if not isinstance(attribute_df, pd.DataFrame):
+        attribute_df = read_excel(attribute_df)
+
+    rename_map = {}
+    for before, after in zip(attribute_df['before'], attribute_df['after']):
+        if pd.isna(before) or str(before) == '':
+            continue
+        rename_map.setdefault(str(before), '' if pd.isna(after) else str(after))
+    return rename_map
+
+
+def _trie_pattern(words) -> str:
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node) -> str:
+        branches = [re.escape(char) + build(child) for char, child in node.items() if char]
+        if not branches:
+            return ''
+        pattern = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        if '' in node:
+            pattern = f"(?:{pattern})?"
+        return pattern
+
+    return build(trie)
+
+
+def compile_renamer(rename_map: dict[str, str]):
+    """
+    Compile every `before` into a single trie-shaped regex.
+
+    Each line is rewritten in one pass, the longest `before` starting at a position wins
+    (e.g. 'JAW-010' over 'JAW-01') and replaced text is not matched again.
+
+    Returns:
+        Callable[[str], str]: Function renaming all occurrences in a string.
+    """
+    if not rename_map:
+        return lambda text: text
+    pattern = re.compile(_trie_pattern(rename_map))
+    replace = lambda match: rename_map[match.group(0)]
+    return lambda text: pattern.sub(replace, text)
+
+
+def _normalize_field(field: str) -> str:
+    return ' '.join(str(field).lower().replace('_', ' ').split())
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+def _rename_placemark(placemark: ET.Element, field: str, rename) -> int:
+    """Rename the `field` value of a Placemark: <name>, ExtendedData/Data/value or SchemaData/SimpleData."""
+    renamed = 0
+    for element in placemark.iter():
+        local = _local_name(element.tag)
+        if local == 'name' and field == 'name':
+            target = element
+        elif local == 'Data' and _normalize_field(element.get('name', '')) == field:
+            target = next((child for child in element if _local_name(child.tag) == 'value'), None)
+        elif local == 'SimpleData' and _normalize_field(element.get('name', '')) == field:
+            target = element
+        else:
+            continue
+        if target is not None and target.text:
+            revised = rename(target.text)
+            if revised != target.text:
+                target.text = revised
+                renamed += 1
+    return renamed
+
+
+def rename_kml_stream(kml_source, attribute_df: pd.DataFrame | str, checked_field: str, export_path: str,
+                      progress: ProgressCallback = None, metrics: RunMetrics = None) -> str:
+    """
+    Rename a KML field while streaming the document with `iterparse`.
+
+    kml, Document and Folder tags are written as they open and close, every other element
+    under them (Placemark, Style, Schema, ...) is written as soon as it is parsed and then
+    dropped, so memory stays flat whatever the KML size or line layout (minified KML included).
+    Only the Placemark value named by `checked_field` is renamed.
+
+    Parameters:
+        kml_source (str | file): Path or binary file object of the KML.
+        attribute_df (pd.DataFrame | str): Mapping table or path of the Excel mapping file.
+        checked_field (str): Field to rename, e.g. 'site id' (matches Data/SimpleData name)
+                            or 'name' (the Placemark <name>).
+        export_path (str): Path of the revised KML file.
+        progress (ProgressCallback, optional): Receives the Placemarks renamed so far, no total.
+        metrics (RunMetrics, optional): Timed with 'Load map' and 'Stream rename' stages.
+
+    Returns:
+        str: The export path.
+    """
+    if not export_path:
+        raise ValueError("Streaming mode writes to a file, export_path is required.")
+    field = _normalize_field(checked_field or '')
+    if not field:
+        raise ValueError("Field to rename is empty.")
+
+    metrics = metrics or RunMetrics("KML Renamer")
+    metrics.mark("Load map")
+    rename_map = load_rename_map(attribute_df)
+    logger.info("🔁 Streaming rename of '%s' with %d values", field, len(rename_map))
+    rename = compile_renamer(rename_map)
+
+    namespaces = {}
+    declared = {}
+    pending_declarations = []
+    containers = []
+    feature_depth = 0
+    placemarks = renamed = 0
+
+    def declare(prefix: str, uri: str) -> str:
+        """Prefix written for the namespace, one per URI and never shared by two URIs."""
+        if uri not in namespaces:
+            taken = set(namespaces.values())
+            candidate, number = prefix, 1
+            while candidate in taken:
+                candidate, number = f"ns{number}", number + 1
+            namespaces[uri] = candidate
+        return namespaces[uri]
+
+    qualified_names = {}
+
+    def qualified(tag: str) -> str:
+        if tag not in qualified_names:
+            if tag.startswith('{'):
+                uri, local = tag[1:].split('}', 1)
+                prefix = namespaces.get(uri, '')
+                qualified_names[tag] = f"{prefix}:{local}" if prefix else local
+            else:
+                qualified_names[tag] = tag
+        return qualified_names[tag]
+
+    def open_tag(element: ET.Element) -> str:
+        # Namespaces are declared on the element declaring them in the source, so nested prefixes stay bound
+        declarations = ''.join(
+            f' xmlns{":" + prefix if prefix else ""}={quoteattr(uri)}' for prefix, uri in declared.pop(element, ())
+        )
+        attributes = ''.join(f" {qualified(key)}={quoteattr(value)}" for key, value in element.attrib.items())
+        return f"<{qualified(element.tag)}{declarations}{attributes}"
+
+    def write_element(element: ET.Element):
+        if not len(element) and not element.text:
+            output.write(f"{open_tag(element)}/>")
+        else:
+            output.write(f"{open_tag(element)}>{escape(element.text or '')}")
+            for child in element:
+                write_element(child)
+                output.write(escape(child.tail or ''))
+            output.write(f"</{qualified(element.tag)}>")
+
+    metrics.mark("Stream rename")
+    with open(export_path, 'w', encoding='utf-8') as output:
+        output.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        for event, item in ET.iterparse(kml_source, events=('start-ns', 'start', 'end')):
+            if event == 'start-ns':
+                prefix, uri = item
+                pending_declarations.append((declare(prefix, uri), uri))
+                continue
+
+            element = item
+            if event == 'start':
+                if pending_declarations:
+                    declared[element] = pending_declarations
+                    pending_declarations = []
+                if feature_depth or _local_name(element.tag) not in KML_CONTAINERS:
+                    feature_depth += 1
+                    continue
+                output.write(f"{open_tag(element)}>\n")
+                containers.append(element)
+                continue
+
+            if not feature_depth:
+                containers.pop()
+                output.write(f"</{qualified(element.tag)}>\n")
+                continue
+            feature_depth -= 1
+            if feature_depth:
+                continue
+
+            # A whole feature under kml/Document/Folder has been parsed
+            if _local_name(element.tag) == 'Placemark':
+                placemarks += 1
+                renamed += _rename_placemark(element, field, rename)
+                if progress is not None and not placemarks % STREAM_REPORT_EVERY:
+                    progress("Renaming Placemarks", placemarks, None)
+            write_element(element)
+            output.write('\n')
+            if containers:
+                containers[-1].remove(element)
+
+    if progress is not None:
+        progress("Renaming Placemarks", placemarks, placemarks)
+    metrics.finish()
+    logger.info("✅ %d value(s) renamed in %d Placemark(s), saved to %s", renamed, placemarks, export_path)
+    return export_path
+
+
+def rename_kml_field(kml_content: str | bytes, attribute_df: pd.DataFrame | str, checked_field: str = None,
+                     export_path: str = None, mode: str = 'line', progress: ProgressCallback = None,
+                     metrics: RunMetrics = None) -> str:
     """
     Rename fields in a KML file based on a mapping provided in an Excel file.
-    
+
+    In 'line' mode only lines containing 'name' are rewritten, all mappings are applied in
+    a single pass per line. 'stream' mode renames only `checked_field` with `rename_kml_stream`.
+
     Parameters:
-        kml_path (str): Path to the KML file.
-        attribute_path (str): Path to the Excel file containing the mapping of field names to change,
-                            file should contain only 1 sheet + before and after column.
-        checked_field (str): Column name of the KML file to rename.
-    
+        kml_content (str | bytes): The content of the KML file, bytes are decoded as UTF-8 in
+                            'line' mode and parsed as they are in 'stream' mode.
+        attribute_df (pd.DataFrame | str): Mapping table or path of the Excel file containing
+                            the mapping of field names to change, file should contain only
+                            1 sheet + before and after column.
+        checked_field (str, optional): Column name of the KML file to rename.
+        export_path (str, optional): Path to save the revised KML file, required in 'stream' mode.
+        mode (str, optional): 'line' or 'stream'.
+        progress (ProgressCallback, optional): Receives (stage, done, total), lines in 'line'
+                            mode and Placemarks in 'stream' mode.
+        metrics (RunMetrics, optional): Stage timings of the run, filled in place.
+
     Returns:
-        str: The revised KML content as a string.
+        str: The path of the saved file when `export_path` is given, else the revised KML content.
     """
-    with open(kml_path, 'r', encoding='utf-8') as file:
-        kml_content = file.read()
-    attribute_df = pd.read_excel(attribute_path)
+    if not kml_content or not kml_content.strip():
+        raise ValueError("KML content is empty or not provided.")
+    if mode == 'stream':
+        source = kml_content if isinstance(kml_content, bytes) else kml_content.encode('utf-8')
+        return rename_kml_stream(BytesIO(source), attribute_df, checked_field, export_path,
+                                 progress=progress, metrics=metrics)
+    if mode != 'line':
+        raise ValueError(f"Unknown rename mode '{mode}'. Use 'line' or 'stream'.")
+    if isinstance(kml_content, bytes):
+        kml_content = kml_content.decode('utf-8')
+
+    metrics = metrics or RunMetrics("KML Renamer")
+    metrics.mark("Load map")
+    rename_map = load_rename_map(attribute_df)
+    logger.info("🔁 Renaming %d values in lines containing 'name'", len(rename_map))
+    rename = compile_renamer(rename_map)
+
+    metrics.mark("Rename")
     lines = kml_content.split('\n')
-    for _, row in tqdm(attribute_df.iterrows(), total = len(attribute_df)):
-        lines = [i.replace(str(row['before']), str(row['after'])) if 'name' in i.lower() else i for i in lines]
+    if progress is None:
+        revised_lines = [rename(line) if 'name' in line.lower() else line for line in tqdm(lines)]
+    else:
+        report = progress_reporter(progress)
+        revised_lines = []
+        for done, line in enumerate(tqdm(lines), start=1):
+            revised_lines.append(rename(line) if 'name' in line.lower() else line)
+            report("Renaming lines", done, len(lines))
+    kml_revised = '\n'.join(revised_lines)
 
-    kml_revised = '\n'.join(lines)
+    if export_path:
+        metrics.mark("Write")
+        with open(export_path, 'w', encoding='utf-8') as file:
+            file.write(kml_revised)
+        metrics.finish()
+        logger.info("✅ Revised KML saved to %s", export_path)
+        return export_path
+    metrics.finish()
     return kml_revised
-    
 
-kml_path = r""
-attribute_path = r""
-checked_field = 'site id'
-revised_kml = rename_kml_field(kml_path, attribute_path, checked_field)
-open(kml_path.replace('.kml','revised.kml'), 'w').write(revised_kml)
 
+if __name__ == "__main__":
+    kml_path = r""
+    attribute_path = r""
+    checked_field = 'site id'
+    rename_kml_stream(kml_path, attribute_path, checked_field, export_path=kml_path.replace('.kml', 'revised.kml'))
@@ -0,0 +1,221 @@
+import bisect
+import logging
+
+import pandas as pd
+
+from modules.utils import normalize_token
+
+logger = logging.getLogger(__name__)
+
+HUB_TOKEN = 'p0'
+# Columns describing the destination end of a segment, a bridge takes them from the segment it bypasses
+DESTINATION_END_COLUMNS = ('Destination_Name', 'Long_2', 'Lat_2', 'Priority_2', 'Existing/New Site_2')
+
+
+def hub_sites(ring_data: pd.DataFrame, column_origin: str = 'Origin Site ID', column_destination: str = 'Destination',
+              column_priorities: tuple = ('Priority_1', 'Priority_2')) -> set:
+    """Sites marked P0 on either end of a segment, the hubs a ring starts and ends at."""
+    hubs = set()
+    for column_site, column_priority in zip((column_origin, column_destination), column_priorities):
+        if column_site in ring_data.columns and column_priority in ring_data.columns:
+            mask = normalize_token(ring_data[column_priority]) == HUB_TOKEN
+            hubs.update(ring_data.loc[mask, column_site].dropna().tolist())
+    return hubs
+
+
+class RingGraph:
+    """
+    Site adjacency of New Ring segments, per Ring ID.
+
+    Built in one pass over the Origin / Destination columns: for every (ring, site) the
+    sheet positions of the segments leaving and entering the site, so successor and
+    predecessor queries are dict lookups instead of filters over the sheet. Dropping a
+    site rewires its incoming segment into a bridge to its successor without touching
+    the sheet; `segments()` serializes a ring back to rows, in chain order when the ring
+    is a single chain and in sheet order otherwise.
+    """
+    def __init__(self, ring_data: pd.DataFrame, ring_column: str = 'Ring ID_1',
+                 column_origin: str = 'Origin Site ID', column_destination: str = 'Destination'):
+        self.ring_column = ring_column
+        self.column_origin = column_origin
+        self.column_destination = column_destination
+        self._source = ring_data
+        self._origins = ring_data[column_origin].to_numpy(dtype=object).copy()
+        self._destinations = ring_data[column_destination].to_numpy(dtype=object).copy()
+        self._distances = ring_data['Total Distance (m)'].to_numpy(dtype=object) if 'Total Distance (m)' in ring_data.columns else None
+        self._rings: dict = {}
+        self._outgoing: dict[tuple, list[int]] = {}
+        self._incoming: dict[tuple, list[int]] = {}
+        self._removed: set[int] = set()
+        self._edits: dict[int, dict] = {}
+
+        ring_ids = ring_data[ring_column].to_numpy(dtype=object)
+        for position, (ring_id, origin, destination) in enumerate(zip(ring_ids, self._origins, self._destinations)):
+            self._rings.setdefault(ring_id, []).append(position)
+            if pd.notna(origin):
+                self._outgoing.setdefault((ring_id, origin), []).append(position)
+            if pd.notna(destination):
+                self._incoming.setdefault((ring_id, destination), []).append(position)
+
+    def __contains__(self, ring_id) -> bool:
+        return ring_id in self._rings
+
+    def __len__(self) -> int:
+        return len(self._rings)
+
+    @property
+    def ring_ids(self) -> list:
+        return list(self._rings)
+
+    def successor(self, ring_id, site_id):
+        """Destination of the first segment leaving the site, None when the site has none."""
+        outgoing = self._outgoing.get((ring_id, site_id))
+        return self._destinations[outgoing[0]] if outgoing else None
+
+    def predecessor(self, ring_id, site_id):
+        """Origin of the first segment entering the site, None when the site has none."""
+        incoming = self._incoming.get((ring_id, site_id))
+        return self._origins[incoming[0]] if incoming else None
+
+    def _live(self, ring_id) -> list[int]:
+        return [position for position in self._rings.get(ring_id, []) if position not in self._removed]
+
+    def _chain(self, ring_id, live: list[int]) -> list[int]:
+        """Segment positions walked from the ring start, which is the first origin nothing enters."""
+        if not live:
+            return []
+        start = next((position for position in live if not self._incoming.get((ring_id, self._origins[position]))), live[0])
+        chain, seen = [], set()
+        position = start
+        while position is not None and position not in seen:
+            chain.append(position)
+            seen.add(position)
+            outgoing = self._outgoing.get((ring_id, self._destinations[position]))
+            position = outgoing[0] if outgoing else None
+        return chain
+
+    def chain(self, ring_id) -> list:
+        """Sites of the ring in walking order, from its start to the end of the chain."""
+        positions = self._chain(ring_id, self._live(ring_id))
+        if not positions:
+            return []
+        return [self._origins[position] for position in positions] + [self._destinations[positions[-1]]]
+
+    def _distance(self, position: int):
+        edit = self._edits.get(position, {})
+        return edit.get('Total Distance (m)', self._distances[position])
+
+    def _value(self, position: int, col: str):
+        edit = self._edits.get(position, {})
+        return edit[col] if col in edit else self._source[col].iat[position]
+
+    def drop(self, ring_id, site_id) -> bool:
+        """
+        Remove a site from a ring.
+
+        The segment into the site and the segment out of it become a single bridging
+        segment, at the position of the first, whose distance is the sum of both and
+        whose destination end (name, Long/Lat, priority) is the one of the second.
+        Returns False when the site has no connection in the ring.
+        """
+        incoming = self._incoming.get((ring_id, site_id), [])
+        outgoing = self._outgoing.get((ring_id, site_id), [])
+        if not incoming and not outgoing:
+            return False
+
+        removed = incoming[:1] + outgoing[:1]
+        position = removed[0]
+        origin = self._origins[incoming[0]] if incoming else site_id
+        destination = self._destinations[outgoing[0]] if outgoing else site_id
+        logger.debug("🔄 Creating new connection: %s → %s", origin, destination)
+
+        edit = self._edits.setdefault(position, {})
+        if self._distances is not None:
+            lengths = [self._distance(segment) for segment in removed if pd.notna(self._distance(segment))]
+            edit['Total Distance (m)'] = float(sum(lengths)) if lengths else 0
+        if incoming and outgoing and incoming[0] != outgoing[0]:
+            bypassed = outgoing[0]
+            self._outgoing[(ring_id, site_id)].remove(bypassed)
+            self._incoming[(ring_id, site_id)].remove(position)
+            if pd.notna(destination):
+                entering = self._incoming[(ring_id, destination)]
+                entering.remove(bypassed)
+                bisect.insort(entering, position)
+            self._destinations[position] = destination
+            edit.update({col: self._value(bypassed, col) for col in DESTINATION_END_COLUMNS if col in self._source.columns})
+            self._removed.add(bypassed)
+            self._edits.pop(bypassed, None)
+        edit.update({self.column_origin: origin, self.column_destination: destination, 'Link Name': f"{origin}-{destination}"})
+        return True
+
+    def segments(self, ring_id) -> pd.DataFrame:
+        """Rows of the ring with its drops applied, ordered along the chain when it is unbroken."""
+        live = self._live(ring_id)
+        chain = self._chain(ring_id, live)
+        positions = chain if len(chain) == len(live) else live
+
+        pieces, run = [], []
+        for position in positions:
+            edit = self._edits.get(position)
+            if edit is None:
+                run.append(position)
+                continue
+            if run:
+                pieces.append(self._source.iloc[run])
+                run = []
+            bridge = self._source.iloc[[position]].copy()
+            for col, value in edit.items():
+                if col in bridge.columns:
+                    bridge[col] = value
+            pieces.append(bridge)
+        if run:
+            pieces.append(self._source.iloc[run])
+        # The empty slice keeps the sheet dtypes when bridges hold narrower ones
+        return pd.concat([self._source.iloc[0:0]] + pieces)
+
+    def validate(self, ring_ids=None, hubs: set = None) -> list[dict]:
+        """
+        Topology issues of the rings, one entry per issue.
+
+        - 'missing site': a segment without origin or destination.
+        - 'duplicated link': the same origin → destination segment more than once.
+        - 'branch': a site with several distinct segments leaving or entering it.
+        - 'broken': the segments do not form a single chain.
+        - 'open': with `hubs` given, a chain that does not start and end at a hub.
+        """
+        issues = []
+        for ring_id in self._rings if ring_ids is None else ring_ids:
+            live = self._live(ring_id)
+            if not live:
+                continue
+
+            def issue(kind: str, detail: str):
+                issues.append({'Ring ID': ring_id, 'Issue': kind, 'Detail': detail})
+
+            links, leaving, entering = {}, {}, {}
+            for position in live:
+                origin, destination = self._origins[position], self._destinations[position]
+                if pd.isna(origin) or pd.isna(destination):
+                    issue('missing site', f"Segment {origin}-{destination} at row {position + 1}")
+                    continue
+                links[(origin, destination)] = links.get((origin, destination), 0) + 1
+                leaving.setdefault(origin, set()).add(destination)
+                entering.setdefault(destination, set()).add(origin)
+            for (origin, destination), count in links.items():
+                if count > 1:
+                    issue('duplicated link', f"{origin}-{destination} x{count}")
+            for site_id, targets in leaving.items():
+                if len(targets) > 1:
+                    issue('branch', f"{site_id} → {sorted(map(str, targets))}")
+            for site_id, sources in entering.items():
+                if len(sources) > 1:
+                    issue('branch', f"{sorted(map(str, sources))} → {site_id}")
+
+            chain = self._chain(ring_id, live)
+            if len(chain) < len(live):
+                issue('broken', f"Chain from {self._origins[chain[0]]} covers {len(chain)} of {len(live)} segments")
+            elif hubs is not None:
+                start, end = self._origins[chain[0]], self._destinations[chain[-1]]
+                if start != end and not (start in hubs and end in hubs):
+                    issue('open', f"Chain runs {start} → {end}")
+        return issues
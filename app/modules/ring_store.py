@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+
+
+class RingStore:
+    """
+    New Ring sheet held as ordered segment blocks per Ring ID.
+
+    The sheet is split once into runs of consecutive rows sharing a Ring ID.
+    Looking up a ring, replacing its segments or appending a new ring does not
+    touch the rest of the sheet; `to_frame` rebuilds the sheet in the original
+    ring order with a single concat.
+    """
+    def __init__(self, ring_data: pd.DataFrame, ring_column: str):
+        self.ring_column = ring_column
+        self.columns = ring_data.columns
+        self._source = ring_data
+        self._blocks: list[pd.DataFrame | slice] = []
+        self._index: dict = {}
+
+        if ring_data.empty:
+            return
+        ring_ids = ring_data[ring_column].to_numpy()
+        keys = pd.Series(ring_ids).fillna('__no_ring__').to_numpy()
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        stops = np.r_[starts[1:], len(ring_data)]
+        for start, stop in zip(starts.tolist(), stops.tolist()):
+            self._index.setdefault(ring_ids[start], []).append(len(self._blocks))
+            self._blocks.append(slice(start, stop))
+
+    def __contains__(self, ring_id) -> bool:
+        return ring_id in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @property
+    def ring_ids(self) -> list:
+        return list(self._index)
+
+    def _block(self, position: int) -> pd.DataFrame:
+        block = self._blocks[position]
+        return self._source.iloc[block] if isinstance(block, slice) else block
+
+    def get(self, ring_id) -> pd.DataFrame:
+        """Segments of a ring in sheet order, empty frame when the ring does not exist."""
+        positions = self._index.get(ring_id)
+        if not positions:
+            return self._source.iloc[0:0]
+        if len(positions) == 1:
+            return self._block(positions[0])
+        return pd.concat([self._block(position) for position in positions])
+
+    def replace(self, ring_id, segments: pd.DataFrame) -> None:
+        """Put `segments` where the ring was, or append it when the ring is new."""
+        positions = self._index.get(ring_id)
+        if not positions:
+            self.append(ring_id, segments)
+            return
+        self._blocks[positions[0]] = segments
+        for position in positions[1:]:
+            self._blocks[position] = self._source.iloc[0:0]
+        self._index[ring_id] = positions[:1]
+
+    def append(self, ring_id, segments: pd.DataFrame) -> None:
+        self._index.setdefault(ring_id, []).append(len(self._blocks))
+        self._blocks.append(segments)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Materialize the sheet, untouched neighbouring blocks are sliced together."""
+        pieces = []
+        run_start = run_stop = None
+        for block in self._blocks:
+            if isinstance(block, slice):
+                if run_stop == block.start:
+                    run_stop = block.stop
+                    continue
+                if run_start is not None:
+                    pieces.append(self._source.iloc[run_start:run_stop])
+                run_start, run_stop = block.start, block.stop
+            else:
+                if run_start is not None:
+                    pieces.append(self._source.iloc[run_start:run_stop])
+                    run_start = run_stop = None
+                pieces.append(block)
+        if run_start is not None:
+            pieces.append(self._source.iloc[run_start:run_stop])
+
+        pieces = [piece for piece in pieces if not piece.empty]
+        if not pieces:
+            return pd.DataFrame(columns=self.columns)
+        return pd.concat(pieces, ignore_index=True)
@@ -0,0 +1,104 @@
+import os
+import json
+import logging
+from datetime import datetime
+import pandas as pd
+
+LOG_FORMAT = '%(asctime)s %(levelname)-7s %(name)s | %(message)s'
+REPORT_LEVELS = {
+    'errors': logging.ERROR,
+    'warnings': logging.WARNING,
+    'info': logging.INFO,
+}
+REPORT_COLUMNS = ['Time', 'Level', 'Stage', 'Ring ID', 'Site ID', 'Row', 'Message']
+
+
+def configure_logging(level: str | int = None) -> logging.Logger:
+    """
+    Send the `modules` loggers to stderr, once per process.
+
+    Each pipeline module logs to its own `logging.getLogger(__name__)`: one INFO line per
+    stage and per-row / per-ring detail at DEBUG, formatted only when the level is enabled.
+
+    Parameters:
+        level (str | int, optional): Log level, default from the LOG_LEVEL environment
+                            variable, else INFO.
+
+    Returns:
+        logging.Logger: The `modules` package logger.
+    """
+    level = level or os.environ.get('LOG_LEVEL') or 'INFO'
+    logger = logging.getLogger('modules')
+    logger.setLevel(level.upper() if isinstance(level, str) else level)
+    if not any(getattr(handler, '_run_log', False) for handler in logger.handlers):
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        handler._run_log = True
+        logger.addHandler(handler)
+        logger.propagate = False
+    return logger
+
+
+class RunReport:
+    """
+    Structured report of a pipeline run, replacing the former `error_log` dict.
+
+    Every entry keeps its level, stage and the ring / site / row it refers to, and is also
+    sent to the module logger. `report['errors']` still lists the messages of one level.
+    Reports of worker processes are merged back with `extend`, and the whole report is
+    exported with `to_frame`, `to_csv` or `to_json` for download.
+    """
+    def __init__(self, name: str = 'run', logger: logging.Logger = None):
+        self.name = name
+        self.logger = logger or logging.getLogger(__name__)
+        self.entries: list[dict] = []
+
+    def add(self, level: str, stage: str, message: str, ring_id=None, site_id=None, row=None):
+        if level not in REPORT_LEVELS:
+            raise ValueError(f"Unknown report level '{level}'. Use one of {list(REPORT_LEVELS)}.")
+        self.entries.append({
+            'Time': datetime.now().isoformat(timespec='seconds'),
+            'Level': level,
+            'Stage': stage,
+            'Ring ID': ring_id,
+            'Site ID': site_id,
+            'Row': row,
+            'Message': message,
+        })
+        self.logger.log(REPORT_LEVELS[level], "%s | %s", stage, message)
+
+    def error(self, stage: str, message: str, **context):
+        self.add('errors', stage, message, **context)
+
+    def warning(self, stage: str, message: str, **context):
+        self.add('warnings', stage, message, **context)
+
+    def info(self, stage: str, message: str, **context):
+        self.add('info', stage, message, **context)
+
+    def __getitem__(self, level: str) -> list[str]:
+        if level not in REPORT_LEVELS:
+            raise KeyError(level)
+        return [entry['Message'] for entry in self.entries if entry['Level'] == level]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def extend(self, other: 'RunReport'):
+        """Append the entries of another report, e.g. from a worker process, without logging them again."""
+        self.entries.extend(other.entries)
+
+    def counts(self) -> dict[str, int]:
+        counts = dict.fromkeys(REPORT_LEVELS, 0)
+        for entry in self.entries:
+            counts[entry['Level']] += 1
+        return counts
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.entries, columns=REPORT_COLUMNS, dtype=object)
+
+    def to_csv(self) -> str:
+        return self.to_frame().to_csv(index=False)
+
+    def to_json(self) -> str:
+        return json.dumps({'name': self.name, 'counts': self.counts(), 'entries': self.entries}, default=str, indent=2)
@@ -0,0 +1,104 @@
+import logging
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Runs tracing memory in this process, tracemalloc is stopped when the last one finishes
+_tracing_lock = threading.Lock()
+_tracing_runs: set[int] = set()
+_tracing_owned = False
+
+
+class RunMetrics:
+    """
+    Wall time and `tracemalloc` peak of each stage of a pipeline run.
+
+    Stages are either wrapped with `stage(name)` or chained with `mark(name)`, which ends
+    the running stage and starts the next one, so long pipelines keep their layout.
+    With `trace_memory` the peak of Python allocations is reset at every stage start.
+    tracemalloc is process wide: while several runs trace, the peak is not reset and
+    spans all of them, tracing stops when the last run finishes, and allocations of
+    worker processes are not counted. Tracing slows allocation heavy code down several
+    times, it is an opt-in for diagnosis and stays off in production and benchmarks.
+
+    Usage:
+        metrics = RunMetrics("Dummy Database", trace_memory=True)
+        with metrics.stage("Load"):
+            initial_data = load_dummy_data(db, ringlist)
+        metrics.mark("Insert rings")
+        ...
+        metrics.finish().to_frame()
+    """
+    def __init__(self, name: str = 'run', trace_memory: bool = False):
+        self.name = name
+        self.trace_memory = trace_memory
+        self.stages: list[dict] = []
+        self._current = None
+
+    def _start(self, stage: str):
+        global _tracing_owned
+        if self.trace_memory:
+            with _tracing_lock:
+                _tracing_runs.add(id(self))
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    _tracing_owned = True
+                if len(_tracing_runs) == 1:
+                    tracemalloc.reset_peak()
+        self._current = (stage, time.perf_counter())
+
+    def _stop(self):
+        if self._current is None:
+            return
+        stage, started = self._current
+        seconds = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1] / 1024 ** 2 if self.trace_memory and tracemalloc.is_tracing() else None
+        self.stages.append({'Stage': stage, 'Seconds': round(seconds, 3), 'Peak MB': None if peak is None else round(peak, 1)})
+        self._current = None
+        if peak is None:
+            logger.info("⏱️ %s | %s: %.2fs", self.name, stage, seconds)
+        else:
+            logger.info("⏱️ %s | %s: %.2fs | peak %.1f MB", self.name, stage, seconds, peak)
+
+    def mark(self, stage: str):
+        self._stop()
+        self._start(stage)
+
+    @contextmanager
+    def stage(self, stage: str):
+        self.mark(stage)
+        try:
+            yield self
+        finally:
+            self._stop()
+
+    def finish(self) -> 'RunMetrics':
+        """End the running stage and stop tracemalloc after the last tracing run, safe to call twice."""
+        global _tracing_owned
+        self._stop()
+        with _tracing_lock:
+            if id(self) in _tracing_runs:
+                _tracing_runs.discard(id(self))
+                if not _tracing_runs and _tracing_owned:
+                    tracemalloc.stop()
+                    _tracing_owned = False
+        return self
+
+    @property
+    def total_seconds(self) -> float:
+        return round(sum(stage['Seconds'] for stage in self.stages), 3)
+
+    @property
+    def peak_mb(self) -> float | None:
+        peaks = [stage['Peak MB'] for stage in self.stages if stage['Peak MB'] is not None]
+        return max(peaks) if peaks else None
+
+    def to_frame(self) -> pd.DataFrame:
+        frame = pd.DataFrame(self.stages, columns=['Stage', 'Seconds', 'Peak MB'])
+        total = frame['Seconds'].sum()
+        frame['Share'] = frame['Seconds'] / total if total else 0.0
+        return frame
@@ -0,0 +1,337 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+from modules.geodesy import DEVIATION_THRESHOLD, EARTH_RADIUS_M, SEGMENT_COORDINATES, great_circle_m, to_degrees
+from modules.utils import ColumnResolver, find_best_match
+from modules.workbook import sheet_frame
+
+logger = logging.getLogger(__name__)
+
+# Segments whose bounding box covers more cells are checked on every query of the level instead
+MAX_CELLS_PER_SEGMENT = 4096
+# Squares of cells searched in bulk, queries still unresolved after them are searched one by one
+LOOKUP_RADIUS = 3
+# Queries searched together, bounds the (query, segment) pairs held at once
+QUERY_BATCH = 4096
+# Cell (x, y) to a single int64 key, y stays well below 2**20 cells of 500 m
+CELL_KEY = 1 << 21
+
+
+def square(radius: int) -> np.ndarray:
+    """Cell offsets of the square ring at Chebyshev distance `radius` around a cell."""
+    if radius == 0:
+        return np.zeros((1, 2), dtype=np.int64)
+    side = np.arange(-radius, radius + 1)
+    inner = side[1:-1]
+    return np.concatenate([
+        np.column_stack([side, np.full(len(side), -radius)]),
+        np.column_stack([side, np.full(len(side), radius)]),
+        np.column_stack([np.full(len(inner), -radius), inner]),
+        np.column_stack([np.full(len(inner), radius), inner]),
+    ])
+
+
+def group_starts(keys: np.ndarray) -> np.ndarray:
+    """Positions where a run of equal values starts in a sorted array."""
+    return np.flatnonzero(np.diff(keys, prepend=keys[:1] - 1))
+
+
+def point_segment_m(points: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Planar distance from each point to the segment a-b of the same row, all in meters."""
+    ab = b - a
+    length = np.einsum('ij,ij->i', ab, ab)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = np.clip(np.einsum('ij,ij->i', points - a, ab) / length, 0, 1)
+    t = np.where(length > 0, t, 0)
+    return np.hypot(*(a + t[:, None] * ab - points).T)
+
+
+class CellGrid:
+    """
+    Segments by square cell of `cell_m` meters, in CSR layout.
+
+    A segment is registered in the cells of its bounding box that it can cross, the
+    ones whose circumscribed circle it reaches. `keys` holds the occupied cells sorted,
+    the segments of the i-th one are `ids[starts[i]:starts[i + 1]]`. Segments covering
+    more than MAX_CELLS_PER_SEGMENT cells stay out of the grid, in `oversized`.
+    """
+    def __init__(self, a: np.ndarray, b: np.ndarray, cell_m: float):
+        self.cell_m = cell_m
+        low = np.floor(np.minimum(a, b) / cell_m).astype(np.int64)
+        high = np.floor(np.maximum(a, b) / cell_m).astype(np.int64)
+        spans = high - low + 1
+        counts = spans[:, 0] * spans[:, 1]
+        oversized = counts > MAX_CELLS_PER_SEGMENT
+        self.oversized = np.flatnonzero(oversized)
+
+        segments = np.flatnonzero(~oversized)
+        repeats = counts[segments]
+        ids = np.repeat(segments, repeats)
+        offset = np.arange(len(ids)) - np.repeat(np.cumsum(repeats) - repeats, repeats)
+        cells = low[ids] + np.column_stack([offset // spans[ids, 1], offset % spans[ids, 1]])
+        near = point_segment_m((cells + 0.5) * cell_m, a[ids], b[ids]) <= cell_m * np.sqrt(0.5)
+        ids, cells = ids[near], cells[near]
+
+        keys = cells[:, 0] * CELL_KEY + cells[:, 1]
+        order = np.argsort(keys, kind='stable')
+        keys, self.ids = keys[order], ids[order]
+        starts = group_starts(keys)
+        self.keys = keys[starts]
+        self.starts = np.r_[starts, len(keys)]
+        self.cells = cells[order][starts]
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def pairs(self, queries: np.ndarray, cells: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """(query, segment) pairs of the segments registered in the cell of each query."""
+        if not len(self.keys):
+            return queries[:0], self.ids[:0]
+        keys = cells[:, 0] * CELL_KEY + cells[:, 1]
+        slots = np.minimum(np.searchsorted(self.keys, keys), len(self.keys) - 1)
+        hit = self.keys[slots] == keys
+        queries, slots = queries[hit], slots[hit]
+        counts = self.starts[slots + 1] - self.starts[slots]
+        offset = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        return np.repeat(queries, counts), self.ids[np.repeat(self.starts[slots], counts) + offset]
+
+    def bounds(self, point: np.ndarray) -> np.ndarray:
+        """Distance from the point to each occupied cell, a lower bound for its segments."""
+        gap = np.maximum(np.abs((self.cells + 0.5) * self.cell_m - point) - self.cell_m / 2, 0)
+        return np.hypot(gap[:, 0], gap[:, 1])
+
+    def segments(self, cells: np.ndarray) -> np.ndarray:
+        """Segments registered in the occupied cells, by position in `keys`."""
+        return np.concatenate([self.ids[self.starts[cell]:self.starts[cell + 1]] for cell in cells] or [self.ids[:0]])
+
+
+class SegmentIndex:
+    """
+    Grid index over the segments of a New Ring sheet, for nearest segment queries.
+
+    Segment ends are projected to meters around the mean latitude and registered in a
+    `CellGrid` of about one median segment length per cell. Queries are answered in
+    bulk: all pending points read their next square of cells at once, and a point is
+    resolved when its k nearest segments are closer than anything outside the square, so
+    results are exact. The few points still pending after LOOKUP_RADIUS squares, far from
+    the network, read the occupied cells nearest first. `suggest` turns the nearest
+    segments of new sites into Near End / Far End candidates with the fibre length the
+    insertion would add.
+    """
+    def __init__(self, ring_data: pd.DataFrame, ring_column: str = 'Ring ID_1', column_origin: str = 'Origin Site ID',
+                 column_destination: str = 'Destination', cell_m: float = None, columns=SEGMENT_COORDINATES):
+        long_1, lat_1, long_2, lat_2 = (to_degrees(ring_data[col]) for col in columns)
+        geodesic = great_circle_m(long_1, lat_1, long_2, lat_2)
+        valid = np.isfinite(geodesic)
+        self.ring_ids = ring_data[ring_column].to_numpy(dtype=object)[valid]
+        self.origins = ring_data[column_origin].to_numpy(dtype=object)[valid]
+        self.destinations = ring_data[column_destination].to_numpy(dtype=object)[valid]
+        self.link_names = (ring_data['Link Name'].to_numpy(dtype=object)[valid] if 'Link Name' in ring_data.columns
+                           else np.array([f"{a}-{b}" for a, b in zip(self.origins, self.destinations)], dtype=object))
+        # Sites as integer codes, excluding the own segments of a site compares ints
+        codes, sites = pd.factorize(np.concatenate([self.origins, self.destinations]))
+        self._sites = pd.Index(sites)
+        self._origin_codes, self._destination_codes = codes[:len(self.origins)], codes[len(self.origins):]
+        self._ends = np.column_stack([long_1, lat_1, long_2, lat_2])[valid]
+        self._geodesic = geodesic[valid]
+        self._route_factor = self._route_factors(ring_data, valid)
+
+        lat_0 = np.mean(self._ends[:, [1, 3]]) if len(self) else 0.0
+        self._scale = np.radians(1) * EARTH_RADIUS_M * np.array([np.cos(np.radians(lat_0)), 1.0])
+        self._a = self._ends[:, 0:2] * self._scale
+        self._b = self._ends[:, 2:4] * self._scale
+        if cell_m is None:
+            cell_m = max(float(np.median(self._geodesic)), 500.0) if len(self) else 1000.0
+        self._grid = CellGrid(self._a, self._b, cell_m)
+        logger.debug("Segment index | %s of %s segments with coordinates in %s cells of %.0f m",
+                     len(self), len(ring_data), len(self._grid), cell_m)
+
+    def __len__(self) -> int:
+        return len(self._geodesic)
+
+    @property
+    def cell_m(self) -> float:
+        return self._grid.cell_m
+
+    def _route_factors(self, ring_data: pd.DataFrame, valid: np.ndarray) -> np.ndarray:
+        """Stored / great circle distance per segment, the median of plausible ratios where unknown."""
+        if 'Total Distance (m)' not in ring_data.columns:
+            return np.ones(valid.sum())
+        stored = pd.to_numeric(ring_data['Total Distance (m)'], errors='coerce').to_numpy(dtype=float)[valid]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = stored / self._geodesic
+        plausible = (ratio >= 1) & (ratio <= 1 + DEVIATION_THRESHOLD)
+        fallback = float(np.median(ratio[plausible])) if plausible.any() else 1.0
+        return np.where(plausible, ratio, fallback)
+
+    def _top_k(self, found: tuple, queries: np.ndarray, ids: np.ndarray, points: np.ndarray, k: int, site_codes) -> tuple:
+        """
+        Merges new (query, segment) pairs into the k nearest distinct segments of every query.
+
+        Returns:
+            tuple: queries, segments, distances and rank (0 for the nearest), sorted by
+                query then distance.
+        """
+        if site_codes is not None:
+            # Segments the site already belongs to are not insertion candidates
+            keep = (self._origin_codes[ids] != site_codes[queries]) & (self._destination_codes[ids] != site_codes[queries])
+            queries, ids = queries[keep], ids[keep]
+        distances = point_segment_m(points[queries], self._a[ids], self._b[ids])
+        queries, ids, distances = (np.concatenate([old, new]) for old, new in zip(found[:3], (queries, ids, distances)))
+
+        _, first = np.unique(queries * len(self) + ids, return_index=True)
+        order = first[np.lexsort((ids[first], distances[first], queries[first]))]
+        queries, ids, distances = queries[order], ids[order], distances[order]
+        starts = group_starts(queries)
+        rank = np.arange(len(queries)) - np.repeat(starts, np.diff(np.r_[starts, len(queries)]))
+        keep = rank < k
+        return queries[keep], ids[keep], distances[keep], rank[keep]
+
+    def nearest(self, longitudes, latitudes, k: int = 3, site_ids=None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Nearest segments of each point, by planar distance to the segment.
+
+        Parameters:
+            longitudes, latitudes: Coordinates of the points, text with decimal comma allowed.
+            k (int): Segments per point.
+            site_ids (optional): Site ID of each point, segments starting or ending at the
+                    site are skipped.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: (n, k) segment numbers, -1 where fewer than k
+                segments exist or the point has no coordinates, and distances in meters.
+        """
+        longitudes, latitudes = to_degrees(longitudes), to_degrees(latitudes)
+        ids = np.full((len(longitudes), k), -1, dtype=np.int64)
+        distances = np.full((len(longitudes), k), np.nan)
+        valid = (np.abs(latitudes) <= 90) & (np.abs(longitudes) <= 180)
+        if not len(self) or not valid.any():
+            return ids, distances
+        site_codes = None
+        if site_ids is not None:
+            # Unknown sites match no segment, not even the ones with a blank end (code -1)
+            site_codes = self._sites.get_indexer(np.asarray(site_ids, dtype=object))
+            site_codes[site_codes < 0] = -2
+        points = np.where(valid[:, None], np.column_stack([longitudes, latitudes]), 0) * self._scale
+        cells = np.floor(points / self.cell_m).astype(np.int64)
+
+        pending = np.flatnonzero(valid)
+        for first in range(0, len(pending), QUERY_BATCH):
+            batch = pending[first:first + QUERY_BATCH]
+            found = self._top_k((batch[:0], batch[:0], np.empty(0), batch[:0]), np.repeat(batch, len(self._grid.oversized)),
+                                np.tile(self._grid.oversized, len(batch)), points, k, site_codes)
+            for radius in range(LOOKUP_RADIUS + 1):
+                offsets = square(radius)
+                queries, segments = self._grid.pairs(np.repeat(batch, len(offsets)),
+                                                     np.repeat(cells[batch], len(offsets), axis=0) + np.tile(offsets, (len(batch), 1)))
+                found = self._top_k(found, queries, segments, points, k, site_codes)
+
+                # Segments outside the square are at least `radius` cells away
+                kth = found[3] == k - 1
+                resolved = np.zeros(len(points), dtype=bool)
+                resolved[found[0][kth]] = found[2][kth] <= radius * self.cell_m
+                queries, segments, segment_distances, rank = (array[resolved[found[0]]] for array in found)
+                ids[queries, rank] = segments
+                distances[queries, rank] = segment_distances
+                found = tuple(array[~resolved[found[0]]] for array in found)
+                batch = batch[~resolved[batch]]
+
+            for number in batch:
+                segments, segment_distances = self._search(points, number, k, site_codes)
+                ids[number, :len(segments)] = segments
+                distances[number, :len(segments)] = segment_distances
+        return ids, distances
+
+    def _search(self, points: np.ndarray, number: int, k: int, site_codes) -> tuple[np.ndarray, np.ndarray]:
+        """Nearest segments of a point far from the network, reading occupied cells nearest first."""
+        bounds = self._grid.bounds(points[number])
+        cells = np.argsort(bounds, kind='stable')
+        found = (cells[:0], cells[:0], np.empty(0), cells[:0])
+        segments = self._grid.oversized
+        first, size = 0, 8
+        while True:
+            last = min(first + size, len(cells))
+            segments = np.concatenate([segments, self._grid.segments(cells[first:last])])
+            found = self._top_k(found, np.full(len(segments), number), segments, points, k, site_codes)
+            # Segments of the cells not read yet are at least as far as the nearest of these cells
+            if last == len(cells) or (len(found[0]) == k and found[2][-1] <= bounds[cells[last]]):
+                return found[1], found[2]
+            segments = segments[:0]
+            first, size = last, size * 2
+
+    def suggest(self, sites: pd.DataFrame, k: int = 3, column_site: str = 'Site ID', column_long: str = 'Long',
+                column_lat: str = 'Lat') -> pd.DataFrame:
+        """
+        Near End / Far End candidates for new sites, k per site ranked by distance.
+
+        The added fibre is the detour of the segment through the site, Near End → site →
+        Far End minus Near End → Far End, on great circles scaled by the route factor
+        (stored / great circle distance) of the segment.
+
+        Returns:
+            pd.DataFrame: Site ID, Rank, Ring ID, Near End, Far End, Link Name,
+                Distance to Segment (m) and Added Fibre (m), one row per candidate.
+        """
+        longitudes, latitudes = to_degrees(sites[column_long]), to_degrees(sites[column_lat])
+        site_ids = sites[column_site].to_numpy(dtype=object)
+        ids, distances = self.nearest(longitudes, latitudes, k, site_ids)
+
+        query, rank = np.nonzero(ids >= 0)
+        segments = ids[query, rank]
+        ends = self._ends[segments]
+        detour = (great_circle_m(ends[:, 0], ends[:, 1], longitudes[query], latitudes[query])
+                  + great_circle_m(longitudes[query], latitudes[query], ends[:, 2], ends[:, 3])
+                  - self._geodesic[segments])
+        return pd.DataFrame({
+            'Site ID': site_ids[query],
+            'Rank': rank + 1,
+            'Ring ID': self.ring_ids[segments],
+            'Near End': self.origins[segments],
+            'Far End': self.destinations[segments],
+            'Link Name': self.link_names[segments],
+            'Distance to Segment (m)': np.round(distances[query, rank], 1),
+            'Added Fibre (m)': np.round(detour * self._route_factor[segments], 1),
+        })
+
+
+def suggest_insert_segments(database: dict, ringlist: dict, k: int = 3, resolver: ColumnResolver = None) -> pd.DataFrame:
+    """
+    Near End / Far End candidates for the sites of a ring list, see `SegmentIndex.suggest`.
+
+    Parameters:
+        database (dict): Masterlist sheets, the segments are read from New Ring.
+        ringlist (dict): Ring list sheets, the sites are read from Insert Ring.
+        k (int): Candidates per site.
+        resolver (ColumnResolver, optional): Shared column matcher.
+
+    Returns:
+        pd.DataFrame: k rows per Insert Ring site with coordinates.
+    """
+    resolver = resolver or ColumnResolver()
+    sheets = {}
+    for sheet, workbook in (('New Ring', database), ('Insert Ring', ringlist)):
+        best_match, _ = find_best_match(sheet, list(workbook))
+        if not best_match:
+            raise ValueError(f"Sheet '{sheet}' not found.")
+        sheets[sheet] = sheet_frame(workbook[best_match])
+
+    ring_data, sites = sheets['New Ring'], sheets['Insert Ring']
+    ring_columns, site_columns = ring_data.columns.tolist(), sites.columns.tolist()
+    index = SegmentIndex(
+        ring_data,
+        ring_column=resolver.match('Ring ID', ring_columns)[0],
+        column_origin=resolver.match('Origin Site ID', ring_columns)[0],
+        column_destination=resolver.match('Destination', ring_columns)[0],
+    )
+    column_site = resolver.match('Site ID', site_columns)[0]
+    suggestions = index.suggest(
+        sites.drop_duplicates(subset=column_site),
+        k,
+        column_site=column_site,
+        column_long=resolver.match('Long', site_columns)[0],
+        column_lat=resolver.match('Lat', site_columns)[0],
+    )
+    logger.info("📍 Suggested %s segments for %s insert sites", len(suggestions), suggestions['Site ID'].nunique())
+    return suggestions
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+
+class SiteIndex:
+    """
+    Hash index from Site ID to its Site List row across several Site List sheets.
+
+    Sources are given in precedence order as (sheet, site ID column). A site present in
+    several sheets resolves to the first sheet listing it, and to its first row there.
+    Lookups go through one hashed `pd.Index`, so resolving a whole column of site IDs
+    costs one `get_indexer` call instead of a scan per row.
+    """
+    def __init__(self, *sources: tuple[pd.DataFrame, str]):
+        self.sources = [frame.reset_index(drop=True) for frame, _ in sources]
+        keys = pd.concat([
+            pd.DataFrame({
+                'site_id': frame[site_column].astype(object).to_numpy(),
+                'source': source_number,
+                'position': np.arange(len(frame)),
+            })
+            for source_number, (frame, (_, site_column)) in enumerate(zip(self.sources, sources))
+        ], ignore_index=True)
+        keys = keys.dropna(subset=['site_id']).drop_duplicates(subset='site_id', keep='first')
+
+        self._index = pd.Index(keys['site_id'].to_numpy(), dtype=object)
+        self._source = keys['source'].to_numpy()
+        self._position = keys['position'].to_numpy()
+
+    def __contains__(self, site_id) -> bool:
+        return site_id in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def locate(self, site_ids) -> tuple[np.ndarray, np.ndarray]:
+        """Source number and row position of each site ID, -1 for both when the site is unknown."""
+        found = self._index.get_indexer(pd.Index(site_ids, dtype=object))
+        missing = found < 0
+        sources = np.where(missing, -1, self._source[found])
+        positions = np.where(missing, -1, self._position[found])
+        return sources, positions
+
+    def attributes(self, site_ids: pd.Series, columns) -> pd.DataFrame:
+        """
+        Site List attributes aligned with `site_ids`.
+
+        A column is None for sites that are unknown or whose source sheet lacks that column.
+        """
+        sources, positions = self.locate(site_ids)
+        data = {}
+        for col in columns:
+            values = np.full(len(sources), None, dtype=object)
+            for source_number, frame in enumerate(self.sources):
+                if col not in frame.columns:
+                    continue
+                mask = sources == source_number
+                values[mask] = frame[col].to_numpy(dtype=object)[positions[mask]]
+            data[col] = values
+        return pd.DataFrame(data, index=site_ids.index, columns=list(columns), dtype=object)
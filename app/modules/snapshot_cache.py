@@ -0,0 +1,257 @@
+import logging
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+import time
+import datetime as dt
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Version of the snapshot layout and of the parse path producing it (header sanitizing,
+# dtype compaction). Bump it whenever either changes, older snapshots are then misses.
+SNAPSHOT_FORMAT = 3
+# Staging and removed snapshot folders start with a dot, those left by a crash are deleted after an hour
+STALE_AFTER = 3600
+
+# Object columns are split by Python type. Excel sheets mix ints, strings and dates in one
+# column (e.g. numeric Site IDs), which Parquet cannot store as is, so each type present
+# gets its own typed column, null outside its rows, and the values are put back on load.
+# The first part keeps the column name, the others are named `<column>\x00<kind>`.
+_PART_SEPARATOR = '\x00'
+# Kinds in matching order, subclasses first (bool is an int, Timestamp a datetime)
+_KINDS = (
+    ('None', type(None)),
+    ('NaT', type(pd.NaT)),
+    ('str', str),
+    ('bool', (bool, np.bool_)),
+    ('int', (int, np.integer)),
+    ('float', (float, np.floating)),
+    ('Timestamp', pd.Timestamp),
+    ('datetime', dt.datetime),
+    ('date', dt.date),
+    ('time', dt.time),
+)
+# Markers only record the rows holding the value
+_MARKERS = {'None': None, 'NaT': pd.NaT}
+# Columns of a single kind, found without looking at every value
+_INFERRED_KINDS = {'string': 'str', 'integer': 'int', 'floating': 'float', 'boolean': 'bool'}
+
+
+def _kind(value_type: type) -> str:
+    for kind, types in _KINDS:
+        if issubclass(value_type, types):
+            return kind
+    raise TypeError(f"Unsupported value type for snapshot: {value_type.__name__}")
+
+
+def _column_kinds(series: pd.Series) -> pd.Series:
+    inferred = _INFERRED_KINDS.get(pd.api.types.infer_dtype(series, skipna=False))
+    if inferred is not None:
+        return pd.Series(inferred, index=series.index)
+    types = series.map(type)
+    return types.map({value_type: _kind(value_type) for value_type in types.unique()})
+
+
+def _encode(series: pd.Series, kind: str, mask: pd.Series) -> pd.Series:
+    if kind in _MARKERS:
+        return mask
+    part = series.where(mask)
+    if kind == 'str':
+        return part.astype('string')
+    if kind == 'bool':
+        return part.astype('boolean')
+    if kind == 'int':
+        return part.astype('Int64')
+    if kind == 'float':
+        return part.astype('float64')
+    if kind in ('Timestamp', 'datetime'):
+        return pd.to_datetime(part)
+    return part
+
+
+def _decode(part: pd.Series, kind: str) -> tuple[np.ndarray, np.ndarray]:
+    if kind in _MARKERS:
+        mask = part.to_numpy(dtype=bool)
+        return mask, _MARKERS[kind]
+    mask = part.notna().to_numpy()
+    part = part[mask]
+    if kind == 'int':
+        part = part.astype('int64')
+    elif kind == 'bool':
+        part = part.astype(bool)
+    elif kind == 'datetime':
+        return mask, np.array(part.dt.to_pydatetime(), dtype=object)
+    return mask, part.to_numpy(dtype=object)
+
+
+def _to_table(df: pd.DataFrame) -> tuple[pd.DataFrame, list]:
+    encoded = {}
+    extra = {}
+    split = []
+    for col in df.columns:
+        series = df[col]
+        if series.dtype != object or series.empty:
+            encoded[col] = series
+            continue
+        kinds = _column_kinds(series)
+        names = list(kinds.unique())
+        for position, kind in enumerate(names):
+            part = _encode(series, kind, kinds == kind)
+            if position:
+                extra[f"{col}{_PART_SEPARATOR}{kind}"] = part
+            else:
+                encoded[col] = part
+        split.append([col, names])
+    encoded.update(extra)
+    return pd.DataFrame(encoded, index=df.index), split
+
+
+def _from_table(table: pd.DataFrame, split: list) -> pd.DataFrame:
+    for col, names in split:
+        values = np.full(len(table), np.nan, dtype=object)
+        for position, kind in enumerate(names):
+            part = table[col] if not position else table.pop(f"{col}{_PART_SEPARATOR}{kind}")
+            mask, objects = _decode(part, kind)
+            values[mask] = objects
+        table[col] = pd.Series(values, index=table.index, dtype=object)
+    return table
+
+
+class SnapshotCache:
+    """
+    Parquet snapshots of sanitized workbooks, keyed by a BLAKE2 digest of the file content.
+
+    Each workbook is a folder `<key>/` holding one Parquet file per sheet and a
+    `manifest.json` with the snapshot format and the sheet order. Snapshots of another
+    format are misses. Sheets left unparsed (`LazySheet`) are only listed in the manifest
+    and come back as None, to be rebuilt from the file content.
+    Hits are read with memory mapping and touch the manifest, so the least recently used
+    snapshots are evicted first once the folder grows past `max_bytes`, and snapshots not
+    read for `ttl` seconds expire.
+    """
+    def __init__(self, cache_dir: str | os.PathLike, max_bytes: int = 512 * 1024 ** 2, ttl: float = None):
+        self.cache_dir = str(cache_dir)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+
+    @staticmethod
+    def key(content: bytes) -> str:
+        # 128-bit digest, collision safe for a cache and faster than SHA-256 on large uploads
+        return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+    def _expired(self, manifest_path: str) -> bool:
+        return self.ttl is not None and time.time() - os.path.getmtime(manifest_path) > self.ttl
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def _remove(self, path: str):
+        """Move a snapshot out of its key before deleting it, so readers find it whole or not at all."""
+        trash = tempfile.mkdtemp(dir=self.cache_dir, prefix='.removed-')
+        try:
+            os.replace(path, os.path.join(trash, 'snapshot'))
+        except OSError:
+            pass  # Already removed by a concurrent run
+        shutil.rmtree(trash, ignore_errors=True)
+
+    def get(self, key: str) -> dict[str, pd.DataFrame | None] | None:
+        manifest_path = os.path.join(self._path(key), 'manifest.json')
+        if not os.path.exists(manifest_path):
+            return None
+        if self._expired(manifest_path):
+            logger.info("⌛ Snapshot %s expired", key[:12])
+            self._remove(self._path(key))
+            return None
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as file:
+                manifest = json.load(file)
+            if manifest.get('format') != SNAPSHOT_FORMAT:
+                logger.info("🔄 Snapshot %s has format %s, expected %s, reparsing workbook",
+                            key[:12], manifest.get('format'), SNAPSHOT_FORMAT)
+                self._remove(self._path(key))
+                return None
+            workbook = {}
+            for sheet in manifest['sheets']:
+                if sheet['file'] is None:
+                    workbook[sheet['name']] = None
+                    continue
+                table = pd.read_parquet(os.path.join(self._path(key), sheet['file']), memory_map=True)
+                workbook[sheet['name']] = _from_table(table, sheet['split'])
+            os.utime(manifest_path)
+            return workbook
+        except Exception as e:
+            logger.warning("⚠️ Snapshot %s unreadable, reparsing workbook: %s", key[:12], e)
+            self._remove(self._path(key))
+            return None
+
+    def put(self, key: str, workbook: dict[str, pd.DataFrame]) -> bool:
+        target = self._path(key)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Unique per call, concurrent puts of the same workbook never share a staging folder
+        staging = tempfile.mkdtemp(dir=self.cache_dir, prefix=f".{key}-")
+        try:
+            sheets = []
+            for position, (sheet_name, df) in enumerate(workbook.items()):
+                if not isinstance(df, pd.DataFrame):
+                    sheets.append({'name': sheet_name, 'file': None, 'split': []})
+                    continue
+                table, split = _to_table(df)
+                file_name = f"{position}.parquet"
+                table.to_parquet(os.path.join(staging, file_name))
+                sheets.append({'name': sheet_name, 'file': file_name, 'split': split})
+            with open(os.path.join(staging, 'manifest.json'), 'w', encoding='utf-8') as file:
+                json.dump({'format': SNAPSHOT_FORMAT, 'sheets': sheets}, file)
+            if os.path.isdir(target) and not os.path.exists(os.path.join(target, 'manifest.json')):
+                self._remove(target)  # Left by an interrupted write
+            try:
+                os.replace(staging, target)
+            except OSError:
+                # Same content already published by a concurrent put, the snapshot in place is kept
+                shutil.rmtree(staging, ignore_errors=True)
+        except Exception as e:
+            logger.warning("⚠️ Snapshot not written: %s", e)
+            shutil.rmtree(staging, ignore_errors=True)
+            return False
+
+        self.evict()
+        return True
+
+    def evict(self) -> list[str]:
+        """Remove expired snapshots, then the least recently used until the cache fits in `max_bytes`."""
+        if not os.path.isdir(self.cache_dir):
+            return []
+        entries = []
+        evicted = []
+        for key in os.listdir(self.cache_dir):
+            if key.startswith('.'):
+                # Folder being staged or removed by another run, unless a crash left it behind
+                try:
+                    if time.time() - os.path.getmtime(self._path(key)) > STALE_AFTER:
+                        shutil.rmtree(self._path(key), ignore_errors=True)
+                except OSError:
+                    pass
+                continue
+            manifest_path = os.path.join(self._path(key), 'manifest.json')
+            if not os.path.exists(manifest_path):
+                continue
+            if self._expired(manifest_path):
+                self._remove(self._path(key))
+                evicted.append(key)
+                continue
+            size = sum(entry.stat().st_size for entry in os.scandir(self._path(key)) if entry.is_file())
+            entries.append((os.path.getmtime(manifest_path), size, key))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, key in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(self._path(key))
+            total -= size
+            evicted.append(key)
+        if evicted:
+            logger.info("🧹 Evicted %s snapshot(s) from %s", len(evicted), self.cache_dir)
+        return evicted
@@ -0,0 +1,560 @@
+"""
+Synthetic workbooks shaped like `files/templates/`, for benchmarks and load tests.
+
+Usage (from the app directory):
+    python -m modules.synthetic --segments 100000 --output-dir ../files/synthetic
+"""
+import argparse
+import logging
+import os
+from functools import cached_property
+import numpy as np
+import pandas as pd
+from modules.excel_export import DatabaseWriter
+from modules.geodesy import great_circle_m
+
+logger = logging.getLogger(__name__)
+
+# Region: (area prefix of the site IDs, city codes, (Long, Lat) of the region centre)
+REGIONS = {
+    'BRO': ('11', ['PDG', 'TGN', 'PLR', 'RKB'], (106.3, -6.4)),
+    'CJRO': ('14', ['PAT', 'RBG', 'SMG', 'KDS'], (110.6, -6.9)),
+    'EJRO': ('16', ['SBY', 'SDA', 'MJK', 'GSK'], (112.7, -7.4)),
+    'KRO': ('20', ['PTK', 'MPW', 'SKW', 'KBR'], (109.3, 0.0)),
+    'NSRO': ('01', ['MDN', 'BNJ', 'SIB', 'TBT'], (98.7, 3.6)),
+}
+PROGRAMS = ['MOCN-Phase2', 'Q3 New Site 2024', 'H2B1 New Site Coverage', 'Q2 Cap Expansion AOP2025', 'NW Expansion']
+SITE_OWNERS = ['TBG', 'Protelindo', 'Mitratel', 'CMI']
+NAME_WORDS = [
+    'KEDALON', 'BATANGAN', 'MAGUAN', 'KUNIRAN', 'JUWANA', 'KARANGSARI', 'CIGONDANG', 'NAMPRAK', 'MENDUNG', 'KEDATON',
+    'CURUG', 'MAYORA', 'JATAKE', 'TIARA', 'SIANTAN', 'LAYANG', 'TANJUNG', 'HULU', 'DARMO', 'KETINTANG',
+    'SUMBER', 'REJO', 'WETAN', 'KULON', 'PASAR', 'BARU', 'LAMA', 'INDAH', 'JAYA', 'MAKMUR',
+]
+HUBS_PER_CITY = 40
+# Fibre routes follow roads, so they are longer than the great circle distance
+ROUTE_FACTOR = (1.15, 1.45)
+
+# Columns of the template sheets, after `sanitize_header`
+SITELIST_COLUMNS = [
+    'No', 'Site ID', 'Site ID IOH', 'Site Name', 'Long', 'Lat', 'SoW', 'Vendor', 'Region', 'Existing/New Site',
+    'Segmen ID', 'RING ID', 'Program Name', 'Program Ring', 'Program Status', 'Site Owner', 'Initial Site ID',
+    'Initial Site Name', 'insert/new ring', 'Site Status (MT)', 'Site ID (MT)',
+]
+LENGTH_COLUMNS = ['No', 'Program', 'Region', 'Ring ID', '#of Site', 'FO Distance (Meter)', 'Vendor', 'AVG Length', 'Ring Status']
+RING_COLUMNS = [
+    'No', 'Ring ID_1', 'Vendor', 'Origin Site ID', 'Origin_Name', 'Long_1', 'Lat_1', 'Priority_1', 'Existing/New Site_1',
+    'Destination', 'Destination_Name', 'Long_2', 'Lat_2', 'Priority_2', 'Existing/New Site_2', 'Link Name', 'Ring ID_2',
+    'RING/STAR', 'Ring Status', 'Region', 'Existing Cable (m)', 'New Cable (m)', 'Total Distance (m)', 'Remark', 'Program',
+]
+PEER_COLUMNS = ['Ring ID_3', 'Peer 1 (SITE ID)', 'Peer 1', 'Peer 2 (SITE ID)', 'Peer 2']
+WO_SITELIST_COLUMNS = [
+    'No', 'Site ID', 'Site ID IOH', 'Site Name', 'Long', 'Lat', 'SoW', 'Vendor', 'Region', 'Existing/New Site',
+    'Segmen ID', 'RING ID', 'Program Name', 'Program Site', 'Site Owner', 'Initial Site ID', 'Initial Site Name',
+    'insert/new ring',
+]
+WO_NEWRING_COLUMNS = [col for col in RING_COLUMNS if col not in ('Existing Cable (m)', 'Remark')] + PEER_COLUMNS
+WO_INSERTRING_COLUMNS = RING_COLUMNS + PEER_COLUMNS
+DROPSITE_COLUMNS = [
+    'No', 'Site ID', 'Site ID IOH', 'Site Name', 'Long', 'Lat', 'SoW', 'Vendor', 'Region', 'Existing/New Site',
+    'Ring ID', 'Program Name',
+]
+DROP_HISTORY_COLUMNS = [col for col in SITELIST_COLUMNS if col not in ('Site Status (MT)', 'Site ID (MT)')] + [
+    'Status Site', 'Acceptor Site', 'Remark',
+]
+RINGLIST_SITELIST_COLUMNS = [
+    'No', 'Site ID', 'Site ID IOH', 'Site Name', 'Long', 'Lat', 'SoW', 'Vendor', 'Region', 'Existing/New Site',
+    'Segmen ID', 'RING ID', 'Program Name', 'insert/new ring',
+]
+RINGLIST_INSERTRING_COLUMNS = [
+    'No', 'Ring ID', 'Site ID', 'Site Name', 'Long', 'Lat', 'Region', 'Vendor', 'Program', 'Old Segment', 'Near End',
+    'Far End', 'New Segment 1', 'Existing Cable (m)_1', 'New Cable (m)_1', 'Total Distance (m)_1', 'Remark_1',
+    'New Segment 2', 'Existing Cable (m)_2', 'New Cable (m)_2', 'Total Distance (m)_2', 'Remark_2',
+]
+
+# Independent random streams, so each workbook is the same whatever the call order
+STREAMS = {'hubs': 0, 'database': 1, 'work_order': 2, 'drop_site': 3, 'ring_list': 4, 'rename_map': 5, 'history': 6}
+
+
+def _random_names(rng: np.random.Generator, count: int, suffix: str = None) -> np.ndarray:
+    words = np.array(NAME_WORDS, dtype=object)
+    names = words[rng.integers(len(words), size=count)] + '_' + words[rng.integers(len(words), size=count)]
+    return names + f'_{suffix}' if suffix else names
+
+
+class SyntheticNetwork:
+    """
+    Seeded fibre ring network with the workbooks of every pipeline built on top of it.
+
+    Rings run from an FO hub (P0) through `sites_per_ring` access sites to a second hub
+    of the same city, hubs are shared between rings like in the masterlist. Sites are
+    spread along a bent path between the two hubs and 'Total Distance (m)' is the great
+    circle distance times a route factor. The database holds exactly `segments` ring
+    segments, the other workbooks reference its rings and sites:
+        - `database()`: Site List, Length, New Ring, Summary and Drop Site of the masterlist.
+        - `work_order()`: Site List, New Ring, Insert Ring and Del Segment of a work order.
+        - `drop_site()`: one sheet of existing sites to drop.
+        - `ring_list()`: Site List and Insert Ring of a dummy database ring list.
+        - `kml()` / `rename_map()`: site Placemarks and a before/after mapping.
+
+    Usage:
+        network = SyntheticNetwork(segments=10_000, seed=7)
+        write_workbook(network.database(), "Database.xlsx")
+    """
+    def __init__(self, segments: int = 1000, sites_per_ring: tuple[int, int] = (6, 14), seed: int = 0):
+        low, high = sites_per_ring
+        if segments < 2:
+            raise ValueError("A network needs at least 2 segments.")
+        if not 1 <= low <= high:
+            raise ValueError(f"Invalid sites per ring {sites_per_ring}, expected 1 <= low <= high.")
+        self.segments = segments
+        self.sites_per_ring = sites_per_ring
+        self.seed = seed
+        self._id_width = max(4, len(str(segments)) + 1)
+        self._build_hubs()
+        self._rings, self._segments = self._build_rings(self._rng('database'), segments, 'DF', 'Existing Site', 'New Ring')
+
+    def _rng(self, stream: str) -> np.random.Generator:
+        return np.random.default_rng([self.seed, STREAMS[stream]])
+
+    def _build_hubs(self):
+        rng = self._rng('hubs')
+        shape = (len(REGIONS), max(len(codes) for _, codes, _ in REGIONS.values()), HUBS_PER_CITY)
+        centres = np.array([centre for _, _, centre in REGIONS.values()])
+        city_long = centres[:, 0, None] + rng.normal(0, 0.35, shape[:2])
+        city_lat = centres[:, 1, None] + rng.normal(0, 0.35, shape[:2])
+        self._hub_long = city_long[..., None] + rng.normal(0, 0.08, shape)
+        self._hub_lat = city_lat[..., None] + rng.normal(0, 0.08, shape)
+        self._hub_name = _random_names(rng, int(np.prod(shape)), 'EP').reshape(shape)
+
+    def _site_ids(self, prefixes, codes, tag: str = '') -> np.ndarray:
+        width = self._id_width
+        return np.array([
+            f"{prefix}{code}{tag}{serial:0{width}d}" for serial, (prefix, code) in enumerate(zip(prefixes, codes), start=1)
+        ], dtype=object)
+
+    def _build_rings(self, rng: np.random.Generator, segments: int, kind: str, site_status: str, ring_status: str):
+        """
+        Rings with `segments` segments in total.
+
+        Returns:
+            tuple[pd.DataFrame, pd.DataFrame]: One row per ring (ID, region, city, first
+                segment position and access site count) and the segments in ring order,
+                with the New Ring columns plus 'Site Owner' and the peer columns.
+        """
+        low, high = self.sites_per_ring
+        draws = rng.integers(low, high + 1, size=segments // (low + 1) + 1)
+        ends = np.cumsum(draws + 1)
+        last = int(np.searchsorted(ends, segments))
+        sizes = draws[:last + 1].copy()
+        sizes[-1] -= ends[last] - segments
+        if sizes[-1] < 1:
+            # A hub to hub ring is not a ring, its segment goes to the previous one
+            sizes = sizes[:-1]
+            sizes[-1] += 1
+        ring_count = len(sizes)
+
+        region_names = np.array(list(REGIONS), dtype=object)
+        prefixes = np.array([prefix for prefix, _, _ in REGIONS.values()], dtype=object)
+        codes = np.array([city_codes for _, city_codes, _ in REGIONS.values()], dtype=object)
+        region = rng.integers(len(REGIONS), size=ring_count)
+        city = rng.integers(codes.shape[1], size=ring_count)
+        hub_a = rng.integers(HUBS_PER_CITY, size=ring_count)
+        hub_b = (hub_a + rng.integers(1, HUBS_PER_CITY, size=ring_count)) % HUBS_PER_CITY
+        program = np.array(PROGRAMS, dtype=object)[rng.integers(len(PROGRAMS), size=ring_count)]
+        ring_prefix, ring_code = prefixes[region], codes[region, city]
+        ring_ids = np.array([
+            f"TBG-{code}-{name.replace(' ', '').replace('-', '')}-{kind}{serial:03d}"
+            for serial, (code, name) in enumerate(zip(ring_code, program), start=1)
+        ], dtype=object)
+        hub_a_id = np.array([f"{p}{c}{h + 1:03d}" for p, c, h in zip(ring_prefix, ring_code, hub_a)], dtype=object)
+        hub_b_id = np.array([f"{p}{c}{h + 1:03d}" for p, c, h in zip(ring_prefix, ring_code, hub_b)], dtype=object)
+        a_long, a_lat = self._hub_long[region, city, hub_a], self._hub_lat[region, city, hub_a]
+        b_long, b_lat = self._hub_long[region, city, hub_b], self._hub_lat[region, city, hub_b]
+
+        # Access sites along a bent path from hub A to hub B
+        site_ring = np.repeat(np.arange(ring_count), sizes)
+        site_count = len(site_ring)
+        t = rng.random(site_count)
+        t = t[np.lexsort((t, site_ring))]
+        bulge = rng.uniform(-0.5, 0.5, ring_count)[site_ring] * np.sin(np.pi * t)
+        dx, dy = (b_long - a_long)[site_ring], (b_lat - a_lat)[site_ring]
+        site_long = a_long[site_ring] + t * dx - dy * bulge + rng.normal(0, 0.002, site_count)
+        site_lat = a_lat[site_ring] + t * dy + dx * bulge + rng.normal(0, 0.002, site_count)
+        site_ids = self._site_ids(ring_prefix[site_ring], ring_code[site_ring], 'N' if kind != 'DF' else '')
+        site_names = _random_names(rng, site_count)
+
+        # Nodes of each ring: hub A, access sites, hub B
+        counts = sizes + 2
+        node_ring = np.repeat(np.arange(ring_count), counts)
+        position = np.arange(len(node_ring)) - np.repeat(np.cumsum(counts) - counts, counts)
+        first, last = position == 0, position == counts[node_ring] - 1
+        access = ~(first | last)
+
+        def nodes(hub_a_value, site_value, hub_b_value, dtype=object):
+            values = np.empty(len(node_ring), dtype=dtype)
+            values[first], values[access], values[last] = hub_a_value, site_value, hub_b_value
+            return values
+
+        node_id = nodes(hub_a_id, site_ids, hub_b_id)
+        node_name = nodes(self._hub_name[region, city, hub_a], site_names, self._hub_name[region, city, hub_b])
+        node_long = nodes(a_long, site_long, b_long, dtype=float)
+        node_lat = nodes(a_lat, site_lat, b_lat, dtype=float)
+        node_priority = np.where(access, 'Access', 'P0').astype(object)
+        node_status = np.where(access, site_status, 'FO HUB').astype(object)
+        node_owner = np.array(SITE_OWNERS, dtype=object)[rng.integers(len(SITE_OWNERS), size=len(node_ring))]
+
+        origin = np.flatnonzero(node_ring[:-1] == node_ring[1:])
+        destination = origin + 1
+        segment_ring = node_ring[origin]
+        distance = great_circle_m(node_long[origin], node_lat[origin], node_long[destination], node_lat[destination])
+        distance = np.round(distance * rng.uniform(*ROUTE_FACTOR, size=len(origin)), 2)
+
+        ring_id = ring_ids[segment_ring]
+        segments_data = pd.DataFrame({
+            'No': np.arange(1, len(origin) + 1),
+            'Ring ID_1': ring_id,
+            'Vendor': 'TBG',
+            'Origin Site ID': node_id[origin],
+            'Origin_Name': node_name[origin],
+            'Long_1': node_long[origin],
+            'Lat_1': node_lat[origin],
+            'Priority_1': node_priority[origin],
+            'Existing/New Site_1': node_status[origin],
+            'Destination': node_id[destination],
+            'Destination_Name': node_name[destination],
+            'Long_2': node_long[destination],
+            'Lat_2': node_lat[destination],
+            'Priority_2': node_priority[destination],
+            'Existing/New Site_2': node_status[destination],
+            'Link Name': node_id[origin] + '-' + node_id[destination],
+            'Ring ID_2': ring_id,
+            'RING/STAR': 'RING',
+            'Ring Status': ring_status,
+            'Region': region_names[region][segment_ring],
+            'Existing Cable (m)': np.nan,
+            'New Cable (m)': np.nan,
+            'Total Distance (m)': distance,
+            'Remark': np.nan,
+            'Program': program[segment_ring],
+            'Ring ID_3': ring_id,
+            'Peer 1 (SITE ID)': hub_a_id[segment_ring],
+            'Peer 1': node_name[first][segment_ring],
+            'Peer 2 (SITE ID)': hub_b_id[segment_ring],
+            'Peer 2': node_name[last][segment_ring],
+            'Site Owner': node_owner[origin],
+        })
+        rings = pd.DataFrame({
+            'Ring ID': ring_ids,
+            'Prefix': ring_prefix,
+            'Code': ring_code,
+            'Start': np.cumsum(sizes + 1) - (sizes + 1),
+            'Sites': sizes,
+        })
+        return rings, segments_data
+
+    # =========================
+    # SHEET BUILDERS
+    # =========================
+    @staticmethod
+    def _site_list(rows: pd.DataFrame, columns: list) -> pd.DataFrame:
+        """Site List rows of the origin site of each segment in `rows`."""
+        site_ids = rows['Origin Site ID'].to_numpy()
+        sitelist = pd.DataFrame({
+            'Site ID': site_ids,
+            'Site ID IOH': site_ids,
+            'Site Name': rows['Origin_Name'].to_numpy(),
+            'Long': rows['Long_1'].to_numpy(),
+            'Lat': rows['Lat_1'].to_numpy(),
+            'SoW': 'Dark Fiber Lease',
+            'Vendor': rows['Vendor'].to_numpy(),
+            'Region': rows['Region'].to_numpy(),
+            'Existing/New Site': rows['Existing/New Site_1'].to_numpy(),
+            'Segmen ID': rows['Link Name'].to_numpy(),
+            'RING ID': rows['Ring ID_1'].to_numpy(),
+            'Program Name': rows['Program'].to_numpy(),
+            'Program Site': rows['Existing/New Site_1'].to_numpy(),
+            'Site Owner': rows['Site Owner'].to_numpy(),
+            'Initial Site ID': site_ids,
+            'Initial Site Name': rows['Origin_Name'].to_numpy(),
+            'insert/new ring': rows['Ring Status'].to_numpy(),
+            'Site Status (MT)': site_ids,
+            'Site ID (MT)': site_ids,
+        }).reindex(columns=columns)
+        sitelist['No'] = range(1, len(sitelist) + 1)
+        return sitelist
+
+    @staticmethod
+    def _length(segments_data: pd.DataFrame) -> pd.DataFrame:
+        grouped = segments_data.groupby('Ring ID_1', sort=False)
+        length = grouped[['Program', 'Region', 'Vendor']].first()
+        length['#of Site'] = grouped.size() - 1
+        length['FO Distance (Meter)'] = grouped['Total Distance (m)'].sum()
+        length['AVG Length'] = length['FO Distance (Meter)'] / length['#of Site']
+        length['Ring Status'] = 'new ring'
+        length = length.rename_axis('Ring ID').reset_index()
+        length['No'] = range(1, len(length) + 1)
+        return length[LENGTH_COLUMNS]
+
+    def _pick_rings(self, rng: np.random.Generator, count: int, min_sites: int = 1) -> pd.DataFrame:
+        candidates = self._rings[self._rings['Sites'] >= min_sites]
+        if candidates.empty:
+            raise ValueError(f"No ring with at least {min_sites} sites in the network.")
+        default = max(1, len(self._rings) // 10)
+        count = min(default if count is None else count, len(candidates))
+        return candidates.iloc[np.sort(rng.choice(len(candidates), size=count, replace=False))]
+
+    @cached_property
+    def _sitelist(self) -> pd.DataFrame:
+        return self._site_list(self._segments[self._segments['Priority_1'] == 'Access'], SITELIST_COLUMNS)
+
+    def database(self) -> dict[str, pd.DataFrame]:
+        """
+        Masterlist sheets: Site List, Length and New Ring, then the Summary per region and
+        the Drop Site history (1% of the sites, dropped before) that the pipelines carry over.
+        """
+        sitelist = self._sitelist.copy()
+        length = self._length(self._segments)
+
+        summary = length.groupby('Region').agg(**{
+            '# Ring': ('Ring ID', 'size'),
+            '# Site': ('#of Site', 'sum'),
+            'FO Distance (Meter)': ('FO Distance (Meter)', 'sum'),
+        })
+        summary['AVG'] = summary['FO Distance (Meter)'] / summary['# Site']
+        summary = summary.rename_axis('Row Labels').reset_index()
+
+        rng = self._rng('history')
+        history = sitelist.iloc[np.sort(rng.choice(len(sitelist), size=max(1, len(sitelist) // 100), replace=False))]
+        history = history.reindex(columns=DROP_HISTORY_COLUMNS).reset_index(drop=True)
+        site_ids = history['Site ID']
+        history['Site ID'] = history['Site ID IOH'] = self._site_ids(site_ids.str[:2], site_ids.str[2:5], 'X')
+        history['Status Site'] = 'Dropped'
+        history['No'] = range(1, len(history) + 1)
+        return {
+            'Site List': sitelist,
+            'Length': length,
+            'New Ring': self._segments[RING_COLUMNS].copy(),
+            'Summary': summary,
+            'Drop Site': history,
+        }
+
+    def work_order(self, new_ring_segments: int = None, insert_rings: int = None) -> dict[str, pd.DataFrame]:
+        """
+        Work order sheets: Site List, New Ring, Insert Ring and Del Segment.
+
+        New rings use new sites, `new_ring_segments` defaults to 2% of the database.
+        Each insert ring is a database ring with one segment A-B split into A-X and X-B
+        by a new 'Insert Site' X, the replaced segments are listed in Del Segment.
+        `insert_rings` defaults to 10% of the rings.
+        """
+        rng = self._rng('work_order')
+        new_ring_segments = max(2, self.segments // 50) if new_ring_segments is None else new_ring_segments
+        _, new_ring = self._build_rings(rng, new_ring_segments, 'NR', 'New Site', 'new ring')
+        new_ring['RING/STAR'] = 'Ring'
+
+        rings = self._pick_rings(rng, insert_rings)
+        split = rings['Start'].to_numpy() + rng.integers(0, rings['Sites'].to_numpy() + 1)
+        ring_rows = np.concatenate([np.arange(start, start + sites + 1) for start, sites in zip(rings['Start'], rings['Sites'])])
+        source = np.repeat(ring_rows, np.where(np.isin(ring_rows, split), 2, 1))
+        insert_ring = self._segments.iloc[source].reset_index(drop=True)
+        second = np.r_[False, source[1:] == source[:-1]]
+        first = np.r_[second[1:], False]
+
+        # New site X in the middle of the split segments
+        split_rows = insert_ring[first]
+        count = len(split_rows)
+        ring_codes = rings.set_index('Ring ID').loc[split_rows['Ring ID_1']]
+        site_ids = self._site_ids(ring_codes['Prefix'], ring_codes['Code'], 'I')
+        site_names = _random_names(rng, count)
+        site_long = (split_rows['Long_1'].to_numpy() + split_rows['Long_2'].to_numpy()) / 2 + rng.normal(0, 0.003, count)
+        site_lat = (split_rows['Lat_1'].to_numpy() + split_rows['Lat_2'].to_numpy()) / 2 + rng.normal(0, 0.003, count)
+        destination_columns = ['Destination', 'Destination_Name', 'Long_2', 'Lat_2', 'Priority_2', 'Existing/New Site_2']
+        origin_columns = ['Origin Site ID', 'Origin_Name', 'Long_1', 'Lat_1', 'Priority_1', 'Existing/New Site_1']
+        for columns, mask in ((destination_columns, first), (origin_columns, second)):
+            for col, value in zip(columns, (site_ids, site_names, site_long, site_lat, 'Insert Site', 'New Site')):
+                insert_ring.loc[mask, col] = value
+        insert_ring.loc[first | second, 'Site Owner'] = np.array(SITE_OWNERS, dtype=object)[rng.integers(len(SITE_OWNERS), size=count)].repeat(2)
+        split_segments = first | second
+        distance = great_circle_m(*(insert_ring.loc[split_segments, col] for col in ('Long_1', 'Lat_1', 'Long_2', 'Lat_2')))
+        insert_ring.loc[split_segments, 'Total Distance (m)'] = np.round(distance * rng.uniform(*ROUTE_FACTOR, size=len(distance)), 2)
+        insert_ring['Link Name'] = insert_ring['Origin Site ID'] + '-' + insert_ring['Destination']
+        insert_ring['Ring ID_2'] = np.nan
+        insert_ring['RING/STAR'] = 'ring'
+        insert_ring['Ring Status'] = 'insert ring'
+        insert_ring['No'] = range(1, len(insert_ring) + 1)
+
+        del_segment = self._segments.iloc[np.sort(split)][RING_COLUMNS].reset_index(drop=True)
+        del_segment['Remark'] = 'Segment Delete'
+        del_segment['No'] = range(1, len(del_segment) + 1)
+
+        new_sites = pd.concat([new_ring[new_ring['Priority_1'] == 'Access'], insert_ring[second]])
+        return {
+            'Site List': self._site_list(new_sites, WO_SITELIST_COLUMNS),
+            'New Ring': new_ring[WO_NEWRING_COLUMNS],
+            'Insert Ring': insert_ring[WO_INSERTRING_COLUMNS],
+            'Del Segment': del_segment,
+        }
+
+    def drop_site(self, sites: int = None) -> dict[str, pd.DataFrame]:
+        """Drop site sheet of `sites` existing access sites, 1% of the sites by default."""
+        rng = self._rng('drop_site')
+        sitelist = self._sitelist
+        sites = max(1, len(sitelist) // 100) if sites is None else min(sites, len(sitelist))
+        drops = sitelist.iloc[np.sort(rng.choice(len(sitelist), size=sites, replace=False))]
+        drops = drops.rename(columns={'RING ID': 'Ring ID'})[DROPSITE_COLUMNS].reset_index(drop=True)
+        drops['No'] = range(1, len(drops) + 1)
+        return {'Sheet1': drops}
+
+    def ring_list(self, rings: int = None, max_sites: int = 3) -> dict[str, pd.DataFrame]:
+        """
+        Dummy database ring list: Site List and Insert Ring.
+
+        Each picked ring gets 1 to `max_sites` new sites between two of its access sites
+        (Near End / Far End), `rings` defaults to 10% of the rings.
+        """
+        rng = self._rng('ring_list')
+        picked = self._pick_rings(rng, rings, min_sites=2)
+        split = picked['Start'].to_numpy() + rng.integers(1, picked['Sites'].to_numpy())
+        inserts = rng.integers(1, max_sites + 1, size=len(picked))
+        segments_data = self._segments.iloc[np.repeat(split, inserts)].reset_index(drop=True)
+        count = len(segments_data)
+
+        # Sites spread along Near End -> Far End, in chain order
+        order = np.arange(count) - np.repeat(np.cumsum(inserts) - inserts, inserts) + 1
+        t = order / np.repeat(inserts + 1, inserts)
+        near_long, near_lat = segments_data['Long_1'].to_numpy(), segments_data['Lat_1'].to_numpy()
+        far_long, far_lat = segments_data['Long_2'].to_numpy(), segments_data['Lat_2'].to_numpy()
+        site_long = near_long + t * (far_long - near_long) + rng.normal(0, 0.003, count)
+        site_lat = near_lat + t * (far_lat - near_lat) + rng.normal(0, 0.003, count)
+        ring_codes = picked.set_index('Ring ID').loc[segments_data['Ring ID_1']]
+        site_ids = self._site_ids(ring_codes['Prefix'], ring_codes['Code'], 'D')
+        near_end, far_end = segments_data['Origin Site ID'].to_numpy(), segments_data['Destination'].to_numpy()
+        new_cable = rng.integers(5, 20, size=count) * 100
+        existing_1 = np.round(great_circle_m(near_long, near_lat, site_long, site_lat) * rng.uniform(*ROUTE_FACTOR, size=count), 2)
+        existing_2 = np.round(great_circle_m(site_long, site_lat, far_long, far_lat) * rng.uniform(*ROUTE_FACTOR, size=count), 2)
+
+        insert_ring = pd.DataFrame({
+            'No': np.arange(1, count + 1),
+            'Ring ID': segments_data['Ring ID_1'].to_numpy(),
+            'Site ID': site_ids,
+            'Site Name': _random_names(rng, count),
+            'Long': site_long,
+            'Lat': site_lat,
+            'Region': segments_data['Region'].to_numpy(),
+            'Vendor': 'TBG',
+            'Program': segments_data['Program'].to_numpy(),
+            'Old Segment': segments_data['Link Name'].to_numpy(),
+            'Near End': near_end,
+            'Far End': far_end,
+            'New Segment 1': near_end + '-' + site_ids,
+            'Existing Cable (m)_1': existing_1,
+            'New Cable (m)_1': new_cable,
+            'Total Distance (m)_1': existing_1 + new_cable,
+            'Remark_1': 'Segment Insert',
+            'New Segment 2': site_ids + '-' + far_end,
+            'Existing Cable (m)_2': existing_2,
+            'New Cable (m)_2': new_cable,
+            'Total Distance (m)_2': existing_2 + new_cable,
+            'Remark_2': 'Segment Insert',
+        })
+        sitelist = pd.DataFrame({
+            'Site ID': site_ids,
+            'Site ID IOH': site_ids,
+            'Site Name': insert_ring['Site Name'],
+            'Long': site_long,
+            'Lat': site_lat,
+            'SoW': 'Dark Fiber Lease',
+            'Vendor': 'TBG',
+            'Region': insert_ring['Region'],
+            'Existing/New Site': 'New Site',
+            'Segmen ID': insert_ring['New Segment 2'],
+            'RING ID': insert_ring['Ring ID'],
+            'Program Name': insert_ring['Program'],
+            'insert/new ring': 'Insert Ring',
+        }).reindex(columns=RINGLIST_SITELIST_COLUMNS)
+        sitelist['No'] = range(1, len(sitelist) + 1)
+        return {'Site List': sitelist, 'Insert Ring': insert_ring}
+
+    def kml(self) -> str:
+        """One Placemark per access site, with its name and Site_ID / Ring_ID data on separate lines."""
+        sitelist = self._sitelist
+        lines = [
+            '<?xml version="1.0" encoding="UTF-8"?>',
+            '<kml xmlns="http://www.opengis.net/kml/2.2">',
+            '<Document>',
+            '<name>Synthetic sites</name>',
+        ]
+        for site_id, ring_id, long, lat in zip(sitelist['Site ID'], sitelist['RING ID'], sitelist['Long'], sitelist['Lat']):
+            lines += [
+                '<Placemark>',
+                f'<name>{site_id}</name>',
+                '<ExtendedData>',
+                f'<Data name="Site_ID"><value>{site_id}</value></Data>',
+                f'<Data name="Ring_ID"><value>{ring_id}</value></Data>',
+                '</ExtendedData>',
+                f'<Point><coordinates>{long:.6f},{lat:.6f},0</coordinates></Point>',
+                '</Placemark>',
+            ]
+        lines += ['</Document>', '</kml>']
+        return '\n'.join(lines)
+
+    def rename_map(self, share: float = 0.5) -> pd.DataFrame:
+        """`before` / `after` mapping of a `share` of the access sites."""
+        rng = self._rng('rename_map')
+        site_ids = self._sitelist['Site ID'].to_numpy()
+        before = site_ids[np.sort(rng.choice(len(site_ids), size=int(len(site_ids) * share), replace=False))]
+        return pd.DataFrame({'before': before, 'after': before + 'R'})
+
+
+def write_workbook(sheets: dict[str, pd.DataFrame], path: str) -> str:
+    """Write sheets with the database styling of the app exports."""
+    with DatabaseWriter(path) as writer:
+        for sheet_name, df in sheets.items():
+            match sheet_name:
+                case 'Site List':
+                    writer.write_sitelist(df)
+                case 'Length':
+                    writer.write_length(df)
+                case 'New Ring' | 'Insert Ring' if 'Priority_1' in df.columns:
+                    writer.write_ring(df, sheet_name=sheet_name)
+                case _:
+                    writer.write_sheet(df, sheet_name=sheet_name)
+    return path
+
+
+def write_workbooks(output_dir: str, segments: int = 1000, seed: int = 0) -> dict[str, str]:
+    """
+    Write the workbooks of a `SyntheticNetwork` next to each other.
+
+    Returns:
+        dict[str, str]: Path of each file: 'database', 'work_order', 'drop_site',
+                        'ring_list', 'kml' and 'rename_map'.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    network = SyntheticNetwork(segments=segments, seed=seed)
+    logger.info("🧪 Synthetic network: %d rings, %d segments", len(network._rings), segments)
+    paths = {
+        'database': write_workbook(network.database(), os.path.join(output_dir, "Synthetic - Database.xlsx")),
+        'work_order': write_workbook(network.work_order(), os.path.join(output_dir, "Synthetic - Work Order.xlsx")),
+        'drop_site': write_workbook(network.drop_site(), os.path.join(output_dir, "Synthetic - Site Drop.xlsx")),
+        'ring_list': write_workbook(network.ring_list(), os.path.join(output_dir, "Synthetic - Dummy Database.xlsx")),
+        'rename_map': write_workbook({'Sheet1': network.rename_map()}, os.path.join(output_dir, "Synthetic - Rename Map.xlsx")),
+    }
+    paths['kml'] = os.path.join(output_dir, "Synthetic - Sites.kml")
+    with open(paths['kml'], 'w', encoding='utf-8') as file:
+        file.write(network.kml())
+    for name, path in paths.items():
+        logger.info("✅ %s written to %s", name, path)
+    return paths
+
+
+if __name__ == "__main__":
+    from modules.run_log import configure_logging
+
+    parser = argparse.ArgumentParser(prog='python -m modules.synthetic', description="Write synthetic workbooks shaped like the templates.")
+    parser.add_argument('--segments', type=int, default=1000, help="Ring segments of the database, e.g. 1000 to 500000.")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed.")
+    parser.add_argument('--output-dir', required=True, help="Directory of the generated files.")
+    args = parser.parse_args()
+    configure_logging()
+    write_workbooks(args.output_dir, segments=args.segments, seed=args.seed)
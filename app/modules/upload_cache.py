@@ -0,0 +1,86 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+from modules.snapshot_cache import SnapshotCache
+from modules.workbook import read_workbook
+
+logger = logging.getLogger(__name__)
+
+
+class UploadCache:
+    """
+    Parsed workbooks of uploaded files, reused across reruns of the Streamlit pages.
+
+    Entries are keyed by the upload itself (`file_id` and size of the `UploadedFile`),
+    so a rerun looks the workbook up without reading or hashing its bytes. A new upload
+    is hashed once (BLAKE2, see `SnapshotCache.key`) and served from its Parquet
+    snapshot when the same content was parsed before, by any session. At most
+    `max_entries` workbooks are kept in memory, least recently used first out, and
+    entries not read for `ttl` seconds expire.
+    """
+    def __init__(self, snapshots: SnapshotCache = None, max_entries: int = 8, ttl: float = None):
+        self.snapshots = snapshots
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(uploaded_file, engine: str = None, parse=None) -> tuple:
+        return (uploaded_file.file_id, uploaded_file.size, engine, tuple(parse) if parse else None)
+
+    def _lookup(self, key: tuple):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            used, workbook = entry
+            if self.ttl is not None and time.monotonic() - used > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries[key] = (time.monotonic(), workbook)
+            self._entries.move_to_end(key)
+            return workbook
+
+    def _store(self, key: tuple, workbook: dict):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), workbook)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def load(self, uploaded_file, engine: str = None, parse=None) -> dict:
+        """
+        Parsed and sanitized sheets of an uploaded workbook, see `read_workbook`.
+
+        Parameters:
+            uploaded_file (UploadedFile): Streamlit upload, or any object with `file_id`,
+                    `size` and `getvalue()`.
+            engine (str, optional): 'auto', 'calamine' or 'openpyxl'.
+            parse (optional): Names of the sheets to parse, the others stay `LazySheet`.
+
+        Returns:
+            dict[str, pd.DataFrame | LazySheet]: Sheets in workbook order. DataFrames are
+                copies, the pipelines may modify them without touching the cache.
+        """
+        key = self.key(uploaded_file, engine, parse)
+        workbook = self._lookup(key)
+        if workbook is None:
+            logger.info("📥 Parsing upload '%s' (%.1f MB)", uploaded_file.name, uploaded_file.size / 1024 ** 2)
+            workbook = read_workbook(uploaded_file.getvalue(), engine=engine, cache=self.snapshots, parse=parse)
+            self._store(key, workbook)
+        return {
+            sheet_name: df.copy() if isinstance(df, pd.DataFrame) else df
+            for sheet_name, df in workbook.items()
+        }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
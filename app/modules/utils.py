@@ -1,8 +1,12 @@
+import logging
+import numpy as np
 import pandas as pd
 import jellyfish as jf
 import os
 import re
 
+logger = logging.getLogger(__name__)
+
 def find_best_match(word, candidates, threshold=0.85):
     best_match = None
     best_score = 0
@@ -13,6 +17,30 @@ def find_best_match(word, candidates, threshold=0.85):
             best_match = candidate
     return best_match, best_score
 
+
+class ColumnResolver:
+    """
+    Memoized `find_best_match` for column schemas.
+
+    Scores are kept per (source schema, threshold) as a matrix of target column to
+    (best_match, score), so every column is fuzzy-matched against a schema only once
+    per run instead of once per row.
+    """
+    def __init__(self, threshold: float = 0.85):
+        self.threshold = threshold
+        self._matrix: dict[tuple, dict[str, tuple]] = {}
+
+    def match(self, word, candidates, threshold: float = None) -> tuple:
+        threshold = self.threshold if threshold is None else threshold
+        schema = self._matrix.setdefault((tuple(candidates), threshold), {})
+        if word not in schema:
+            schema[word] = find_best_match(word, candidates, threshold)
+        return schema[word]
+
+    def resolve(self, target_columns, source_columns, threshold: float = None) -> dict:
+        return {col: self.match(col, source_columns, threshold)[0] for col in target_columns}
+
+
 def sanitize_header(df, preview_row = 5):
     if df.columns[0].startswith('Unnamed'):
         for idx, row in df.head(preview_row).iterrows():
@@ -21,7 +49,7 @@ def sanitize_header(df, preview_row = 5):
             else:
                 df.columns = [str(col).strip() for col in row]
                 df = df.iloc[idx + 1:].reset_index(drop=True)
-                print(f"Header sanitized | Start from row {idx + 1} | Columns: {[col.strip() for col in df.columns[:3]]} ...")
+                logger.debug("Header sanitized | Start from row %s | Columns: %s ...", idx + 1, [col.strip() for col in df.columns[:3]])
                 break
     else:
         df.columns = [col.strip() for col in df.columns]
@@ -47,94 +75,143 @@ def sanitize_header(df, preview_row = 5):
                 new_columns.append(new_col_name)
             else:
                 new_columns.append(col)
-        print(f"‼️ Duplicate columns found")
+        logger.warning("‼️ Duplicate columns found")
         for col in duplicated_cols:
-            print(f"  - {col} | Total: {col_count[col]}")
+            logger.warning("  - %s | Total: %s", col, col_count[col])
         df.columns = new_columns
     else:
-        print("No duplicate columns found.")
+        logger.debug("No duplicate columns found.")
     return df
 
 
+def compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Typed columns for a sanitized sheet.
+
+    When the header was found below the first row, every column was read together with
+    the header text and kept as Python objects. Inferring the types again gives the
+    columns the same sheet would have with its header on top: numbers as float/int,
+    text as string, dates as datetime. Columns that really mix types (numeric and text
+    Site IDs) stay object.
+    """
+    objects = df.columns[(df.dtypes == object).to_numpy()]
+    if len(objects) == 0:
+        return df
+    inferred = df[objects].infer_objects()
+    converted = [col for col in objects if inferred[col].dtype != object]
+    if converted:
+        df = df.copy()
+        df[converted] = inferred[converted]
+        logger.debug("Column types inferred | %s", {col: str(df[col].dtype) for col in converted})
+    return df
+
+
+def normalize_token(series: pd.Series) -> pd.Series:
+    """
+    Lowercase, space free tokens of a status or priority column as a categorical.
+
+    Same tokens as `series.astype(str).str.lower().str.replace(' ', '')` ('New Site' ->
+    'newsite', blanks stay missing), but each distinct value is normalized once and the
+    comparisons run on the category codes.
+    """
+    codes, uniques = pd.factorize(series)
+    token_codes, categories = pd.factorize(pd.Index([str(value).lower().replace(' ', '') for value in uniques]))
+    codes = np.where(codes >= 0, token_codes[codes], -1) if len(token_codes) else codes
+    return pd.Series(pd.Categorical.from_codes(codes, categories=categories), index=series.index, name=series.name)
+
+
+def map_site_columns(site_rows: pd.DataFrame, site_info: pd.DataFrame, target_columns: list, date_today: str,
+                     site_column: str = 'Origin Site ID', info_key: str = 'Site ID IOH',
+                     source_columns: list = None, resolver: ColumnResolver = None) -> pd.DataFrame:
+    """
+    Build Site List rows for every segment in `site_rows` in one pass.
+
+    The `match col` rules are resolved once per target column and `site_info` is
+    joined on `info_key`, instead of assigning each cell with `.loc`.
+
+    Parameters:
+        site_rows (pd.DataFrame): Ring segments whose origin site becomes a Site List row.
+        site_info (pd.DataFrame): Site List of the work order, first row per site wins.
+        target_columns (list): Columns of the target Site List.
+        date_today (str): Value written to 'date_updated'.
+        source_columns (list, optional): Columns of the whole work order sheet searched by the
+                            fuzzy fallback, default the columns of `site_rows`.
+        resolver (ColumnResolver, optional): Shared resolver for the fuzzy column fallback.
+
+    Returns:
+        pd.DataFrame: Site List rows aligned with `site_rows`.
+    """
+    if site_rows.empty:
+        return pd.DataFrame(columns=target_columns)
+
+    resolver = resolver or ColumnResolver()
+    source_columns = site_rows.columns.tolist() if source_columns is None else list(source_columns)
+    info = (
+        site_info
+        .dropna(subset=[info_key])
+        .drop_duplicates(subset=info_key, keep='first')
+        .set_index(info_key, drop=False)
+        .reindex(site_rows[site_column].values)
+    )
+    info.index = site_rows.index
+    missing_info = info[info_key].isna()
+
+    def source_or(column, default):
+        return site_rows[column] if column in site_rows.columns else default
+
+    columns = {}
+    for col in target_columns:
+        match col:
+            case 'Site ID' | 'Site ID IOH':
+                columns[col] = site_rows[site_column]
+            case 'Site Name':
+                columns[col] = source_or('Origin_Name', None)
+            case 'Program Name':
+                columns[col] = source_or('Program', None)
+            case 'Program Ring':
+                columns[col] = source_or('Program Ring', None)
+            case 'Program Status':
+                columns[col] = source_or('Existing/New Site_1', 'New Site')
+            case 'insert/new ring':
+                columns[col] = source_or('Ring Status', "new ring")
+            case 'SoW' | 'Site Owner' | 'Initial Site ID' | 'Initial Site Name':
+                columns[col] = info[col].astype(object).mask(missing_info, None) if col in info.columns else None
+            case _:
+                if col in site_rows.columns:
+                    columns[col] = site_rows[col]
+                elif col in info.columns:
+                    columns[col] = info[col].astype(object).mask(missing_info, None)
+                else:
+                    best_match, score = resolver.match(col, source_columns)
+                    columns[col] = site_rows[best_match] if best_match in site_rows.columns else None
+
+    if missing_info.any():
+        logger.warning("❌ No sitelist info found for Site ID: %s", site_rows.loc[missing_info, site_column].tolist())
+
+    # Object columns like the cell by cell `.loc` assignments this replaces
+    container = pd.DataFrame(columns, index=site_rows.index).astype(object)
+    container['date_updated'] = date_today
+    return container
+
+
 def detect_week(date_str):
     try:
         date_obj = pd.to_datetime(date_str, format='%Y%m%d')
         week_number = date_obj.isocalendar()[1]
         return week_number
     except ValueError:
-        print(f"❌ Invalid date format: {date_str}")
+        logger.warning("❌ Invalid date format: %s", date_str)
         return None
 
 def detect_version(filepath: str | os.PathLike) -> str:
     filename = str(filepath).lower().split(os.sep)[-1]
-    print(f"Detecting version from filename: {filename}")
+    logger.debug("Detecting version from filename: %s", filename)
     search_version = re.search(r'v(?P<version>\d+)', filename)
     if search_version:
         version = search_version.group('version')
         new_version = f"v{int(version) + 1}"
-        print(f"Version detected: {version} | New version will be: {new_version}")
+        logger.debug("Version detected: %s | New version will be: %s", version, new_version)
         return new_version
     else:
-        print("No version detected in the filename.")
+        logger.info("No version detected in the filename.")
         return "v1"
-    
-def stylize_sitelist(sitelist_data: pd.DataFrame):
-    try:
-        # Set Style
-        stylized = (
-            sitelist_data
-            .style
-            .map_index(lambda _: "background-color: red; color: white; font-weight: bold;", axis=1)
-            .map(lambda v: 'border: 1px solid black')
-            .format(precision=8, thousands=',', decimal='.')
-        )
-
-        return stylized
-    except Exception as e:
-        print(f"❌ Error in stylizing sitelist data: {e}")
-        return sitelist_data.style
-    
-def stylize_length(length_data: pd.DataFrame) :
-    try:
-        # Set Style
-        stylized = (
-            length_data
-            .style
-            .format(precision=8, thousands=',', decimal='.')
-            .map_index(lambda _: "background-color: #FFC000; color: black; font-weight: bold;", axis=1)
-            .map(lambda v: 'border: 1px solid black')
-        )
-
-        return stylized
-    except Exception as e:
-        print(f"❌ Error in stylizing length data: {e}")
-        return length_data.style
-
-
-def stylize_ring(ring_data: pd.DataFrame) :
-    try:
-        origin_cols = ring_data.columns[ring_data.columns.get_loc('Origin Site ID'):ring_data.columns.get_loc('Destination')-1]
-        destination_cols = ring_data.columns[ring_data.columns.get_loc('Destination'):ring_data.columns.get_loc('Priority_2')+1]
-        p0_origin = ring_data.loc[:, "Priority_1"].astype(str) == 'P0'
-        p0_destination = ring_data.loc[:, "Priority_2"].astype(str) == 'P0'
-        
-        # Set Style
-        stylized = (
-            ring_data
-            .style
-            .map_index(lambda _: "background-color: red; color: white; font-weight: bold;", axis=1)
-            .map(lambda v: 'background-color: yellow' if str(v).lower() == 'insert site' else '')
-            .apply(lambda _: ['background-color: #add8e6' if p0_origin[i] else ''
-                              for i in range(len(ring_data))], axis=0, subset=origin_cols)
-            .apply(lambda _: ['background-color: #add8e6' if p0_destination[i] else ''
-                              for i in range(len(ring_data))], axis=0, subset=destination_cols)
-            .map(lambda v: 'border: 1px solid black')
-            .format(precision=8, thousands=',', decimal='.')
-            .set_table_attributes('style="width: 100%; border-collapse: collapse;"')
-        )
-
-        return stylized
-    except Exception as e:
-        print(f"❌ Error in stylizing ring data: {e}")
-        return ring_data.style
-
@@ -0,0 +1,162 @@
+import logging
+import os
+import importlib.util
+import pandas as pd
+from io import BytesIO
+from modules.utils import compact_dtypes, find_best_match, sanitize_header
+from modules.snapshot_cache import SnapshotCache
+
+logger = logging.getLogger(__name__)
+
+# Reader backend: 'auto' uses python-calamine when installed, openpyxl otherwise
+EXCEL_ENGINES = ('auto', 'calamine', 'openpyxl')
+CALAMINE_AVAILABLE = importlib.util.find_spec('python_calamine') is not None
+# Masterlist sheets read by every pipeline, the others are only copied to the exports
+MASTERLIST_SHEETS = ('Site List', 'Length', 'New Ring')
+
+
+def resolve_excel_engine(engine: str = None) -> str:
+    """Pick the pandas engine from the argument, the EXCEL_ENGINE environment variable, or 'auto'."""
+    engine = str(engine or os.environ.get('EXCEL_ENGINE') or 'auto').lower()
+    if engine not in EXCEL_ENGINES:
+        raise ValueError(f"Unknown Excel engine '{engine}'. Use one of {EXCEL_ENGINES}.")
+    if engine == 'auto':
+        return 'calamine' if CALAMINE_AVAILABLE else 'openpyxl'
+    if engine == 'calamine' and not CALAMINE_AVAILABLE:
+        logger.warning("⚠️ python-calamine is not installed, falling back to openpyxl.")
+        return 'openpyxl'
+    return engine
+
+
+def read_excel(source, engine: str = None, **kwargs):
+    if isinstance(source, (bytes, bytearray)):
+        source = BytesIO(source)
+    return pd.read_excel(source, engine=resolve_excel_engine(engine), **kwargs)
+
+
+def _read_bytes(source) -> bytes:
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if hasattr(source, 'read'):
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        return source.read()
+    with open(source, 'rb') as file:
+        return file.read()
+
+
+class LazySheet:
+    """
+    Sheet of a workbook that is not parsed until it is needed.
+
+    Unused masterlist sheets (Summary, history sheets, ...) are only copied into the
+    exports, so they are kept as the workbook content and a sheet name. `rows()` streams
+    the raw cell values for a verbatim copy without building a DataFrame, `load()` parses
+    and sanitizes the sheet when a pipeline does need its data. The content is shared by
+    every lazy sheet of the workbook and never modified, so `copy()` returns the sheet itself.
+    """
+    def __init__(self, content: bytes, sheet_name: str, engine: str = None):
+        self.content = content
+        self.sheet_name = sheet_name
+        self.engine = engine
+
+    def __repr__(self) -> str:
+        return f"LazySheet({self.sheet_name!r})"
+
+    def copy(self) -> 'LazySheet':
+        return self
+
+    def load(self) -> pd.DataFrame:
+        df = read_excel(self.content, engine=self.engine, sheet_name=self.sheet_name)
+        return compact_dtypes(sanitize_header(df))
+
+    def rows(self):
+        """Raw cell values row by row, empty cells as None, from the first row and column of the sheet."""
+        if resolve_excel_engine(self.engine) == 'calamine':
+            from python_calamine import CalamineWorkbook
+
+            sheet = CalamineWorkbook.from_filelike(BytesIO(self.content)).get_sheet_by_name(self.sheet_name)
+            for row in sheet.to_python(skip_empty_area=False):
+                yield [None if value == '' else value for value in row]
+        else:
+            from openpyxl import load_workbook
+
+            workbook = load_workbook(BytesIO(self.content), read_only=True, data_only=True)
+            try:
+                yield from (list(row) for row in workbook[self.sheet_name].iter_rows(values_only=True))
+            finally:
+                workbook.close()
+
+
+def sheet_frame(sheet: pd.DataFrame | LazySheet) -> pd.DataFrame:
+    """DataFrame of a sheet, parsing it when it is still lazy."""
+    return sheet.load() if isinstance(sheet, LazySheet) else sheet
+
+
+def _parsed_sheets(sheet_names: list, parse) -> list:
+    if parse is None:
+        return list(sheet_names)
+    parsed = []
+    for sheet in parse:
+        best_match, _ = find_best_match(sheet, sheet_names)
+        if best_match and best_match not in parsed:
+            parsed.append(best_match)
+    return parsed
+
+
+def read_workbook(source, engine: str = None, cache: SnapshotCache = None, parse=None) -> dict[str, pd.DataFrame | LazySheet]:
+    """
+    Parse the sheets of a workbook once, sanitize their header and infer their column types.
+
+    Parameters:
+        source: Path, file-like object, raw bytes, or an already loaded workbook
+                (dict of sheet name to DataFrame), which is returned as is.
+        engine (str, optional): 'auto', 'calamine' or 'openpyxl'.
+        cache (SnapshotCache, optional): Parquet snapshots of previously parsed workbooks,
+                looked up by content hash before parsing and filled after.
+        parse (optional): Names of the sheets to parse, matched like the loaders do with
+                `find_best_match`. The other sheets are returned as `LazySheet`. Default
+                parses every sheet.
+
+    Returns:
+        dict[str, pd.DataFrame | LazySheet]: Sheets in workbook order.
+    """
+    if isinstance(source, dict):
+        return source
+
+    content = _read_bytes(source)
+    if cache is not None:
+        key = cache.key(content)
+        workbook = cache.get(key)
+        if workbook is not None:
+            logger.info("♻️ Workbook loaded from snapshot %s", key[:12])
+            workbook = {
+                sheet_name: LazySheet(content, sheet_name, engine=engine) if df is None else df
+                for sheet_name, df in workbook.items()
+            }
+            for sheet_name in _parsed_sheets(list(workbook), parse):
+                workbook[sheet_name] = sheet_frame(workbook[sheet_name])
+            return workbook
+
+    with pd.ExcelFile(BytesIO(content), engine=resolve_excel_engine(engine)) as excel_file:
+        sheet_names = excel_file.sheet_names
+        parsed = _parsed_sheets(sheet_names, parse)
+        sheets = excel_file.parse(sheet_name=parsed) if parsed else {}
+    workbook = {}
+    for sheet_name in sheet_names:
+        if sheet_name not in sheets:
+            workbook[sheet_name] = LazySheet(content, sheet_name, engine=engine)
+            continue
+        df = sheets[sheet_name]
+        try:
+            workbook[sheet_name] = compact_dtypes(sanitize_header(df))
+        except Exception as e:
+            logger.warning("⚠️ Sheet '%s' kept as is, header not sanitized: %s", sheet_name, e)
+            workbook[sheet_name] = df
+    if len(parsed) < len(sheet_names):
+        logger.info("💤 %d sheet(s) left unparsed: %s", len(sheet_names) - len(parsed),
+                    [sheet for sheet in sheet_names if sheet not in parsed])
+
+    if cache is not None:
+        cache.put(key, workbook)
+    return workbook
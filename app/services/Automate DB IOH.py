@@ -2,7 +2,6 @@ import streamlit as st
 import pandas as pd
 import time
 import os
-from io import BytesIO
 from datetime import date
 from modules.db_update import (
     automate_db_update,
@@ -15,33 +14,57 @@ from modules.dummy_database import (
 )
 from modules.utils import (
     find_best_match,
-    sanitize_header,
+    ColumnResolver,
     detect_version,
     detect_week,
 )
+from modules.workbook import MASTERLIST_SHEETS, LazySheet
+from modules.snapshot_cache import SnapshotCache
+from modules.upload_cache import UploadCache
+from modules.jobs import Job, JobQueue
+from modules.run_metrics import RunMetrics
+from modules.segment_index import suggest_insert_segments
 
 # SECRETS
 FILES_LOC = st.secrets["files_loc"]
+# Unset falls back to the EXCEL_ENGINE environment variable, then to "auto"
+EXCEL_ENGINE = st.secrets.get("excel_engine")
+SNAPSHOT_CACHE_MB = st.secrets.get("snapshot_cache_mb", 512)
+DUMMY_MAX_WORKERS = int(st.secrets.get("dummy_max_workers", 1))
+JOB_WORKERS = int(st.secrets.get("job_workers", 2))
+# Opt-in with `trace_memory = true`, tracemalloc slows the pipelines down several times
+TRACE_MEMORY = bool(st.secrets.get("trace_memory", False))
+UPLOAD_CACHE_ENTRIES = int(st.secrets.get("upload_cache_entries", 8))
+CACHE_TTL_HOURS = st.secrets.get("cache_ttl_hours", 24)
 
 # ----------  CACHED HELPERS  ---------- #
-@st.cache_data(persist='disk', show_spinner=False)
-def load_excel_bytes(content: bytes) -> dict[str, pd.DataFrame]:
-    return pd.read_excel(BytesIO(content), sheet_name=None)
+def load_masterlist(uploaded_file) -> dict[str, pd.DataFrame]:
+    # Sheets other than Site List / Length / New Ring stay unparsed, they are only copied to the exports.
+    return get_upload_cache().load(uploaded_file, engine=EXCEL_ENGINE, parse=MASTERLIST_SHEETS)
 
 
-@st.cache_data(persist='disk', show_spinner=False)
-def load_db_update(db_bytes: bytes, wo_bytes: bytes):
-    return load_dataframes(BytesIO(db_bytes), BytesIO(wo_bytes))
+def load_workbook(uploaded_file) -> dict[str, pd.DataFrame]:
+    # Parsed and sanitized once, shared by the preview and the pipelines
+    return get_upload_cache().load(uploaded_file, engine=EXCEL_ENGINE)
 
 
-@st.cache_data(persist='disk', show_spinner=False)
-def load_dropsite(db_bytes: bytes, ds_bytes: bytes):
-    return load_dropsite_data(BytesIO(db_bytes), BytesIO(ds_bytes))
+@st.cache_resource(show_spinner=False)
+def get_upload_cache() -> UploadCache:
+    # Keyed by the upload, reruns skip hashing the bytes; Parquet snapshots are shared across sessions
+    ttl = float(CACHE_TTL_HOURS) * 3600 if CACHE_TTL_HOURS else None
+    snapshots = SnapshotCache(os.path.join(FILES_LOC, "cache"), max_bytes=int(SNAPSHOT_CACHE_MB) * 1024 ** 2, ttl=ttl)
+    return UploadCache(snapshots, max_entries=UPLOAD_CACHE_ENTRIES, ttl=ttl)
 
 
-@st.cache_data(persist='disk', show_spinner=False)
-def load_dummy(db_bytes: bytes, ring_bytes: bytes):
-    return load_dummy_data(BytesIO(db_bytes), BytesIO(ring_bytes))
+@st.cache_resource(show_spinner=False)
+def get_column_resolver() -> ColumnResolver:
+    return ColumnResolver()
+
+
+@st.cache_resource(show_spinner=False)
+def get_job_queue() -> JobQueue:
+    # One registry for the whole server, jobs and results survive reruns and sessions
+    return JobQueue(max_workers=JOB_WORKERS)
 
 
 # --------------  END OF CACHED HELPERS  ---------- #
@@ -60,6 +83,123 @@ def reset_app():
     st.rerun()
 
 
+# Job functions run on the job queue threads, no Streamlit calls in there.
+# Each returns the export path with the stage metrics of the run.
+def run_db_update(job: Job, db_df, work_order_df, export_filename, export_dir, version) -> dict:
+    metrics = RunMetrics("DB Update", trace_memory=TRACE_MEMORY)
+    try:
+        job.report("Loading data")
+        with metrics.stage("Load"):
+            initial_data = load_dataframes(db_df, work_order_df)
+        file_location = automate_db_update(
+            initial_data,
+            new_database=export_filename,
+            export_dir=export_dir,
+            version=version,
+            resolver=get_column_resolver(),
+            progress=job.report,
+            metrics=metrics,
+        )
+    finally:
+        metrics.finish()
+    return {'file_location': file_location, 'metrics': metrics}
+
+
+def run_dropsite(job: Job, db_df, ds_df, dropsite_filename, export_dir) -> dict:
+    metrics = RunMetrics("Drop Site", trace_memory=TRACE_MEMORY)
+    try:
+        job.report("Loading data")
+        with metrics.stage("Load"):
+            initial_data = load_dropsite_data(db_df, ds_df)
+        file_location = dropsite_processing(
+            initial_data,
+            dropsite_filename=dropsite_filename,
+            export_dir=export_dir,
+            resolver=get_column_resolver(),
+            progress=job.report,
+            metrics=metrics,
+        )
+    finally:
+        metrics.finish()
+    return {'file_location': file_location, 'metrics': metrics}
+
+
+def run_dummy_database(job: Job, db_df, ring_file_df, dummy_filename, export_dir) -> dict:
+    metrics = RunMetrics("Dummy Database", trace_memory=TRACE_MEMORY)
+    try:
+        job.report("Loading data")
+        with metrics.stage("Load"):
+            initial_data = load_dummy_data(db_df, ring_file_df)
+        dummy_database = process_dummy_database(
+            initial_data,
+            dummy_filename=dummy_filename,
+            export_dir=export_dir,
+            resolver=get_column_resolver(),
+            max_workers=DUMMY_MAX_WORKERS,
+            progress=job.report,
+            metrics=metrics,
+        )
+    finally:
+        metrics.finish()
+    # Only keep the export path, run report and metrics in the job registry, not the frames
+    return {
+        'file_location': dummy_database['file_location'],
+        'run_report': dummy_database['run_report'],
+        'metrics': metrics,
+    }
+
+
+def submit_job(state_key: str, name: str, fn, *args):
+    job = get_job_queue().submit(name, fn, *args)
+    st.session_state[state_key] = job.id
+    st.info(f"Job {job.id} queued, the result will show up below once it is done.")
+
+
+def render_progress(job: Job):
+    progress = job.progress
+    text = f"Job {job.id} · {job.name} · {job.stage}"
+    if job.total:
+        text += f" ({job.done:,}/{job.total:,})"
+    st.progress(progress if progress is not None else 0.0, text=text)
+
+
+@st.fragment(run_every=2)
+def job_progress(job_id: str):
+    job = get_job_queue().get(job_id)
+    if job is None or job.is_finished:
+        # Full rerun so the result section picks up the finished job
+        st.rerun()
+    render_progress(job)
+
+
+def show_run_metrics(metrics: RunMetrics):
+    peak = f" | peak {metrics.peak_mb:,.1f} MB" if metrics.peak_mb is not None else ""
+    with st.expander(f"**Run metrics** | {metrics.total_seconds:,.1f} s{peak}"):
+        st.dataframe(
+            metrics.to_frame(),
+            hide_index=True,
+            column_config={
+                "Seconds": st.column_config.NumberColumn(format="%.2f"),
+                "Peak MB": st.column_config.NumberColumn(format="%.1f"),
+                "Share": st.column_config.ProgressColumn(min_value=0, max_value=1),
+            },
+        )
+
+
+def job_result(state_key: str) -> dict | None:
+    """Result of the job stored under `state_key`, polls its progress while it runs."""
+    job = get_job_queue().get(st.session_state.get(state_key))
+    if job is None:
+        return None
+    if not job.is_finished:
+        job_progress(job.id)
+        return None
+    if job.status == 'failed':
+        st.error(f"Error during automation: {job.error}")
+        return None
+    return job.result
+
+
 # ---------------------------------------- #
 # ------------- START OF APP ------------- #
 # ---------------------------------------- #
@@ -119,8 +259,7 @@ with db_update:
 
             if db_exist:
                 try:
-                    db_content = db_exist.getvalue()
-                    db_df = load_excel_bytes(db_content)
+                    db_df = load_masterlist(db_exist)
                     st.session_state["df_db_update"] = db_df
                     st.success(
                         f"✅ Database file '{os.path.basename(db_exist.name)}' loaded successfully."
@@ -130,8 +269,7 @@ with db_update:
                     st.write("#### **Existing Database Preview**")
                     for sheet_name, df in db_df.items():
                         bestmatch, score = find_best_match(sheet_name, used_sheets)
-                        if bestmatch:
-                            df = sanitize_header(df)
+                        if bestmatch and not isinstance(df, LazySheet):
                             with st.expander(f"**{sheet_name}**"):
                                 st.dataframe(df.head())
                 except Exception as e:
@@ -165,8 +303,7 @@ with db_update:
             )
             if work_order:
                 try:
-                    work_order_content = work_order.getvalue()
-                    work_order_df = load_excel_bytes(work_order_content)
+                    work_order_df = load_workbook(work_order)
                     st.session_state["work_order_df"] = work_order_df
                     st.success(
                         f"✅ Work order file '{os.path.basename(work_order.name)}' loaded successfully."
@@ -177,7 +314,6 @@ with db_update:
                     for sheet_name, df in work_order_df.items():
                         bestmatch, score = find_best_match(sheet_name, used_sheets)
                         if bestmatch:
-                            df = sanitize_header(df)
                             with st.expander(f"**{sheet_name}**"):
                                 st.dataframe(df.head())
                 except Exception as e:
@@ -201,39 +337,30 @@ with db_update:
                 st.error("Please upload an existing database file.")
             elif not work_order:
                 st.error("Please upload a work order file.")
-            if db_content and work_order_content:
+            if db_exist and work_order:
                 try:
-                    with st.spinner("Updating database..."):
-                        # Call the automation function
-                        initial_data = load_db_update(
-                            db_bytes=db_content, wo_bytes=work_order_content
-                        )
-                        version = detect_version(db_filename)
-                        export_dir = f"{FILES_LOC}/exports/DB_Automation/Database_Update/{date.today().strftime('%Y-%m-%d')}"
-
-                        if not os.path.exists(export_dir):
-                            os.makedirs(export_dir)
-
-                        # Filename
-                        date_today = date.today().strftime("%Y%m%d")
-                        week = detect_week(date_today)
-                        export_filename = (
-                            f"DB Update-{date_today}-Week {week}-TBG-{version}.xlsx"
-                        )
-
-                        new_database = automate_db_update(
-                            initial_data,
-                            new_database=export_filename,
-                            export_dir=export_dir,
-                            version=version,
-                        )
-                        st.session_state["new_database"] = new_database
-                    st.success("Database update completed successfully!")
+                    # Call the automation function on the job queue
+                    version = detect_version(db_filename)
+                    export_dir = f"{FILES_LOC}/exports/DB_Automation/Database_Update/{date.today().strftime('%Y-%m-%d')}"
+
+                    if not os.path.exists(export_dir):
+                        os.makedirs(export_dir)
+
+                    # Filename
+                    date_today = date.today().strftime("%Y%m%d")
+                    week = detect_week(date_today)
+                    export_filename = (
+                        f"DB Update-{date_today}-Week {week}-TBG-{version}.xlsx"
+                    )
+                    submit_job(
+                        "new_database", "DB Update", run_db_update,
+                        db_df, work_order_df, export_filename, export_dir, version,
+                    )
                 except Exception as e:
                     st.error(f"Error during automation: {e}")
 
     # Download Result
-    new_database = st.session_state.get("new_database")
+    new_database = job_result("new_database")
     if new_database:
         st.markdown("---")
         st.markdown("#### **Download Updated Database**")
@@ -241,18 +368,19 @@ with db_update:
             """The updated database is ready for download.  
             Click the button below to download the new database file."""
         )
-        st.write(f"New Database Available: {new_database}")
-        with open(new_database, "rb") as file:
+        st.write(f"New Database Available: {new_database['file_location']}")
+        with open(new_database['file_location'], "rb") as file:
             st.download_button(
                 type="primary",
                 key="update_download",
                 label="Download Result",
                 data=file,
-                file_name=os.path.basename(new_database),
+                file_name=os.path.basename(new_database['file_location']),
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                 icon=":material/download:",
                 help="Click to download the updated database file.",
             )
+        show_run_metrics(new_database['metrics'])
 
 # Drop Site Tab
 with drop_site:
@@ -288,8 +416,7 @@ with drop_site:
 
             if db_masterlist:
                 try:
-                    db_content = db_masterlist.getvalue()
-                    db_df = load_excel_bytes(db_content)
+                    db_df = load_masterlist(db_masterlist)
                     st.session_state["df_db_ds"] = db_df
                     st.success(
                         f"✅ Database file '{os.path.basename(db_masterlist.name)}' loaded successfully."
@@ -299,8 +426,7 @@ with drop_site:
                     st.write("#### **Database Preview**")
                     for sheet_name, df in db_df.items():
                         bestmatch, score = find_best_match(sheet_name, used_sheets)
-                        if bestmatch:
-                            df = sanitize_header(df)
+                        if bestmatch and not isinstance(df, LazySheet):
                             with st.expander(f"**{sheet_name}**"):
                                 st.dataframe(df.head())
                 except Exception as e:
@@ -331,8 +457,7 @@ with drop_site:
             ds_file = st.file_uploader("Upload Drop Site File", type=["xlsx"], key="ds_wo")
             if ds_file:
                 try:
-                    ds_df_content = ds_file.getvalue()
-                    ds_df = load_excel_bytes(ds_df_content)
+                    ds_df = load_workbook(ds_file)
                     st.session_state["df_ds"] = ds_df
                     st.success(
                         f"✅ Drop site file '{os.path.basename(ds_file.name)}' loaded successfully."
@@ -343,7 +468,6 @@ with drop_site:
                     for sheet_name, df in ds_df.items():
                         bestmatch, score = find_best_match(sheet_name, used_sheets)
                         if bestmatch:
-                            df = sanitize_header(df)
                             with st.expander(f"**{sheet_name}**"):
                                 st.dataframe(df.head())
                 except Exception as e:
@@ -367,38 +491,30 @@ with drop_site:
                 st.error("Please upload an existing database file.")
             elif not ds_file:
                 st.error("Please upload a drop site file.")
-            if db_content and ds_df_content:
+            if db_masterlist and ds_file:
                 try:
-                    with st.spinner("Processing drop site..."):
-                        # Call the automation function
-                        initial_data = load_dropsite(
-                            db_bytes=db_content, ds_bytes=ds_df_content
-                        )
-                        export_dir = f"{FILES_LOC}/exports/DB_Automation/Drop_Site/{date.today().strftime('%Y-%m-%d')}"
-
-                        if not os.path.exists(export_dir):
-                            os.makedirs(export_dir)
-
-                        # Filename
-                        date_today = date.today().strftime("%Y%m%d")
-                        week = detect_week(date_today)
-                        version = detect_version(db_filename)
-                        ds_file_filename = (
-                            f"DB Dropped Site-{date_today}-Week {week}-TBG-{version}.xlsx"
-                        )
-
-                        dropped_site_database = dropsite_processing(
-                            initial_data,
-                            dropsite_filename=ds_file_filename,
-                            export_dir=export_dir,
-                        )
-                        st.session_state["dropped_site_database"] = dropped_site_database
-                    st.success("Database update completed successfully!")
+                    # Call the automation function on the job queue
+                    export_dir = f"{FILES_LOC}/exports/DB_Automation/Drop_Site/{date.today().strftime('%Y-%m-%d')}"
+
+                    if not os.path.exists(export_dir):
+                        os.makedirs(export_dir)
+
+                    # Filename
+                    date_today = date.today().strftime("%Y%m%d")
+                    week = detect_week(date_today)
+                    version = detect_version(db_filename)
+                    ds_file_filename = (
+                        f"DB Dropped Site-{date_today}-Week {week}-TBG-{version}.xlsx"
+                    )
+                    submit_job(
+                        "dropped_site_database", "Drop Site", run_dropsite,
+                        db_df, ds_df, ds_file_filename, export_dir,
+                    )
                 except Exception as e:
                     st.error(f"Error during automation: {e}")
 
     # Download Result
-    dropped_site_database = st.session_state.get("dropped_site_database")
+    dropped_site_database = job_result("dropped_site_database")
     if dropped_site_database:
         st.markdown("---")
         st.markdown("#### **Download Updated Database**")
@@ -408,18 +524,19 @@ with drop_site:
             Click the button below to download the new database file.
             """
         )
-        st.write(f"New Database Available: {dropped_site_database}")
-        with open(dropped_site_database, "rb") as file:
+        st.write(f"New Database Available: {dropped_site_database['file_location']}")
+        with open(dropped_site_database['file_location'], "rb") as file:
             st.download_button(
                 type="primary",
                 key="ds_download",
                 label="Download Result",
                 data=file,
-                file_name=os.path.basename(dropped_site_database),
+                file_name=os.path.basename(dropped_site_database['file_location']),
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                 icon=":material/download:",
                 help="Click to download the updated database file.",
             )
+        show_run_metrics(dropped_site_database['metrics'])
 
 # Dummy Database Tab
 with dummy_db:
@@ -454,8 +571,7 @@ with dummy_db:
 
             if db_masterlist:
                 try:
-                    db_content = db_masterlist.getvalue()
-                    db_df = load_excel_bytes(db_content)
+                    db_df = load_masterlist(db_masterlist)
                     st.session_state["df_db_dummy"] = db_df
                     st.success(
                         f"✅ Database file '{os.path.basename(db_masterlist.name)}' loaded successfully."
@@ -465,8 +581,7 @@ with dummy_db:
                     st.write("#### **Database Preview**")
                     for sheet_name, df in db_df.items():
                         bestmatch, score = find_best_match(sheet_name, used_sheets)
-                        if bestmatch:
-                            df = sanitize_header(df)
+                        if bestmatch and not isinstance(df, LazySheet):
                             with st.expander(f"**{sheet_name}**"):
                                 st.dataframe(df.head())
                 except Exception as e:
@@ -498,8 +613,7 @@ with dummy_db:
             )
             if ring_file:
                 try:
-                    ring_file_content = ring_file.getvalue()
-                    ring_file_df = load_excel_bytes(ring_file_content)
+                    ring_file_df = load_workbook(ring_file)
                     st.session_state["df_ring"] = ring_file_df
                     st.success(
                         f"✅ Ring data file '{os.path.basename(ring_file.name)}' loaded successfully."
@@ -510,7 +624,6 @@ with dummy_db:
                     for sheet_name, df in ring_file_df.items():
                         bestmatch, score = find_best_match(sheet_name, used_sheets)
                         if bestmatch:
-                            df = sanitize_header(df)
                             with st.expander(f"**{sheet_name}**"):
                                 st.dataframe(df.head())
                 except Exception as e:
@@ -536,36 +649,74 @@ with dummy_db:
                 st.error("Please upload a ring data file.")
             if db_masterlist and ring_file:
                 try:
-                    with st.spinner("Hold on, generating dummy database..."):
-                        # Call the automation function
-                        initial_data = load_dummy(
-                            db_bytes=db_content, ring_bytes=ring_file_content
-                        )
-                        export_dir = f"{FILES_LOC}/exports/DB_Automation/Dummy_Database/{date.today().strftime('%Y-%m-%d')}"
-
-                        if not os.path.exists(export_dir):
-                            os.makedirs(export_dir)
-
-                        # Filename
-                        date_today = date.today().strftime("%Y%m%d")
-                        week = detect_week(date_today)
-                        version = detect_version(db_filename)
-                        ring_file_filename = (
-                            f"Dummy Database-{date_today}-Week {week}-TBG-{version}.xlsx"
-                        )
-
-                        dummy_database = process_dummy_database(
-                            initial_data,
-                            dummy_filename=ring_file_filename,
-                            export_dir=export_dir,
-                        )
-                        st.session_state["dummy_database"] = dummy_database
-                    st.success("Database update completed successfully!")
+                    # Call the automation function on the job queue
+                    export_dir = f"{FILES_LOC}/exports/DB_Automation/Dummy_Database/{date.today().strftime('%Y-%m-%d')}"
+
+                    if not os.path.exists(export_dir):
+                        os.makedirs(export_dir)
+
+                    # Filename
+                    date_today = date.today().strftime("%Y%m%d")
+                    week = detect_week(date_today)
+                    version = detect_version(db_filename)
+                    ring_file_filename = (
+                        f"Dummy Database-{date_today}-Week {week}-TBG-{version}.xlsx"
+                    )
+                    submit_job(
+                        "dummy_database", "Dummy Database", run_dummy_database,
+                        db_df, ring_file_df, ring_file_filename, export_dir,
+                    )
                 except Exception as e:
                     st.error(f"Error during automation: {e}")
 
+    # Near End / Far End Suggestions
+    if st.session_state.get("df_db_dummy") and st.session_state.get("df_ring"):
+        st.markdown("---")
+        st.markdown("#### **Near End / Far End Suggestions**")
+        st.write(
+            """
+            Nearest existing segments of every site in the Insert Ring sheet,  
+            with the fibre length the insertion would add.
+            """
+        )
+        col_count, col_suggest = st.columns([1, 3], vertical_alignment="bottom")
+        suggestion_count = col_count.number_input(
+            "Segments per site", min_value=1, max_value=10, value=3, key="suggestion_count"
+        )
+        if col_suggest.button(
+            "Suggest Near / Far End",
+            type="secondary",
+            key="suggest_segments",
+            help="Click to find the nearest existing ring segments of the insert sites.",
+            icon=":material/near_me:",
+        ):
+            try:
+                st.session_state["insert_suggestions"] = suggest_insert_segments(
+                    st.session_state["df_db_dummy"],
+                    st.session_state["df_ring"],
+                    k=int(suggestion_count),
+                    resolver=get_column_resolver(),
+                )
+            except Exception as e:
+                st.error(f"Error suggesting segments: {e}")
+
+        suggestions = st.session_state.get("insert_suggestions")
+        if suggestions is not None:
+            with st.expander(f"**Suggestions** | {suggestions['Site ID'].nunique()} site(s)", expanded=True):
+                st.dataframe(suggestions, hide_index=True)
+                st.download_button(
+                    type="secondary",
+                    key="suggestions_download",
+                    label="Download Suggestions",
+                    data=suggestions.to_csv(index=False),
+                    file_name="Near End Far End Suggestions.csv",
+                    mime="text/csv",
+                    icon=":material/download:",
+                    help="Click to download the suggested segments of the insert sites.",
+                )
+
     # Download Result
-    dummy_database = st.session_state.get("dummy_database")
+    dummy_database = job_result("dummy_database")
     if dummy_database:
         st.markdown("---")
         st.markdown("#### **Download Updated Database**")
@@ -587,5 +738,70 @@ with dummy_db:
                 icon=":material/download:",
                 help="Click to download the updated database file.",
             )
+        show_run_metrics(dummy_database['metrics'])
+
+        # Run Report
+        run_report = dummy_database['run_report']
+        counts = run_report.counts()
+        with st.expander(f"**Run Report** | {counts['errors']} error(s), {counts['warnings']} warning(s)"):
+            st.dataframe(run_report.to_frame(), hide_index=True)
+            st.download_button(
+                type="secondary",
+                key="dummy_report_download",
+                label="Download Run Report",
+                data=run_report.to_csv(),
+                file_name=f"{os.path.splitext(os.path.basename(dummy_database['file_location']))[0]} - Run Report.csv",
+                mime="text/csv",
+                icon=":material/download:",
+                help="Click to download the skipped rings and sites of this run.",
+            )
+
+# --- END OF TABS ---
+
+# Job Queue, shared by every session of the server
+active_jobs = any(not job.is_finished for job in get_job_queue().jobs())
+
+
+@st.fragment(run_every=2 if active_jobs else None)
+def job_queue_panel():
+    jobs = get_job_queue().jobs()
+    if active_jobs and all(job.is_finished for job in jobs):
+        # Stop polling once the queue is idle
+        st.rerun()
+    if not jobs:
+        st.caption("No job submitted yet.")
+        return
+
+    st.dataframe(
+        pd.DataFrame([job.summary() for job in jobs]),
+        hide_index=True,
+        column_config={"Progress": st.column_config.ProgressColumn(min_value=0, max_value=1)},
+    )
+    finished = {
+        job.id: job for job in jobs
+        if job.status == "done" and os.path.exists(job.result['file_location'])
+    }
+    if finished:
+        job_id = st.selectbox(
+            "Finished Jobs",
+            list(finished),
+            format_func=lambda job_id: f"{job_id} · {finished[job_id].name} · {os.path.basename(finished[job_id].result['file_location'])}",
+            key="job_queue_choice",
+        )
+        job_file = finished[job_id].result['file_location']
+        with open(job_file, "rb") as file:
+            st.download_button(
+                type="secondary",
+                key="job_queue_download",
+                label="Download Job Result",
+                data=file,
+                file_name=os.path.basename(job_file),
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                icon=":material/download:",
+                help="Click to download the result of the selected job.",
+            )
+
 
-# --- END OF TABS ---
\ No newline at end of file
+st.markdown("---")
+with st.expander(f"**Job Queue** ({JOB_WORKERS} worker(s))"):
+    job_queue_panel()
\ No newline at end of file
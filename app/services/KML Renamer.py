@@ -3,25 +3,20 @@ from datetime import date
 import streamlit as st
 import pandas as pd
 import time
-from io import BytesIO
 from modules.utils import sanitize_header
-from modules.rename_att_kml import rename_kml_field
+from modules.rename_att_kml import rename_kml_field, rename_kml_stream
+from modules.workbook import read_excel
 
 
 # SECRETS
 FILES_LOC = st.secrets["files_loc"]
+# Unset falls back to the EXCEL_ENGINE environment variable, then to "auto"
+EXCEL_ENGINE = st.secrets.get("excel_engine")
 
 # ----------  CACHED HELPERS  ---------- #
 @st.cache_data(persist='disk', show_spinner=False)
-def load_kml_bytes(content: bytes) -> str:
-    if isinstance(content, bytes):
-        return content.decode('utf-8')
-    else:
-        raise ValueError("Content must be in bytes format.")
-
-@st.cache_data(persist='disk', show_spinner=False)
-def load_excel_bytes(content: bytes) -> dict[str, pd.DataFrame]:
-    return pd.read_excel(BytesIO(content), sheet_name=None, engine='openpyxl')
+def load_excel_bytes(content: bytes, engine: str = "auto") -> dict[str, pd.DataFrame]:
+    return read_excel(content, engine=engine, sheet_name=None)
 
 
 # --------------  END OF CACHED HELPERS  ---------- #
@@ -78,9 +73,9 @@ with st.form(key="kml_renamer_form", clear_on_submit=True, border=False):
         )
         if kml_file:
             try:
-                kml_content = kml_file.getvalue()
-                kml_content = load_kml_bytes(kml_content)
-                st.session_state["kml_content"] = kml_content
+                # The upload is read when processing, streamed as is or decoded for line mode
+                if not kml_file.size:
+                    raise ValueError("KML file is empty.")
                 kml_filename = os.path.basename(kml_file.name)
                 st.success(
                     f"✅ Database file '{kml_filename}' loaded successfully."
@@ -103,6 +98,17 @@ with st.form(key="kml_renamer_form", clear_on_submit=True, border=False):
             if not checked_field:
                 st.warning("Please enter a field name to rename in the KML file.")
 
+            rename_mode = st.radio(
+                "Rename Mode",
+                options=["line", "stream"],
+                format_func=lambda mode: {
+                    "line": "Line (every line containing 'name')",
+                    "stream": "Streaming XML (only the field to rename)",
+                }[mode],
+                key="rename_mode",
+                help="Streaming XML mode parses Placemarks one by one and also works on minified KML.",
+            )
+
     with col_mapping:
         with st.container(height=150, border=False):
             st.subheader("Attribute Mapping")
@@ -122,7 +128,7 @@ with st.form(key="kml_renamer_form", clear_on_submit=True, border=False):
         if map_file:
             try:
                 mapfile_content = map_file.getvalue()
-                mapfile_df = load_excel_bytes(mapfile_content)
+                mapfile_df = load_excel_bytes(mapfile_content, EXCEL_ENGINE)
                 mapfile_filename = os.path.basename(map_file.name)
                 st.session_state["mapfile_df"] = mapfile_df
                 st.success(
@@ -154,10 +160,7 @@ with st.form(key="kml_renamer_form", clear_on_submit=True, border=False):
         if kml_file and map_file:
             try:
                 mapfile_df = st.session_state["mapfile_df"]
-                kml_content = st.session_state["kml_content"]
 
-                if not kml_content:
-                    st.error("KML content is empty or not loaded.")
                 if not mapfile_df:
                     st.error("Mapping file is empty or not loaded.")
 
@@ -166,12 +169,33 @@ with st.form(key="kml_renamer_form", clear_on_submit=True, border=False):
                     os.makedirs(export_dir)
 
                 path = os.path.join(export_dir, kml_filename.replace(".kml", "_revised.kml"))
-                revised_kml = rename_kml_field(
-                    kml_content=kml_content,
-                    attribute_df=mapfile_df[list(mapfile_df.keys())[0]],
-                    checked_field=checked_field,
-                    export_path=path,
-                )
+                progress_bar = st.progress(0.0, text="Renaming KML...")
+
+                def show_progress(stage, done, total):
+                    fraction = min(done / total, 1.0) if total else 0.0
+                    counter = f"{done:,}/{total:,}" if total else f"{done:,}"
+                    progress_bar.progress(fraction, text=f"{stage} ({counter})")
+
+                attribute_df = mapfile_df[list(mapfile_df.keys())[0]]
+                if rename_mode == "stream":
+                    # Parsed straight from the upload, the KML is never held as text
+                    kml_file.seek(0)
+                    revised_kml = rename_kml_stream(
+                        kml_file,
+                        attribute_df=attribute_df,
+                        checked_field=checked_field,
+                        export_path=path,
+                        progress=show_progress,
+                    )
+                else:
+                    revised_kml = rename_kml_field(
+                        kml_content=kml_file.getvalue().decode("utf-8"),
+                        attribute_df=attribute_df,
+                        checked_field=checked_field,
+                        export_path=path,
+                        mode=rename_mode,
+                        progress=show_progress,
+                    )
                 st.session_state["kml_renamed"] = revised_kml
                 st.success(
                     f"✅ KML file processed successfully. Renamed file saved as: {os.path.basename(path)}"
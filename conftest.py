@@ -0,0 +1,54 @@
+"""
+Shared setup of the test scripts: the app folder on the import path and sample masterlist data.
+"""
+
+import datetime as dt
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "app"))
+
+from modules.synthetic import SyntheticNetwork
+
+
+def ring_segments() -> pd.DataFrame:
+    """New Ring segments, RING_001: HUB_A → S1 → S2 → S3 → HUB_B, RING_002: HUB_B → S4 → HUB_C."""
+    return pd.DataFrame({
+        'Ring ID_1': ['RING_001'] * 4 + ['RING_002'] * 2,
+        'Origin Site ID': ['HUB_A', 'S1', 'S2', 'S3', 'HUB_B', 'S4'],
+        'Priority_1': ['P0', 'Access', 'Access', 'Access', 'P0', 'Access'],
+        'Destination': ['S1', 'S2', 'S3', 'HUB_B', 'S4', 'HUB_C'],
+        'Priority_2': ['Access', 'Access', 'Access', 'P0', 'Access', 'P0'],
+        'Link Name': ['HUB_A-S1', 'S1-S2', 'S2-S3', 'S3-HUB_B', 'HUB_B-S4', 'S4-HUB_C'],
+        'Total Distance (m)': [100.0, 200.0, np.nan, 400.0, 50.0, 60.0],
+        'Vendor': ['ZTE', 'Huawei', 'ZTE', 'ZTE', np.nan, 'Huawei'],
+        'Program': ['H2B1'] * 4 + ['MOCN'] * 2,
+    })
+
+
+@pytest.fixture
+def rings() -> pd.DataFrame:
+    return ring_segments()
+
+
+@pytest.fixture
+def masterlist() -> dict[str, pd.DataFrame]:
+    """Parsed masterlist sheets, the Site List mixes numeric and text values like real uploads."""
+    site_list = pd.DataFrame({
+        'Site ID': pd.Series([12345, 'JAW-001', np.nan, 'JAW-002'], dtype=object),
+        'Distance': [1.5, 2.25, np.nan, 0.1],
+        'Program': pd.Series(['MOCN', 7, None, True], dtype=object),
+        'date_updated': pd.Series([dt.datetime(2025, 7, 9), '20250709', np.nan, 20250709], dtype=object),
+    })
+    length = pd.DataFrame({'Ring ID': ['RING_001', 'RING_002'], '#of Site': [3, 2]})
+    return {'Site List': site_list, 'Length': length, 'New Ring': ring_segments()}
+
+
+@pytest.fixture(scope="session")
+def network() -> SyntheticNetwork:
+    """Synthetic masterlist of 1000 segments, its sheets are rebuilt on every call."""
+    return SyntheticNetwork(segments=1000)
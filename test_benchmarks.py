@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmarks of the pipelines on synthetic workbooks, with pytest-benchmark.
+
+    python -m pytest test_benchmarks.py --benchmark-only
+    BENCH_SEGMENTS=100000 python -m pytest test_benchmarks.py --benchmark-only --benchmark-autosave
+
+The synthetic database holds BENCH_SEGMENTS ring segments (default 1000, 1k to 500k),
+every pipeline runs BENCH_ROUNDS rounds (default 3) on a fresh copy of the loaded sheets.
+Compare saved runs with `pytest-benchmark compare`.
+"""
+
+import os
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from modules.db_update import automate_db_update, load_dataframes
+from modules.dropsite import dropsite_processing, load_dropsite_data
+from modules.dummy_database import load_dummy_data, process_dummy_database
+from modules.rename_att_kml import rename_kml_field
+from modules.synthetic import SyntheticNetwork, write_workbooks
+
+SEGMENTS = int(os.environ.get("BENCH_SEGMENTS", 1000))
+ROUNDS = int(os.environ.get("BENCH_ROUNDS", 3))
+
+
+def fresh_copy(initial_data):
+    """Deep copy of loaded sheets, nested dicts of unused sheets included."""
+    if isinstance(initial_data, dict):
+        return {key: fresh_copy(value) for key, value in initial_data.items()}
+    return initial_data.copy() if initial_data is not None else None
+
+
+def run_rounds(benchmark, fn, initial_data, **kwargs):
+    return benchmark.pedantic(
+        fn, setup=lambda: ((fresh_copy(initial_data),), kwargs), rounds=ROUNDS, iterations=1, warmup_rounds=0,
+    )
+
+
+@pytest.fixture(scope="module")
+def workbooks(tmp_path_factory):
+    return write_workbooks(str(tmp_path_factory.mktemp("synthetic")), segments=SEGMENTS)
+
+
+@pytest.fixture(scope="module")
+def network():
+    return SyntheticNetwork(segments=SEGMENTS)
+
+
+def test_synthetic_network_shape(network):
+    """Exactly SEGMENTS segments, closed rings between two hubs and work orders referencing them."""
+    database = network.database()
+    rings = database['New Ring']
+    assert len(rings) == SEGMENTS
+    assert rings['Link Name'].is_unique and database['Site List']['Site ID'].is_unique
+    first = rings.groupby('Ring ID_1').head(1)
+    assert (first['Priority_1'] == 'P0').all()
+    chained = rings['Destination'].iloc[:-1].to_numpy() == rings['Origin Site ID'].iloc[1:].to_numpy()
+    same_ring = rings['Ring ID_1'].iloc[:-1].to_numpy() == rings['Ring ID_1'].iloc[1:].to_numpy()
+    assert chained[same_ring].all()
+    assert database['Length']['#of Site'].sum() == SEGMENTS - len(database['Length'])
+
+    work_order = network.work_order()
+    assert set(work_order['Del Segment']['Link Name']) <= set(rings['Link Name'])
+    assert set(work_order['Insert Ring']['Ring ID_1']) <= set(rings['Ring ID_1'])
+    ring_list = network.ring_list()['Insert Ring']
+    assert set(ring_list['Near End']) <= set(database['Site List']['Site ID IOH'])
+
+
+def test_load_dataframes(benchmark, workbooks):
+    initial_data = benchmark.pedantic(load_dataframes, args=(workbooks['database'], workbooks['work_order']),
+                                      rounds=ROUNDS, iterations=1)
+    assert len(initial_data['db_newring']) == SEGMENTS
+
+
+def test_automate_db_update(benchmark, workbooks, tmp_path):
+    initial_data = load_dataframes(workbooks['database'], workbooks['work_order'])
+    result = run_rounds(benchmark, automate_db_update, initial_data, new_database="DB Update.xlsx", export_dir=str(tmp_path))
+    assert os.path.exists(result)
+
+
+def test_dropsite_processing(benchmark, workbooks, tmp_path):
+    initial_data = load_dropsite_data(workbooks['database'], workbooks['drop_site'])
+    result = run_rounds(benchmark, dropsite_processing, initial_data, dropsite_filename="Drop Site.xlsx", export_dir=str(tmp_path))
+    assert os.path.exists(result)
+
+
+def test_process_dummy_database(benchmark, workbooks, tmp_path):
+    initial_data = load_dummy_data(workbooks['database'], workbooks['ring_list'])
+    result = run_rounds(benchmark, process_dummy_database, initial_data, dummy_filename="Dummy Database.xlsx", export_dir=str(tmp_path))
+    assert os.path.exists(result['file_location'])
+    assert len(result['run_report']['errors']) < len(initial_data['ring_insertring'])
+
+
+def test_rename_kml_field(benchmark, network):
+    kml, rename_map = network.kml(), network.rename_map()
+    revised = benchmark.pedantic(rename_kml_field, args=(kml, rename_map, 'site id'), rounds=ROUNDS, iterations=1)
+    assert revised.count("R</name>") == len(rename_map)
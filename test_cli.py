@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Test script for the headless CLI runner.
+"""
+
+import glob
+import os
+import shutil
+
+import pytest
+
+import cli
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DUMMY_DATABASE = glob.glob(os.path.join(ROOT, "files", "exports", "DB_Automation", "Dummy_Database", "*", "*.xlsx"))
+RING_LIST = os.path.join(ROOT, "files", "templates", "Template - Dummy Database.xlsx")
+
+
+@pytest.mark.skipif(not DUMMY_DATABASE, reason="no dummy database export available")
+def test_dummy_batch_reuses_one_masterlist(tmp_path, monkeypatch):
+    """A directory of ring lists gives one export per file, the masterlist is parsed once."""
+    input_dir = tmp_path / "ring_lists"
+    input_dir.mkdir()
+    for name in ("north.xlsx", "south.xlsx"):
+        shutil.copy(RING_LIST, input_dir / name)
+
+    parsed = []
+    read_workbook = cli.read_workbook
+    monkeypatch.setattr(cli, "read_workbook", lambda source, **kwargs: parsed.append(source) or read_workbook(source, **kwargs))
+
+    exit_code = cli.main([
+        "dummy", "--database", DUMMY_DATABASE[0], "--input", str(input_dir), "--output-dir", str(tmp_path / "out"),
+    ])
+
+    assert exit_code == 0
+    assert parsed.count(DUMMY_DATABASE[0]) == 1
+    exports = sorted(os.path.basename(path) for path in glob.glob(str(tmp_path / "out" / "*.xlsx")))
+    assert len(exports) == 2
+    assert exports[0].startswith("Dummy Database-") and exports[0].endswith("-north.xlsx")
+    reports = glob.glob(str(tmp_path / "out" / "*- Run Report.csv"))
+    assert len(reports) == 2
+    assert open(reports[0], encoding="utf-8").readline().strip() == "Time,Level,Stage,Ring ID,Site ID,Row,Message"
+
+
+def test_missing_input_is_reported(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        cli.collect_inputs(str(tmp_path / "missing.xlsx"))
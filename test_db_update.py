@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+"""
+Test script for the work order update of the masterlist.
+"""
+
+import os
+
+from modules.db_update import automate_db_update, load_dataframes
+
+
+def test_update_without_export_dir_saves_to_working_directory(network, tmp_path, monkeypatch):
+    """A missing export directory falls back to the working directory instead of failing."""
+    initial_data = load_dataframes(network.database(), network.work_order())
+    monkeypatch.chdir(tmp_path)
+
+    path = automate_db_update(initial_data, new_database="Updated.xlsx", export_dir=None)
+
+    assert os.path.samefile(path, tmp_path / "Updated.xlsx")
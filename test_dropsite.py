@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+Test script for the drop site pipeline.
+"""
+
+import pandas as pd
+
+from modules.dropsite import dropsite_processing, load_dropsite_data
+
+
+def test_drops_are_appended_to_the_matched_history_sheet(network, tmp_path):
+    """The history sheet is found by fuzzy match, the dropped sites are appended to it."""
+    database = network.database()
+    history = database.pop('Drop Site')
+    database['Drop Site History'] = history
+    drops = network.drop_site(sites=3)
+
+    initial_data = load_dropsite_data(database, drops)
+    path = dropsite_processing(initial_data, "Dropped.xlsx", export_dir=str(tmp_path))
+
+    sheets = pd.read_excel(path, sheet_name=None)
+    assert 'Drop Site' not in sheets
+    assert len(sheets['Drop Site History']) == len(history) + 3
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Test script for the dummy database pipeline helpers.
+"""
+
+import numpy as np
+import pandas as pd
+
+from modules.dummy_database import build_dummy_sitelist, insert_rings, load_dummy_data, process_dummy_database, summarize_ring_length
+from modules.run_log import RunReport
+from modules.ring_store import RingStore
+from modules.site_index import SiteIndex
+
+LENGTH_COLUMNS = ['Ring ID', '#of Site', 'FO Distance (Meter)', 'AVG Length', 'Vendor', 'Program']
+
+
+def test_length_is_grouped_per_ring(rings):
+    """One row per ring in order of appearance, rings without ID are skipped."""
+    unassigned = rings.head(1).assign(**{'Ring ID_1': np.nan})
+    length = summarize_ring_length(pd.concat([rings.tail(2), unassigned, rings.head(4)]), LENGTH_COLUMNS, 'Ring ID_1')
+
+    assert length['Ring ID'].tolist() == ['RING_002', 'RING_001']
+    assert length['#of Site'].tolist() == [1, 3]
+    assert length['FO Distance (Meter)'].tolist() == [110.0, 700.0]
+    assert length['AVG Length'].tolist() == [110.0, 700.0 / 3]
+    assert length['Program'].tolist() == ['MOCN', 'H2B1']
+    assert pd.isna(length['Vendor'].iloc[0]) and length['Vendor'].iloc[1] == 'ZTE'
+    assert 'date_updated' in length.columns
+
+
+def test_empty_rings_give_empty_length(rings):
+    length = summarize_ring_length(rings.iloc[0:0], LENGTH_COLUMNS, 'Ring ID_1')
+    assert length.empty and length.columns.tolist() == LENGTH_COLUMNS
+
+
+def test_site_index_precedence():
+    """Ring Site List wins over the database Site List, first row wins inside a sheet."""
+    ring_sites = pd.DataFrame({'Site ID': ['S1', 'S1', np.nan], 'SoW': ['ring-1', 'ring-2', 'ring-nan']})
+    db_sites = pd.DataFrame({'Site ID IOH': ['S2', 'S1'], 'SoW': ['db-2', 'db-1'], 'Site Owner': ['TBG', 'IOH']})
+    index = SiteIndex((ring_sites, 'Site ID'), (db_sites, 'Site ID IOH'))
+
+    assert len(index) == 2 and 'S2' in index and 'S3' not in index
+    info = index.attributes(pd.Series(['S1', 'S2', 'S3']), ['SoW', 'Site Owner'])
+    assert info['SoW'].tolist() == ['ring-1', 'db-2', None]
+    assert info['Site Owner'].tolist() == [None, 'TBG', None]
+
+
+def test_sitelist_rows_skip_unknown_sites():
+    """Unknown sites are logged, rings without any known site get a warning."""
+    rings = pd.DataFrame({
+        'Ring ID_1': ['R1', 'R1', 'R2'],
+        'Origin Site ID': ['S1', '', 'S9'],
+        'Destination': ['S2', 'S2', 'S1'],
+        'Origin_Name': ['Site 1', 'Site 2?', 'Site 9'],
+    })
+    db_sites = pd.DataFrame({'Site ID IOH': ['S1', 'S2'], 'SoW': ['sow-1', 'sow-2']})
+    run_report = RunReport()
+    sitelist = build_dummy_sitelist(rings, SiteIndex((db_sites, 'Site ID IOH')), ['Site ID IOH', 'Site Name', 'SoW'],
+                                    'Ring ID_1', 'Origin Site ID', 'Destination', run_report)
+
+    assert sitelist['Site ID IOH'].tolist() == ['S1', 'S2']
+    assert sitelist['SoW'].tolist() == ['sow-1', 'sow-2']
+    assert run_report.counts() == {'errors': 1, 'warnings': 1, 'info': 0}
+    error, warning = run_report.to_frame().to_dict('records')
+    assert (error['Stage'], error['Ring ID'], error['Site ID'], error['Row']) == ('SITE LIST', 'R2', 'S9', 2)
+    assert warning['Message'] == "No new site data found for Ring ID: R2. Skipping site list update."
+
+
+def test_parallel_insert_matches_serial():
+    """The process pool returns the same report as the serial loop, merged in ring order."""
+    ring_ids = [f'RING_{i:03d}' for i in range(6)]
+    insert_store = RingStore(pd.DataFrame({
+        'Ring ID': ring_ids[4:], 'Site ID': ['S4', 'S5'], 'Near End': ['A', 'B'], 'Far End': ['C', 'D'],
+    }), 'Ring ID')
+    ring_store = RingStore(pd.DataFrame({
+        'Ring ID_1': ring_ids[:4], 'Origin Site ID': ['A', 'B', 'C', 'D'], 'Destination': ['B', 'C', 'D', 'A'],
+    }), 'Ring ID_1')
+    context = {
+        'db_ring_columns': pd.Index(['Ring ID_1', 'Origin Site ID', 'Destination']),
+        'ringsite': pd.DataFrame(), 'db_sitelist': pd.DataFrame(), 'insert_site_ids': ['S4', 'S5'],
+        'insert_column_map': {}, 'column_site': 'Site ID', 'column_ne': 'Near End', 'column_fe': 'Far End',
+        'column_db_origin': 'Origin Site ID', 'column_db_destination': 'Destination',
+        'column_sitelist_site_id': 'Site ID', 'column_sitelist_site_name': 'Site Name',
+        'column_longitude': 'Long', 'column_latitude': 'Lat',
+    }
+    reports = []
+    for max_workers in (None, 2):
+        run_report = RunReport()
+        assert insert_rings(ring_ids, insert_store, ring_store, context, run_report, max_workers=max_workers) == []
+        reports.append(run_report.to_frame().drop(columns='Time'))
+
+    pd.testing.assert_frame_equal(reports[0], reports[1])
+    assert reports[0]['Ring ID'].tolist() == ring_ids
+    assert reports[0]['Message'].tolist() == (
+        [f"No data found for Ring ID: {ring_id} in the ring list. Skipping." for ring_id in ring_ids[:4]]
+        + [f"Ring ID: {ring_id} not found in the database. Skipping." for ring_id in ring_ids[4:]]
+    )
+
+
+def test_pooled_dummy_database_matches_serial(network, tmp_path):
+    """Rings inserted by two spawned workers give the same sheets and report as the serial run."""
+    results = []
+    for max_workers in (None, 2):
+        initial_data = load_dummy_data(network.database(), network.ring_list())
+        results.append(process_dummy_database(initial_data, f"Dummy {max_workers}.xlsx", export_dir=str(tmp_path),
+                                              max_workers=max_workers))
+
+    serial, pooled = results
+    assert len(serial['dummy_rings'])
+    for sheet in ('dummy_rings', 'dummy_length', 'dummy_sitelist'):
+        pd.testing.assert_frame_equal(pooled[sheet], serial[sheet])
+    pd.testing.assert_frame_equal(pooled['run_report'].to_frame().drop(columns='Time'),
+                                  serial['run_report'].to_frame().drop(columns='Time'))
+
+
+def test_deviating_segments_give_one_summary_warning(network, tmp_path):
+    """Flagged distances are logged per segment at DEBUG and reported once for the run."""
+    database = network.database()
+    rings = database['New Ring']
+    rings.loc[rings.index[:40], 'Total Distance (m)'] *= 5
+    result = process_dummy_database(load_dummy_data(database, network.ring_list()), "Dummy.xlsx", export_dir=str(tmp_path))
+
+    report = result['run_report'].to_frame()
+    distance = report[report['Stage'] == 'DISTANCE']
+    assert len(distance) == 1
+    assert distance['Message'].iat[0].endswith("deviate from their great circle distance.")
+    assert distance['Row'].isna().all()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Parity test for the Excel reader backends: calamine and openpyxl must give the same sanitized sheets.
+Unparsed sheets must load and copy the same with either backend.
+"""
+
+import glob
+import os
+
+import pandas as pd
+import pytest
+
+from modules.excel_export import DatabaseWriter
+from modules.workbook import CALAMINE_AVAILABLE, LazySheet, read_workbook, resolve_excel_engine
+
+ENGINES = ['openpyxl', 'calamine'] if CALAMINE_AVAILABLE else ['openpyxl']
+TEMPLATES = sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), "files", "templates", "*.xlsx")))
+
+
+@pytest.mark.skipif(not CALAMINE_AVAILABLE, reason="python-calamine is not installed")
+@pytest.mark.parametrize("template", TEMPLATES, ids=os.path.basename)
+def test_calamine_matches_openpyxl(template):
+    """Every template sheet is identical after sanitize_header with either engine."""
+    expected = read_workbook(template, engine='openpyxl')
+    result = read_workbook(template, engine='calamine')
+
+    assert list(result) == list(expected)
+    for sheet_name, df in expected.items():
+        pd.testing.assert_frame_equal(result[sheet_name], df, obj=sheet_name)
+
+
+def test_engine_selection(monkeypatch):
+    """Explicit engine wins over EXCEL_ENGINE, unknown engines are rejected."""
+    monkeypatch.setenv("EXCEL_ENGINE", "openpyxl")
+    assert resolve_excel_engine() == 'openpyxl'
+    assert resolve_excel_engine('auto') == ('calamine' if CALAMINE_AVAILABLE else 'openpyxl')
+    with pytest.raises(ValueError):
+        resolve_excel_engine('xlrd')
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_unused_sheets_stay_lazy(tmp_path, engine):
+    """Only the requested sheets are parsed, the others load on demand and copy cell by cell."""
+    source = tmp_path / "masterlist.xlsx"
+    with DatabaseWriter(source) as writer:
+        writer.write_sitelist(pd.DataFrame({'Site ID': ['JAW-001'], 'Long': [106.8]}))
+        worksheet = writer.workbook.add_worksheet('History')
+        writer.sheets['History'] = worksheet
+        worksheet.write_row(2, 1, ['Site ID', 'Distance'])
+        worksheet.write_row(3, 1, ['JAW-001', 1.5])
+        worksheet.write_row(4, 1, ['JAW-002'])
+
+    workbook = read_workbook(str(source), engine=engine, parse=['Site List'])
+    assert isinstance(workbook['Site List'], pd.DataFrame)
+    assert isinstance(workbook['History'], LazySheet)
+    assert workbook['History'].copy() is workbook['History']
+    pd.testing.assert_frame_equal(workbook['History'].load(), read_workbook(str(source), engine=engine)['History'])
+
+    copied = tmp_path / "copied.xlsx"
+    with DatabaseWriter(copied) as writer:
+        writer.write_sheet(workbook['History'], 'History')
+    original = pd.read_excel(source, sheet_name='History', header=None)
+    pd.testing.assert_frame_equal(pd.read_excel(copied, sheet_name='History', header=None), original)
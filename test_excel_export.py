@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Test script for the streaming xlsxwriter export of database sheets.
+"""
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+from modules.excel_export import DatabaseWriter
+
+
+def sample_ring():
+    return pd.DataFrame({
+        'Ring ID_1': ['RING_001'] * 3,
+        'Origin Site ID': ['Site_A', 'Site_B', 'Site_C'],
+        'Origin_Name': ['A', 'B', 'C'],
+        'Priority_1': ['P0', 'P1', np.nan],
+        'Destination': ['Site_B', 'Site_C', 'Site_A'],
+        'Destination_Name': ['B', 'C', 'A'],
+        'Priority_2': ['P1', np.nan, 'P0'],
+        'Ring Status': ['insert site', 'existing', 'Insert Site'],
+        'Distance': [1.25, np.nan, 3.0],
+    })
+
+
+def test_sheets_round_trip(tmp_path):
+    """Values written row by row read back as the source frames."""
+    path = tmp_path / 'database.xlsx'
+    ring = sample_ring()
+    length = pd.DataFrame({'Ring ID': ['RING_001'], '#of Site': [3], 'date_updated': [pd.Timestamp('2025-07-09')]})
+    summary = pd.DataFrame({'Date': ['20250709'], 'Week': [28]}).transpose()
+
+    with DatabaseWriter(path) as writer:
+        writer.write_ring(ring)
+        writer.write_length(length)
+        writer.write_sheet(summary, sheet_name='Summary', index=True, header=False)
+        assert list(writer.sheets) == ['New Ring', 'Length', 'Summary']
+
+    result = pd.read_excel(path, sheet_name=None)
+    pd.testing.assert_frame_equal(result['New Ring'], ring)
+    pd.testing.assert_frame_equal(result['Length'], length, check_dtype=False)
+    assert result['Summary'].columns.tolist() == ['Date', '20250709']
+
+
+def test_ring_highlights_are_conditional_formats(tmp_path):
+    """Header colour, borders and P0 / insert site highlights are written as formats."""
+    path = tmp_path / 'database.xlsx'
+    with DatabaseWriter(path) as writer:
+        writer.write_ring(sample_ring())
+
+    worksheet = openpyxl.load_workbook(path)['New Ring']
+    assert worksheet['A1'].fill.fgColor.rgb == 'FFFF0000'
+    assert worksheet['B2'].border.left.style == 'thin'
+    rules = {str(rule.sqref): rule.rules[0].formula[0] for rule in worksheet.conditional_formatting}
+    assert rules['B2:C4'] == 'EXACT($D2,"P0")'
+    assert rules['E2:G4'] == 'EXACT($G2,"P0")'
+    assert rules['A2:I4'] == 'LOWER(A2)="insert site"'
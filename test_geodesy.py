@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Test script for the vectorized great circle distances of ring segments.
+"""
+
+import numpy as np
+import pandas as pd
+
+from modules.geodesy import check_segment_distances, great_circle_m, to_degrees
+
+
+def test_great_circle_matches_known_distances():
+    """One degree of latitude is ~111.2 km, Jakarta to Surabaya ~663 km."""
+    distances = great_circle_m([106.8456, 0.0], [-6.2088, 0.0], [112.7521, 0.0], [-7.2575, 1.0])
+    np.testing.assert_allclose(distances, [663_000, 111_195], rtol=2e-3)
+
+
+def test_coordinates_are_parsed_and_range_checked():
+    """Decimal commas are read, blanks, text and out of range values give NaN."""
+    degrees = to_degrees(pd.Series([106.5, '104, 24458', '112,0039', None, 'n/a'], dtype=object))
+    np.testing.assert_allclose(degrees, [106.5, 104.24458, 112.0039, np.nan, np.nan])
+    assert np.isnan(great_circle_m([9851453.0], [-6.2], [106.8], [-6.3])).all()
+
+
+def test_segments_deviating_from_geodesic_are_flagged():
+    """Routes within the threshold pass, too long, zero and too short ones are flagged."""
+    geodesic = great_circle_m([106.0], [-6.0], [106.01], [-6.0])[0]
+    segments = pd.DataFrame({
+        'Long_1': 106.0, 'Lat_1': -6.0, 'Long_2': 106.01, 'Lat_2': -6.0,
+        'Total Distance (m)': [geodesic * 1.4, geodesic * 3.5, 0.0, geodesic / 4, np.nan],
+    }, index=list('abcde'))
+    check = check_segment_distances(segments, threshold=2.0)
+
+    assert check.index.tolist() == list('abcde')
+    np.testing.assert_allclose(check['Deviation'].iloc[:2], [0.4, 2.5])
+    assert check['Flag'].tolist() == [False, True, True, True, False]
+    assert not check_segment_distances(segments.drop(columns='Lat_2'))['Flag'].any()
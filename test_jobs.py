@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test script for the background job queue.
+"""
+
+import threading
+
+from modules.jobs import JobQueue
+
+
+def test_job_reports_progress_and_keeps_result():
+    """A job reports its stage while running and keeps its result once done."""
+    queue = JobQueue(max_workers=1)
+    release = threading.Event()
+
+    def work(job, rows):
+        for done in range(1, rows + 1):
+            job.report("Inserting rings", done, rows)
+        release.wait(5)
+        return f"{rows} rows"
+
+    job = queue.submit("Dummy Database", work, 4)
+    assert queue.get(job.id) is job
+
+    while job.status != "running" or job.done < 4:
+        job.wait(0.01)
+    assert job.stage == "Inserting rings"
+    assert job.progress == 1.0 and not job.is_finished
+
+    release.set()
+    assert job.wait(5)
+    assert job.status == "done"
+    assert job.result == "4 rows"
+    assert job.elapsed is not None
+    queue.shutdown(wait=True)
+
+
+def test_failed_job_keeps_error():
+    """An exception marks the job failed without stopping the queue."""
+    queue = JobQueue(max_workers=1)
+
+    def fail(job):
+        raise ValueError("Sheet 'Site List' not found")
+
+    failed = queue.submit("DB Update", fail)
+    succeeded = queue.submit("Drop Site", lambda job: "ok")
+    assert failed.wait(5) and succeeded.wait(5)
+
+    assert failed.status == "failed"
+    assert failed.error == "Sheet 'Site List' not found"
+    assert "ValueError" in failed.traceback
+    assert succeeded.status == "done"
+    assert [job.id for job in queue.jobs()] == [succeeded.id, failed.id]
+    queue.shutdown(wait=True)
+
+
+def test_registry_prunes_oldest_finished_jobs():
+    """Only the last `max_jobs` finished jobs are kept in the registry."""
+    queue = JobQueue(max_workers=2, max_jobs=3)
+    jobs = [queue.submit(f"Job {number}", lambda job, number=number: number) for number in range(6)]
+    for job in jobs:
+        assert job.wait(5)
+
+    last = queue.submit("Job 6", lambda job: 6)
+    assert last.wait(5)
+    kept = queue.jobs()
+    assert len(kept) <= 4
+    assert kept[0] is last
+    assert queue.get(jobs[0].id) is None
+    queue.shutdown(wait=True)
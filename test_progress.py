@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Test script for the pipeline progress callbacks.
+"""
+
+import pandas as pd
+
+from modules.progress import progress_reporter
+from modules.rename_att_kml import rename_kml_field
+
+
+def test_reporter_without_callback_is_shared_noop():
+    assert progress_reporter(None) is progress_reporter()
+    assert progress_reporter(None)("Inserting rings", 1, 10) is None
+
+
+def test_reporter_thins_counted_updates():
+    """About `steps` updates per stage, first and last always forwarded."""
+    calls = []
+    report = progress_reporter(lambda *update: calls.append(update), steps=10)
+    report("Preparing data")
+    for done in range(1, 1001):
+        report("Inserting rings", done, 1000)
+
+    assert calls[0] == ("Preparing data", 0, None)
+    counted = calls[1:]
+    assert len(counted) == 10
+    assert counted[0] == ("Inserting rings", 100, 1000)
+    assert counted[-1] == ("Inserting rings", 1000, 1000)
+
+
+def test_rename_reports_every_line():
+    kml = "\n".join(["<Placemark><name>JAW-01</name>"] * 5 + ["</Placemark>"])
+    mapping = pd.DataFrame({'before': ['JAW-01'], 'after': ['NEW-1']})
+    calls = []
+    revised = rename_kml_field(kml, mapping, 'name', progress=lambda *update: calls.append(update))
+
+    assert revised == rename_kml_field(kml, mapping, 'name')
+    assert calls[-1] == ("Renaming lines", 6, 6)
+    assert [done for _, done, _ in calls] == list(range(1, 7))
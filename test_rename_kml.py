@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test script for the KML renamer.
+"""
+
+import xml.etree.ElementTree as ET
+from io import BytesIO
+
+import pandas as pd
+
+from modules.rename_att_kml import compile_renamer, rename_kml_field, rename_kml_stream
+
+KML = "\n".join([
+    "<Placemark><name>JAW-01</name>",
+    '<Data name="site id"><value>JAW-010</value></Data>',
+    "<description>JAW-01 stays</description></Placemark>",
+])
+
+
+def test_single_pass_matches_sequential_replace():
+    """Without chained mappings the result equals the per-mapping str.replace loop."""
+    mapping = pd.DataFrame({'before': ['JAW-010', 'JAW-01', 'JAW-02'], 'after': ['NEW-10', 'NEW-1', 'NEW-2']})
+    lines = KML.split('\n')
+    for _, row in mapping.iterrows():
+        lines = [line.replace(row['before'], row['after']) if 'name' in line.lower() else line for line in lines]
+
+    assert rename_kml_field(KML, mapping, 'site id') == '\n'.join(lines)
+
+
+def test_longest_before_wins_and_no_chaining():
+    """'A-10' is not split into 'A-1' + '0', and renamed text is not renamed again."""
+    rename = compile_renamer({'A-1': 'A-10', 'A-10': 'B'})
+    assert rename("A-10 A-1 A-11") == "B A-10 A-101"
+
+
+def test_export_path_is_returned(tmp_path):
+    mapping = pd.DataFrame({'before': ['JAW-01'], 'after': ['NEW-1']})
+    path = rename_kml_field(KML, mapping, 'site id', export_path=str(tmp_path / 'revised.kml'))
+    with open(path, encoding='utf-8') as file:
+        assert file.read().startswith("<Placemark><name>NEW-1</name>")
+
+
+def test_stream_mode_renames_only_checked_field(tmp_path):
+    """Minified KML: only the Data value named by checked_field is renamed."""
+    kml = (
+        '<kml xmlns="http://www.opengis.net/kml/2.2"><Document><name>JAW-01</name><Style id="s"/>'
+        '<Placemark><name>JAW-01</name><ExtendedData>'
+        '<Data name="Site_ID"><value>JAW-01</value></Data><Data name="other"><value>JAW-01</value></Data>'
+        '</ExtendedData></Placemark></Document></kml>'
+    )
+    mapping = pd.DataFrame({'before': ['JAW-01'], 'after': ['NEW-1']})
+    path = rename_kml_field(kml, mapping, 'site id', export_path=str(tmp_path / 'revised.kml'), mode='stream')
+
+    root = ET.parse(path).getroot()
+    ns = {'kml': 'http://www.opengis.net/kml/2.2'}
+    values = [value.text for value in root.iterfind('.//kml:Data/kml:value', ns)]
+    assert values == ['NEW-1', 'JAW-01']
+    assert root.find('.//kml:Placemark/kml:name', ns).text == 'JAW-01'
+    assert root.find('.//kml:Style', ns).get('id') == 's'
+
+
+def test_stream_mode_keeps_nested_namespace_declarations(tmp_path):
+    """A prefix declared on a Folder, not on the root, stays bound in the streamed output."""
+    kml = (
+        '<kml xmlns="http://www.opengis.net/kml/2.2"><Document>'
+        '<Folder xmlns:gx="http://www.google.com/kml/ext/2.2"><Placemark><name>JAW-01</name>'
+        '<gx:Track><gx:coord>106.8 -6.2 0</gx:coord></gx:Track></Placemark></Folder>'
+        '<Folder xmlns:ext="http://www.google.com/kml/ext/2.2"><Placemark><ext:Track/></Placemark></Folder>'
+        '</Document></kml>'
+    )
+    mapping = pd.DataFrame({'before': ['JAW-01'], 'after': ['NEW-1']})
+    path = rename_kml_stream(BytesIO(kml.encode('utf-8')), mapping, 'name', export_path=str(tmp_path / 'revised.kml'))
+
+    root = ET.parse(path).getroot()
+    ns = {'kml': 'http://www.opengis.net/kml/2.2', 'gx': 'http://www.google.com/kml/ext/2.2'}
+    assert root.find('.//kml:Placemark/kml:name', ns).text == 'NEW-1'
+    assert root.find('.//gx:Track/gx:coord', ns).text == '106.8 -6.2 0'
+    assert len(root.findall('.//gx:Track', ns)) == 2
+
+
+def test_stream_mode_accepts_bytes(tmp_path):
+    mapping = pd.DataFrame({'before': ['JAW-01'], 'after': ['NEW-1']})
+    kml = b'<kml xmlns="http://www.opengis.net/kml/2.2"><Placemark><name>JAW-01</name></Placemark></kml>'
+    path = rename_kml_field(kml, mapping, 'name', export_path=str(tmp_path / 'revised.kml'), mode='stream')
+    assert 'NEW-1' in open(path, encoding='utf-8').read()
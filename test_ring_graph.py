@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test script for the ring topology graph used to drop sites and validate rings.
+"""
+
+import pandas as pd
+
+from modules.ring_graph import RingGraph, hub_sites
+
+
+def test_neighbour_queries_and_chain(rings):
+    """Successor and predecessor follow the segments of the same ring only."""
+    graph = RingGraph(rings)
+
+    assert graph.successor('RING_001', 'S1') == 'S2'
+    assert graph.predecessor('RING_001', 'S1') == 'HUB_A'
+    assert graph.successor('RING_001', 'HUB_B') is None
+    assert graph.successor('RING_002', 'HUB_B') == 'S4'
+    assert graph.chain('RING_001') == ['HUB_A', 'S1', 'S2', 'S3', 'HUB_B']
+    assert 'RING_002' in graph and 'RING_404' not in graph
+
+
+def test_drop_bridges_neighbours_and_sums_distance(rings):
+    """Dropped neighbours leave one bridge in place of the first segment, ending like the last."""
+    graph = RingGraph(rings)
+
+    assert graph.drop('RING_001', 'S1')
+    assert graph.drop('RING_001', 'S2')
+    assert not graph.drop('RING_001', 'S9')
+    segments = graph.segments('RING_001')
+
+    assert segments['Link Name'].tolist() == ['HUB_A-S3', 'S3-HUB_B']
+    assert segments['Total Distance (m)'].tolist() == [300.0, 400.0]
+    assert segments['Priority_2'].tolist() == ['Access', 'P0']
+    assert segments.index.tolist() == [0, 3]
+    assert graph.successor('RING_001', 'HUB_A') == 'S3'
+    assert graph.predecessor('RING_001', 'S3') == 'HUB_A'
+    pd.testing.assert_frame_equal(graph.segments('RING_002'), rings.iloc[4:6])
+
+    assert graph.drop('RING_001', 'S3')
+    bridge = graph.segments('RING_001').iloc[0]
+    assert (bridge['Link Name'], bridge['Priority_2'], bridge['Total Distance (m)']) == ('HUB_A-HUB_B', 'P0', 700.0)
+
+
+def test_segments_follow_the_chain(rings):
+    """Segments listed out of order come back along the ring."""
+    graph = RingGraph(rings.iloc[[2, 0, 3, 1]])
+
+    assert graph.segments('RING_001')['Link Name'].tolist() == ['HUB_A-S1', 'S1-S2', 'S2-S3', 'S3-HUB_B']
+
+
+def test_validate_reports_topology_issues(rings):
+    """Duplicated links, branches, broken chains and rings not ending at a hub are reported."""
+    rings = pd.concat([rings, pd.DataFrame({
+        'Ring ID_1': ['RING_003'] * 3 + ['RING_004'] * 2 + ['RING_005'] + ['RING_006'] * 3,
+        'Origin Site ID': ['HUB_A', 'HUB_A', 'S6', 'HUB_A', 'S8', 'HUB_C', 'HUB_A', 'HUB_A', 'S10'],
+        'Destination': ['S5', 'S5', 'S7', 'S7', 'HUB_B', 'S9', 'S10', 'S11', 'HUB_B'],
+    })], ignore_index=True)
+    graph = RingGraph(rings)
+    issues = graph.validate(hubs=hub_sites(rings))
+
+    assert hub_sites(rings) == {'HUB_A', 'HUB_B', 'HUB_C'}
+    assert [(issue['Ring ID'], issue['Issue']) for issue in issues] == [
+        ('RING_003', 'duplicated link'),
+        ('RING_003', 'broken'),
+        ('RING_004', 'broken'),
+        ('RING_005', 'open'),
+        ('RING_006', 'branch'),
+        ('RING_006', 'broken'),
+    ]
+    assert graph.validate(['RING_001', 'RING_002'], hubs=hub_sites(rings)) == []
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Test script for the ring-indexed segment store used by the DB automation pipelines.
+"""
+
+import pandas as pd
+
+from modules.ring_store import RingStore
+
+
+def test_lookup_returns_ring_segments(rings):
+    """Ring lookup returns the same rows as a boolean filter."""
+    store = RingStore(rings, 'Ring ID_1')
+
+    pd.testing.assert_frame_equal(store.get('RING_002'), rings[rings['Ring ID_1'] == 'RING_002'])
+    assert 'RING_002' in store
+    assert store.get('RING_404').empty
+    assert store.ring_ids == ['RING_001', 'RING_002']
+
+
+def test_replace_keeps_ring_order(rings):
+    """Replacing a ring keeps it between its neighbours."""
+    store = RingStore(rings, 'Ring ID_1')
+    store.append('RING_003', rings.tail(1).assign(**{'Ring ID_1': 'RING_003'}))
+    new_ring = pd.DataFrame({
+        'Ring ID_1': ['RING_002'] * 3,
+        'Origin Site ID': ['HUB_B', 'S4', 'S5'],
+        'Destination': ['S4', 'S5', 'HUB_C'],
+    })
+    store.replace('RING_002', new_ring)
+
+    result = store.to_frame()
+    assert result['Ring ID_1'].tolist() == ['RING_001'] * 4 + ['RING_002'] * 3 + ['RING_003']
+    assert result['Origin Site ID'].tolist()[4:7] == ['HUB_B', 'S4', 'S5']
+    assert result.index.tolist() == list(range(len(result)))
+
+
+def test_untouched_store_round_trips(rings):
+    """Materializing an untouched store gives back the original sheet."""
+    pd.testing.assert_frame_equal(RingStore(rings, 'Ring ID_1').to_frame(), rings)
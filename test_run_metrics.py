@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test script for the stage timing and memory metrics.
+"""
+
+import tracemalloc
+
+from modules.run_metrics import RunMetrics
+
+
+def test_marked_stages_are_chained():
+    metrics = RunMetrics("DB Update")
+    with metrics.stage("Load"):
+        pass
+    metrics.mark("New site")
+    metrics.mark("Export")
+    metrics.finish()
+    metrics.finish()
+
+    frame = metrics.to_frame()
+    assert frame['Stage'].tolist() == ["Load", "New site", "Export"]
+    assert frame['Peak MB'].isna().all()
+    assert metrics.peak_mb is None
+    assert metrics.total_seconds >= 0
+
+
+def test_memory_peak_per_stage_and_tracing_released():
+    assert not tracemalloc.is_tracing()
+    metrics = RunMetrics("Dummy Database", trace_memory=True)
+    with metrics.stage("Allocate"):
+        block = bytearray(8 * 1024 ** 2)
+        del block
+    with metrics.stage("Idle"):
+        pass
+    metrics.finish()
+
+    allocate, idle = metrics.stages
+    assert allocate['Peak MB'] >= 8
+    assert idle['Peak MB'] < allocate['Peak MB']
+    assert metrics.peak_mb == allocate['Peak MB']
+    assert not tracemalloc.is_tracing()
+
+
+def test_tracing_started_elsewhere_is_kept():
+    tracemalloc.start()
+    try:
+        metrics = RunMetrics("KML Renamer", trace_memory=True)
+        metrics.mark("Rename")
+        metrics.finish()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+
+def test_concurrent_runs_share_tracing():
+    """A run finishing first keeps tracing, and the peak, for the run still going."""
+    first = RunMetrics("DB Update", trace_memory=True)
+    second = RunMetrics("Drop Site", trace_memory=True)
+    first.mark("Load")
+    second.mark("Load")
+    block = bytearray(8 * 1024 ** 2)
+    first.finish()
+    assert tracemalloc.is_tracing()
+    second.mark("Export")
+    del block
+    second.finish()
+
+    assert first.stages[0]['Peak MB'] >= 8
+    assert second.stages[0]['Peak MB'] >= 8
+    assert second.stages[1]['Peak MB'] is not None
+    assert not tracemalloc.is_tracing()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test script for the grid index suggesting Near End / Far End segments of insert sites.
+"""
+
+import numpy as np
+import pandas as pd
+
+from modules.geodesy import great_circle_m
+from modules.segment_index import SegmentIndex, point_segment_m, suggest_insert_segments
+from modules.synthetic import SyntheticNetwork
+
+
+def two_rings() -> pd.DataFrame:
+    """Ring A runs east along latitude -6.0, ring B east along -6.1, 0.01 degree segments."""
+    rows = []
+    for ring_id, lat, prefix in (('A', -6.0, 'A'), ('B', -6.1, 'B')):
+        for number in range(5):
+            long_1 = 106.0 + number * 0.01
+            rows.append({
+                'Ring ID_1': ring_id, 'Origin Site ID': f"{prefix}{number}", 'Destination': f"{prefix}{number + 1}",
+                'Long_1': long_1, 'Lat_1': lat, 'Long_2': long_1 + 0.01, 'Lat_2': lat,
+                'Total Distance (m)': great_circle_m([long_1], [lat], [long_1 + 0.01], [lat])[0] * 1.5,
+            })
+    return pd.DataFrame(rows)
+
+
+def test_nearest_matches_brute_force():
+    """Exact k nearest for points near the network and far from it, with cells of any size."""
+    rings = SyntheticNetwork(segments=2000).database()['New Ring']
+    rng = np.random.default_rng(7)
+    for cell_m in (None, 300.0, 50_000.0):
+        index = SegmentIndex(rings, cell_m=cell_m)
+        ends = index._ends
+        picks = rng.integers(0, len(index), 40)
+        longitudes = np.r_[(ends[picks, 0] + ends[picks, 2]) / 2 + rng.normal(0, 0.02, 40), rng.uniform(95, 141, 40)]
+        latitudes = np.r_[(ends[picks, 1] + ends[picks, 3]) / 2 + rng.normal(0, 0.02, 40), rng.uniform(-11, 6, 40)]
+
+        ids, distances = index.nearest(longitudes, latitudes, k=4)
+        points = np.column_stack([longitudes, latitudes]) * index._scale
+        for point, nearest in zip(points, distances):
+            expected = np.sort(point_segment_m(np.tile(point, (len(index), 1)), index._a, index._b))[:4]
+            np.testing.assert_allclose(nearest, expected)
+        assert (ids >= 0).all()
+
+
+def test_suggestions_skip_own_segments_and_estimate_added_fibre():
+    """The nearest segment wins, the detour is scaled by the stored / geodesic ratio of the segment."""
+    index = SegmentIndex(two_rings())
+    sites = pd.DataFrame({
+        'Site ID': ['NEW', 'A2', 'FAR', 'BLANK'],
+        'Long': [106.024, 106.02, 150.0, None],
+        'Lat': ['-6, 01', -6.0, 10.0, -6.0],
+    })
+    suggestions = index.suggest(sites, k=2)
+
+    new = suggestions[suggestions['Site ID'] == 'NEW']
+    assert new['Rank'].tolist() == [1, 2]
+    assert new[['Near End', 'Far End']].values.tolist() == [['A2', 'A3'], ['A1', 'A2']]
+    np.testing.assert_allclose(new['Distance to Segment (m)'].iloc[0], 1112, rtol=2e-3)
+    detour = (great_circle_m([106.02], [-6.0], [106.024], [-6.01]) + great_circle_m([106.024], [-6.01], [106.03], [-6.0])
+              - great_circle_m([106.02], [-6.0], [106.03], [-6.0]))[0]
+    np.testing.assert_allclose(new['Added Fibre (m)'].iloc[0], detour * 1.5, atol=0.1)
+
+    # A site already on ring A is not suggested the segments it starts or ends
+    own = suggestions[suggestions['Site ID'] == 'A2']
+    assert not (own[['Near End', 'Far End']] == 'A2').any().any()
+    assert len(suggestions[suggestions['Site ID'] == 'FAR']) == 2
+    assert 'BLANK' not in suggestions['Site ID'].tolist()
+
+
+def test_suggest_insert_segments_from_workbooks(network):
+    """Every Insert Ring site of a ring list gets k candidates from the masterlist New Ring."""
+    database, ringlist = network.database(), network.ring_list()
+    suggestions = suggest_insert_segments(database, ringlist, k=3)
+
+    sites = ringlist['Insert Ring']['Site ID'].unique()
+    assert set(suggestions['Site ID']) == set(sites)
+    assert len(suggestions) == 3 * len(sites)
+    assert set(suggestions['Link Name']) <= set(database['New Ring']['Link Name'])
+    assert (suggestions['Added Fibre (m)'] >= 0).all()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test script for the Parquet snapshot cache of parsed masterlist workbooks.
+"""
+
+import datetime as dt
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from modules.snapshot_cache import SNAPSHOT_FORMAT, SnapshotCache
+from modules.workbook import LazySheet
+
+
+def test_snapshot_round_trips_mixed_columns(masterlist, tmp_path):
+    """Mixed object columns come back with the same values and Python types."""
+    cache = SnapshotCache(tmp_path)
+    key = cache.key(b'masterlist')
+
+    assert cache.get(key) is None
+    assert cache.put(key, masterlist)
+    result = cache.get(key)
+
+    assert list(result) == list(masterlist)
+    for sheet_name, df in masterlist.items():
+        pd.testing.assert_frame_equal(result[sheet_name], df)
+    assert [type(v) for v in result['Site List']['Site ID']] == [type(v) for v in masterlist['Site List']['Site ID']]
+
+
+def test_every_value_type_is_stored_in_its_own_column(tmp_path):
+    """Each Python type of a mixed column gets a typed Parquet column, values and types come back."""
+    values = ['JAW-001', 12345, 2.5, True, None, np.nan, pd.NaT, pd.Timestamp('2025-07-09 10:00'),
+              dt.datetime(2025, 7, 9, 8, 30), dt.date(2025, 7, 9), dt.time(8, 30), np.int64(7)]
+    sheet = pd.DataFrame({'Mixed': pd.Series(values * 50, dtype=object),
+                          'Text': pd.Series(['a', 'b'] * 300, dtype=object)})
+    cache = SnapshotCache(tmp_path)
+    key = cache.key(b'types')
+
+    assert cache.put(key, {'Sheet': sheet})
+    table = pd.read_parquet(os.path.join(tmp_path, key, '0.parquet'))
+    assert len(table.columns) == 11
+    result = cache.get(key)['Sheet']
+
+    pd.testing.assert_frame_equal(result, sheet)
+    expected_types = [type(value) for value in values]
+    expected_types[-1] = int
+    assert [type(value) for value in result['Mixed'][:len(values)]] == expected_types
+    assert result['Text'].dtype == object
+
+
+def test_lazy_sheets_are_not_stored(masterlist, tmp_path):
+    """Unparsed sheets keep their place in the manifest but come back as None."""
+    cache = SnapshotCache(tmp_path)
+    masterlist['Summary'] = LazySheet(b'masterlist', 'Summary')
+    key = cache.key(b'masterlist')
+
+    assert cache.put(key, masterlist)
+    result = cache.get(key)
+
+    assert list(result) == ['Site List', 'Length', 'New Ring', 'Summary']
+    assert result['Summary'] is None
+    pd.testing.assert_frame_equal(result['Length'], masterlist['Length'])
+
+
+def test_least_recently_used_snapshot_is_evicted(masterlist, tmp_path):
+    """Once the cap is exceeded, the snapshot read longest ago goes first."""
+    cache = SnapshotCache(tmp_path)
+    keys = [cache.key(name) for name in (b'v1', b'v2', b'v3')]
+    for age, key in enumerate(keys):
+        cache.put(key, masterlist)
+        os.utime(os.path.join(tmp_path, key, 'manifest.json'), (1000 + age, 1000 + age))
+    cache.get(keys[0])
+
+    snapshot_size = sum(entry.stat().st_size for entry in os.scandir(os.path.join(tmp_path, keys[0])))
+    cache.max_bytes = 2 * snapshot_size
+    assert cache.evict() == [keys[1]]
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None
+
+
+def test_snapshot_not_read_within_ttl_expires(masterlist, tmp_path):
+    """A snapshot idle for longer than the TTL is a miss and is removed on eviction."""
+    cache = SnapshotCache(tmp_path, ttl=3600)
+    keys = [cache.key(name) for name in (b'old', b'new')]
+    for key in keys:
+        cache.put(key, masterlist)
+    os.utime(os.path.join(tmp_path, keys[0], 'manifest.json'), (1000, 1000))
+
+    assert cache.evict() == [keys[0]]
+    assert cache.get(keys[0]) is None
+    assert cache.get(keys[1]) is not None
+
+
+def test_snapshot_of_another_format_is_a_miss(masterlist, tmp_path):
+    """Snapshots written before a parse path change are reparsed, not served stale."""
+    cache = SnapshotCache(tmp_path)
+    key = cache.key(b'masterlist')
+    cache.put(key, masterlist)
+    manifest_path = os.path.join(tmp_path, key, 'manifest.json')
+    with open(manifest_path, 'r', encoding='utf-8') as file:
+        manifest = json.load(file)
+    manifest['format'] = SNAPSHOT_FORMAT - 1
+    with open(manifest_path, 'w', encoding='utf-8') as file:
+        json.dump(manifest, file)
+
+    assert cache.get(key) is None
+    assert not os.path.exists(os.path.join(tmp_path, key))
+    assert cache.put(key, masterlist)
+    assert cache.get(key) is not None
+
+
+def test_concurrent_puts_publish_one_whole_snapshot(masterlist, tmp_path):
+    """Threads writing the same masterlist stage apart, readers never see a partial snapshot."""
+    cache = SnapshotCache(tmp_path)
+    key = cache.key(b'masterlist')
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        writes = [executor.submit(cache.put, key, masterlist) for _ in range(16)]
+        reads = [executor.submit(cache.get, key) for _ in range(16)]
+        assert all(write.result() for write in writes)
+        for read in reads:
+            result = read.result()
+            assert result is None or list(result) == list(masterlist)
+
+    assert os.listdir(tmp_path) == [key]
+    pd.testing.assert_frame_equal(cache.get(key)['Site List'], masterlist['Site List'])
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Test script for the cache of parsed uploads used by the Streamlit pages.
+"""
+
+import os
+from io import BytesIO
+
+import pandas as pd
+
+from modules.snapshot_cache import SnapshotCache
+from modules.upload_cache import UploadCache
+
+
+class FakeUpload:
+    """Stand-in for Streamlit's UploadedFile, counting how often its bytes are read."""
+    def __init__(self, file_id, content, name="Work Order.xlsx"):
+        self.file_id = file_id
+        self.name = name
+        self.size = len(content)
+        self.content = content
+        self.reads = 0
+
+    def getvalue(self):
+        self.reads += 1
+        return self.content
+
+
+def workbook_bytes(rings=3):
+    buffer = BytesIO()
+    with pd.ExcelWriter(buffer) as writer:
+        pd.DataFrame({'Ring ID': [f"RING_{i:03d}" for i in range(rings)]}).to_excel(writer, sheet_name='Insert Ring', index=False)
+    return buffer.getvalue()
+
+
+def test_rerun_reuses_parsed_upload_without_reading_it():
+    """The same upload is parsed once, every call gets its own copy of the sheets."""
+    cache = UploadCache()
+    upload = FakeUpload("a1", workbook_bytes())
+
+    first = cache.load(upload)
+    first['Insert Ring'].loc[0, 'Ring ID'] = 'CHANGED'
+    second = cache.load(upload)
+
+    assert upload.reads == 1
+    assert second['Insert Ring']['Ring ID'].tolist() == ['RING_000', 'RING_001', 'RING_002']
+
+
+def test_new_upload_of_same_content_hits_snapshot(tmp_path):
+    """A re-upload has a new file_id but its content is served from the Parquet snapshot."""
+    snapshots = SnapshotCache(tmp_path)
+    content = workbook_bytes()
+    UploadCache(snapshots).load(FakeUpload("a1", content))
+
+    assert os.listdir(tmp_path) == [SnapshotCache.key(content)]
+    result = UploadCache(snapshots).load(FakeUpload("b2", content))
+    assert len(result['Insert Ring']) == 3
+
+
+def test_entries_are_capped_and_expire():
+    """Least recently used uploads leave first, entries not read within the TTL are reparsed."""
+    cache = UploadCache(max_entries=2)
+    uploads = [FakeUpload(f"f{i}", workbook_bytes(i + 1)) for i in range(3)]
+    for upload in uploads:
+        cache.load(upload)
+    cache.load(uploads[2])
+    assert len(cache) == 2
+    cache.load(uploads[0])
+    assert [upload.reads for upload in uploads] == [2, 1, 1]
+
+    cache.ttl = 0
+    cache.load(uploads[2])
+    assert uploads[2].reads == 2
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test script for the column type and token normalization helpers.
+"""
+
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules import utils
+from modules.utils import ColumnResolver, compact_dtypes, find_best_match, map_site_columns, normalize_token, sanitize_header
+
+
+def test_compact_dtypes_types_sheet_with_offset_header():
+    """A header below the first row leaves object columns, they get the types of a clean read."""
+    raw = pd.DataFrame({
+        'Unnamed: 0': ['Ring ID', 'RING_001', 'RING_002', 'RING_003'],
+        'Unnamed: 1': ['Total Distance (m)', 120.5, 80.0, np.nan],
+        'Unnamed: 2': ['#of Site', 3, 2, 4],
+        'Unnamed: 3': ['Site ID', 12345, 'JAW-001', 'JAW-002'],
+        'Unnamed: 4': ['date_updated', dt.datetime(2025, 7, 9), dt.datetime(2025, 7, 10), dt.datetime(2025, 7, 11)],
+    })
+    df = compact_dtypes(sanitize_header(raw))
+
+    assert pd.api.types.is_string_dtype(df['Ring ID'])
+    assert df['Total Distance (m)'].dtype == np.float64
+    assert df['#of Site'].dtype == np.int64
+    assert pd.api.types.is_datetime64_dtype(df['date_updated'])
+    assert df['Site ID'].dtype == object
+    assert df['Site ID'].tolist() == [12345, 'JAW-001', 'JAW-002']
+
+
+def test_normalize_token_matches_string_normalization():
+    """Same tokens as the lower/replace chain, blanks and mixed values included."""
+    series = pd.Series(['New Site', 'new site', 'NewSite', 'Insert Site', np.nan, 7, 'Existing'], index=range(10, 17))
+    tokens = normalize_token(series)
+
+    expected = series.astype(str).str.lower().str.replace(' ', '')
+    assert isinstance(tokens.dtype, pd.CategoricalDtype)
+    assert tokens.index.equals(series.index)
+    assert tokens.astype(object).fillna('<blank>').tolist() == expected.fillna('<blank>').tolist()
+    assert (tokens == 'newsite').tolist() == [True, True, True, False, False, False, False]
+
+
+def loop_site_rows(site_rows, site_info, target_columns, source_columns, date_today):
+    """Site List rows built cell by cell with `.loc`, as automate_db_update did before `map_site_columns`."""
+    container = pd.DataFrame(columns=target_columns)
+    for idx, row in site_rows.iterrows():
+        site_id = row['Origin Site ID']
+        sitelist_info = site_info[site_info['Site ID IOH'] == site_id]
+        for col in target_columns:
+            match col:
+                case 'Site ID' | 'Site ID IOH':
+                    container.loc[idx, col] = site_id
+                case 'Site Name':
+                    container.loc[idx, col] = row.get('Origin_Name', None)
+                case 'Program Name':
+                    container.loc[idx, col] = row.get('Program', None)
+                case 'Program Ring':
+                    container.loc[idx, col] = row.get('Program Ring', None)
+                case 'Program Status':
+                    container.loc[idx, col] = row.get('Existing/New Site_1', 'New Site')
+                case 'insert/new ring':
+                    container.loc[idx, col] = row.get('Ring Status', "new ring")
+                case 'SoW' | 'Site Owner' | 'Initial Site ID' | 'Initial Site Name':
+                    if not sitelist_info.empty:
+                        container.loc[idx, col] = sitelist_info.iloc[0].get(col, None)
+                    else:
+                        container.loc[idx, col] = None
+                case _:
+                    if col in row:
+                        container.loc[idx, col] = row[col]
+                    elif col in sitelist_info.columns:
+                        container.loc[idx, col] = sitelist_info.iloc[0].get(col, None)
+                    else:
+                        best_match, score = find_best_match(col, source_columns)
+                        if best_match and best_match in row:
+                            container.loc[idx, col] = row[best_match]
+                        else:
+                            container.loc[idx, col] = None
+        container.loc[idx, 'date_updated'] = date_today
+    return container
+
+
+def sample_work_order():
+    new_ring = pd.DataFrame({
+        'Ring ID': ['RING_001'] * 4,
+        'Origin Site ID': ['S1', 'S2', 'S3', 'S4'],
+        'Origin_Name': ['Site 1', 'Site 2', np.nan, 'Site 4'],
+        'Program': ['H2B1', 'H2B1', 'MOCN', 'MOCN'],
+        'Existing/New Site_1': ['New Site', 'Existing', 'new site', 'New Site'],
+        'Ring Status': ['new ring', 'new ring', 'insert site', 'new ring'],
+        'Region': ['JAW', 'JAW', 'SUM', 'SUM'],
+        'Long_1': [106.1, 106.2, 98.7, 98.8],
+        'Total Distance (m)': [100.0, 200.0, 300.0, 400.0],
+    })
+    site_list = pd.DataFrame({
+        'Site ID IOH': ['S1', 'S3', 'S1', 'S4'],
+        'SoW': ['sow-1', np.nan, 'sow-1b', 'sow-4'],
+        'Initial Site ID': ['I1', 'I3', 'I1b', 'I4'],
+        'Tower Height': [42.0, 36.0, 40.0, 30.0],
+    })
+    new_site = new_ring[normalize_token(new_ring['Existing/New Site_1']) == 'newsite'].reset_index(drop=True)
+    return new_ring, site_list, new_site
+
+
+@pytest.mark.parametrize('extra_columns, missing_site', [([], True), (['Tower Height'], False)])
+def test_map_site_columns_matches_cell_by_cell_loop(extra_columns, missing_site):
+    """Same Site List rows as the `.loc` loop, for a site missing from the Site List and fuzzy matched columns."""
+    new_ring, site_list, new_site = sample_work_order()
+    if missing_site:
+        site_list = site_list[site_list['Site ID IOH'] != 'S4']
+    target_columns = ['No', 'Site ID', 'Site ID IOH', 'Site Name', 'Program Name', 'Program Ring', 'Program Status',
+                      'insert/new ring', 'SoW', 'Site Owner', 'Initial Site ID', 'Region', 'Long', 'Remark XYZ',
+                      *extra_columns]
+    source_columns = new_ring.columns.tolist()
+    assert find_best_match('Long', source_columns)[0] == 'Long_1'
+
+    expected = loop_site_rows(new_site, site_list, target_columns, source_columns, '20250709')
+    result = map_site_columns(new_site, site_list, target_columns, '20250709', source_columns=source_columns)
+
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_column_resolver_memoizes_find_best_match(monkeypatch):
+    """Same answers as `find_best_match`, each (target, candidates, threshold) scored once."""
+    source_columns = ['Ring ID', 'Origin Site ID', 'Origin_Name', 'Long_1', 'Lat_1', 'Total Distance (m)']
+    targets = ['Ring ID', 'Site ID', 'Long', 'Lat', 'Remark XYZ']
+    resolver = ColumnResolver()
+    for threshold in (None, 0.7):
+        for target in targets:
+            expected = find_best_match(target, source_columns, 0.85 if threshold is None else threshold)
+            assert resolver.match(target, source_columns, threshold=threshold) == expected
+
+    calls = []
+    monkeypatch.setattr(utils, 'find_best_match', lambda *args: calls.append(args) or find_best_match(*args))
+    column_map = resolver.resolve(targets, source_columns)
+    assert column_map == {target: find_best_match(target, source_columns)[0] for target in targets}
+    assert resolver.resolve(targets, tuple(source_columns)) == column_map
+    assert list(column_map) == targets
+    assert calls == []
+
+    assert resolver.match('Site ID', source_columns[:3]) == find_best_match('Site ID', source_columns[:3])
+    assert resolver.match('Site ID', source_columns[:3]) == find_best_match('Site ID', source_columns[:3])
+    assert len(calls) == 1